@@ -1,141 +1,272 @@
-import streamlit as st
-import json
-import os
-from src.agents.sql_generation_agent import SQLGenerationAgent
-from src.core.schema_parser import SchemaParser
-from src.agents.pdf2schema import SchemaAgent
-from document_loader import load_document
-from config.settings import settings
-
-# Ensure the system is initialized
-if not settings.GROQ_API_KEY:
-    st.error("⚠️ GROQ_API_KEY is missing! Please set it in your .env file.")
-    st.stop()
-
-# Initialize SchemaAgent
-schema_agent = SchemaAgent(groq_api_key=settings.GROQ_API_KEY)
-
-def main():
-    st.set_page_config(
-        page_title="SQL Expert Assistant",
-        page_icon="🤖", 
-        layout="wide",
-        initial_sidebar_state="expanded"
-    )
-
-    st.title("🔍 SQL Query Generator")
-
-    # Dropdown for selecting SQL Type (Trino or Spark)
-    sql_type = st.selectbox("Select SQL Type:", ["trino", "spark"], index=0)
-
-    # Schema input method
-    input_method = st.radio(
-        "Input method:",
-        ["Natural Language", "CSV File", "SQL File", "PDF/DOCX File"],
-        horizontal=True
-    )
-
-    schema = None
-    if input_method == "Natural Language":
-        nl_input = st.text_area(
-            "Describe your table structure:",
-            height=100,
-            placeholder="e.g., Table with columns: id (INT), name (VARCHAR)"
-        )
-        if nl_input:
-            schema = SchemaParser.parse_input(nl_input, "natural_language")
-
-    elif input_method == "CSV File":
-        csv_file = st.file_uploader("Upload CSV", type=["csv"])
-        if csv_file:
-            schema = SchemaParser.parse_input(csv_file.getvalue(), "csv")
-
-    elif input_method == "SQL File":
-        sql_file = st.file_uploader("Upload SQL Schema", type=["sql"])
-        if sql_file:
-            schema = SchemaParser.parse_input(sql_file.read().decode(), "sql")
-
-    elif input_method == "PDF/DOCX File":
-        file = st.file_uploader("Upload PDF/DOCX", type=["pdf", "docx"])
-        if file:
-            with st.spinner("Processing file..."):
-                try:
-                    # Save file temporarily
-                    temp_path = f"temp_{file.name}"
-                    with open(temp_path, "wb") as f:
-                        f.write(file.getvalue())
-
-                    # Extract document text
-                    doc_text = load_document(temp_path)
-
-                    # Generate schema from document
-                    schema = schema_agent.create_schema_agent([doc_text], "business requirements")
-                    os.remove(temp_path)  # Cleanup temp file
-
-                    st.success("✅ SQL Schema Generated Successfully!")
-                    st.code(schema, language="sql")
-
-                except Exception as e:
-                    st.error(f"Error processing file: {str(e)}")
-
-    # Query input
-    question = st.text_input(
-        "Enter your question:",
-        placeholder="e.g., Show users created last month"
-    )
-
-    if st.button("Generate SQL") and schema and question:
-        with st.spinner("Processing..."):
-            try:
-                agent = SQLGenerationAgent()
-                
-                # Ensure schema is JSON
-                schema_json = schema if isinstance(schema, str) else json.dumps(schema)
-
-                # Validate SQL Type
-                if sql_type not in ["trino", "spark"]:
-                    st.error("Please select a valid SQL type (Trino or Spark).")
-                else:
-                    result = agent.generate_query(
-                        question=question,
-                        schema=schema_json,
-                        sql_type=sql_type  # Passing selected SQL type
-                    )
-
-                    if "error" in result:
-                        st.error(f"Error: {result['error']}")
-                        if "raw_response" in result:
-                            with st.expander("Debug Details"):
-                                st.write("Raw Response:")
-                                st.code(result["raw_response"], language="json")
-                    else:
-                        _display_results(result, schema)
-
-            except Exception as e:
-                st.error(f"System error: {str(e)}")
-
-def _display_results(result, schema):
-    col1, col2 = st.columns([1, 2])
-
-    with col1:
-        st.subheader("Table Schema")
-        st.json(schema, expanded=False)
-
-    with col2:
-        st.subheader("Generated SQL")
-        st.code(result.get("query", "No query generated"), language="sql")
-
-        if "explanation" in result:
-            with st.expander("Explanation"):
-                st.write(result["explanation"])
-
-        if "potential_issues" in result:
-            with st.expander("Potential Issues"):
-                st.write("\n".join([f"- {i}" for i in result["potential_issues"]]))
-
-        if "alternatives" in result:
-            with st.expander("Alternative Approaches"):
-                st.write("\n".join([f"- {a}" for a in result["alternatives"]]))
-
-if __name__ == "__main__":
+import streamlit as st
+import json
+import os
+from src.core.schema_parser import SchemaParser
+from src.core.dialects import enabled_dialects
+from config.settings import settings
+
+# Ensure the system is initialized
+if not settings.GROQ_API_KEY:
+    st.error("⚠️ GROQ_API_KEY is missing! Please set it in your .env file.")
+    st.stop()
+
+# Heavy subsystems (langchain, embeddings, document loaders) are imported on
+# first use so a fresh worker can render the page without paying for them.
+@st.cache_resource(show_spinner=False)
+def get_schema_agent():
+    from src.agents.pdf2schema import SchemaAgent
+    return SchemaAgent(groq_api_key=settings.GROQ_API_KEY)
+
+@st.cache_resource(show_spinner=False)
+def get_translation_llm():
+    from src.core.llm.groq_client import GroqClient
+    return GroqClient().llm
+
+def get_sql_generation_agent():
+    if settings.ROUTER_ENABLED:
+        from src.agents.routed_generation_agent import RoutedSQLGenerationAgent
+        return RoutedSQLGenerationAgent()
+    from src.agents.sql_generation_agent import SQLGenerationAgent
+    return SQLGenerationAgent()
+
+def _schema_from_document(file) -> str:
+    # Save file temporarily
+    temp_path = f"temp_{file.name}"
+    with open(temp_path, "wb") as f:
+        f.write(file.getvalue())
+
+    try:
+        # Extract document text
+        from document_loader import load_document
+        doc_text = load_document(temp_path)
+
+        # Generate schema from document
+        return get_schema_agent().create_schema_agent([doc_text], "business requirements")
+    finally:
+        os.remove(temp_path)  # Cleanup temp file
+
+def main():
+    st.set_page_config(
+        page_title="SQL Expert Assistant",
+        page_icon="🤖", 
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
+    st.title("🔍 SQL Query Generator")
+
+    # Dropdown for selecting SQL Type (dialects enabled for this deployment)
+    sql_type = st.selectbox("Select SQL Type:", enabled_dialects(), index=0)
+    # Other dialects are translated from the one generated query instead of generated again
+    translate_to = st.multiselect(
+        "Also translate to:", [d for d in enabled_dialects() if d != sql_type],
+        help="Translated locally; the LLM is only asked about constructs the transpiler cannot map"
+    )
+
+    # Schema input method
+    input_method = st.radio(
+        "Input method:",
+        ["Natural Language", "CSV File", "SQL File", "PDF/DOCX File"],
+        horizontal=True
+    )
+
+    schema = None
+    sample_data = None
+    if input_method == "Natural Language":
+        nl_input = st.text_area(
+            "Describe your table structure:",
+            height=100,
+            placeholder="e.g., Table with columns: id (INT), name (VARCHAR)"
+        )
+        if nl_input:
+            schema = SchemaParser.parse_input(nl_input, "natural_language")
+
+    elif input_method == "CSV File":
+        csv_file = st.file_uploader("Upload CSV", type=["csv"])
+        if csv_file:
+            schema = SchemaParser.parse_input(csv_file.getvalue(), "csv")
+            import pandas as pd
+            from io import BytesIO
+            sample_data = {schema["table_name"]: pd.read_csv(BytesIO(csv_file.getvalue()), nrows=settings.SANDBOX_ROW_LIMIT)}
+
+    elif input_method == "SQL File":
+        sql_file = st.file_uploader("Upload SQL Schema", type=["sql"])
+        if sql_file:
+            schema = SchemaParser.parse_input(sql_file.read().decode(), "sql")
+
+    elif input_method == "PDF/DOCX File":
+        file = st.file_uploader("Upload PDF/DOCX", type=["pdf", "docx"])
+        if file:
+            with st.spinner("Processing file..."):
+                try:
+                    # Reruns and re-uploads of the same document reuse the stored schema
+                    from src.core.schema_parser import schema_cache
+                    from src.core.cache.disk_cache import content_key
+                    schema = schema_cache.get_or_set(
+                        content_key("document", file.name.rsplit(".", 1)[-1].lower(), file.getvalue(), settings.DEFAULT_LLM_MODEL),
+                        lambda: _schema_from_document(file)
+                    )
+
+                    st.success("✅ SQL Schema Generated Successfully!")
+                    st.code(schema, language="sql")
+
+                except Exception as e:
+                    st.error(f"Error processing file: {str(e)}")
+
+    # Query input
+    question = st.text_input(
+        "Enter your question:",
+        placeholder="e.g., Show users created last month"
+    )
+
+    rank_by_runtime = st.checkbox("Rank alternatives by measured runtime on synthetic data")
+    scale_factor = st.select_slider("Scale factor", options=[0.01, 0.1, 1.0, 10.0], value=0.1) if rank_by_runtime else None
+
+    if st.button("Generate SQL") and schema and question:
+        with st.spinner("Processing..."):
+            try:
+                agent = get_sql_generation_agent()
+                
+                # Ensure schema is JSON; statistics are sent separately in compact form
+                from src.core.table_stats import statistics_by_table, without_statistics, format_stats_compact
+                schema_json = schema if isinstance(schema, str) else json.dumps(without_statistics(schema))
+                table_stats = format_stats_compact(statistics_by_table(schema)) or None
+
+                # Validate SQL Type
+                if sql_type not in enabled_dialects():
+                    st.error(f"Please select a valid SQL type ({', '.join(enabled_dialects())}).")
+                else:
+                    result = agent.generate_query(
+                        question=question,
+                        schema=schema_json,
+                        sql_type=sql_type,  # Passing selected SQL type
+                        table_stats=table_stats
+                    )
+
+                    if "error" in result:
+                        st.error(f"Error: {result['error']}")
+                        if "raw_response" in result:
+                            with st.expander("Debug Details"):
+                                st.write("Raw Response:")
+                                st.code(result["raw_response"], language="json")
+                    else:
+                        if translate_to:
+                            from src.core.analysis.transpiler import translate_generation
+                            result["translations"] = translate_generation(result, sql_type, translate_to, get_translation_llm())
+                        st.session_state.last_generation = {
+                            "question": question, "schema": schema_json,
+                            "sql_type": sql_type, "query": result.get("query", "")
+                        }
+                        _display_results(result, schema, sql_type, sample_data, scale_factor)
+
+            except Exception as e:
+                st.error(f"System error: {str(e)}")
+
+    # Feedback loop: accepted queries become few-shot examples for similar questions
+    last_generation = st.session_state.get("last_generation")
+    if settings.EXEMPLARS_ENABLED and last_generation and last_generation["query"]:
+        if st.button("👍 Accept last generated query as an example"):
+            from src.core.rag.exemplar_store import get_exemplar_store
+            get_exemplar_store().add(
+                last_generation["question"], last_generation["schema"],
+                last_generation["query"], last_generation["sql_type"]
+            )
+            st.session_state.pop("last_generation")
+            st.success("Saved. Similar questions will use this query as an example.")
+
+def _display_results(result, schema, sql_type, sample_data=None, scale_factor=None):
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        st.subheader("Table Schema")
+        st.json(schema, expanded=False)
+
+    with col2:
+        st.subheader("Generated SQL")
+        st.code(result.get("query", "No query generated"), language="sql")
+        if "model" in result:
+            st.caption(f"Model: {result['model']}")
+
+        if "explanation" in result:
+            with st.expander("Explanation"):
+                st.write(result["explanation"])
+
+        if "potential_issues" in result:
+            with st.expander("Potential Issues"):
+                st.write("\n".join([f"- {i}" for i in result["potential_issues"]]))
+
+        if "alternatives" in result:
+            with st.expander("Alternative Approaches"):
+                st.write("\n".join([f"- {a}" for a in result["alternatives"]]))
+
+        _display_sandbox_results(result, schema, sql_type, sample_data)
+        if scale_factor and result.get("alternatives"):
+            _display_runtime_ranking(result, schema, sql_type, scale_factor)
+
+        for dialect, translation in result.get("translations", {}).items():
+            _display_translation(dialect, translation)
+
+def _display_translation(dialect, translation):
+    st.subheader(f"{dialect.capitalize()} SQL")
+    if "error" in translation:
+        st.error(f"Translation failed: {translation['error']}")
+        return
+    st.code(translation["sql"], language="sql")
+    st.caption("Translated by the LLM for: " + "; ".join(translation["unsupported"])
+               if translation["method"] == "llm" else "Transpiled without the LLM")
+    if translation["method"] != "llm" and translation["unsupported"]:
+        st.warning("Not translated: " + "; ".join(translation["unsupported"]))
+    for warning in translation["warnings"]:
+        st.caption(f"Note: {warning}")
+
+def _display_sandbox_results(result, schema, sql_type, sample_data=None):
+    """Dry-run the generated and alternative SQL in the local DuckDB sandbox"""
+    try:
+        from src.core.execution.sandbox import SQLSandbox
+        sandbox = SQLSandbox(schema, sql_type, sample_data=sample_data)
+        report = sandbox.dry_run_generation(result)
+        sandbox.close()
+    except Exception as e:
+        st.info(f"Sandbox dry run unavailable: {str(e)}")
+        return
+
+    with st.expander("Sandbox Dry Run", expanded=not report["query"]["valid"]):
+        runs = [("Generated query", report["query"])] + [
+            (f"Alternative {i + 1}", run) for i, run in enumerate(report["alternatives"])
+        ]
+        for label, run in runs:
+            if run["valid"]:
+                st.success(
+                    f"{label}: OK — explain {run['explain_ms']:.1f} ms, "
+                    f"execute {run['execution_ms']:.1f} ms, {run['rows_returned']} rows"
+                )
+            else:
+                st.error(f"{label}: failed at {run['stage']} — {run['error']}")
+
+def _display_runtime_ranking(result, schema, sql_type, scale_factor):
+    """Run the generated query and its alternatives on synthetic data and rank them"""
+    from src.core.execution.benchmark import rank_alternatives
+    from src.core.table_stats import statistics_by_table
+
+    with st.spinner(f"Benchmarking alternatives at scale factor {scale_factor}..."):
+        try:
+            ranking = rank_alternatives(result, schema, sql_type, scale_factor=scale_factor,
+                                        table_stats=statistics_by_table(schema))
+        except Exception as e:
+            st.info(f"Runtime ranking unavailable: {str(e)}")
+            return
+
+    with st.expander("Runtime Ranking", expanded=True):
+        for position, run in enumerate(ranking, start=1):
+            if "error" in run:
+                st.error(f"{run['label']}: failed — {run['error']}")
+                continue
+            line = (f"{position}. {run['label']}: {run['latency_ms']:.1f} ms, "
+                    f"peak {run['peak_memory_mb']:.0f} MB, {run['rows']} rows")
+            if run["matches_main"]:
+                st.success(line)
+            else:
+                st.warning(f"{line} — result differs from the generated query")
+
+if __name__ == "__main__":
     main() 
\ No newline at end of file
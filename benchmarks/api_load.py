@@ -0,0 +1,174 @@
+#benchmarks/api_load.py
+"""Throughput of the HTTP API against a stub LLM.
+
+Starts the Groq stub, launches ``python -m src.api.server`` with ``--workers``
+processes pointed at it, waits for every worker to finish preloading, then drives
+one endpoint from many keep-alive connections for a fixed duration and reports
+requests per second (total and per worker core) and p50/p95/p99 latency.
+
+    python -m benchmarks.api_load --workers 2 --concurrency 32 --duration 20
+    python -m benchmarks.api_load --endpoint translate
+"""
+import argparse
+import http.client
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from benchmarks.llm_resilience import percentile
+from benchmarks.llm_stub_server import StubConfig, start_stub_server
+
+SCHEMA = {
+    "orders": {"order_id": "BIGINT", "customer_id": "BIGINT", "amount": "DOUBLE", "created_at": "TIMESTAMP"},
+    "customers": {"customer_id": "BIGINT", "name": "VARCHAR", "country": "VARCHAR"},
+}
+
+PAYLOADS = {
+    "generate": ("/generate", {"question": "Total order amount per country", "schema": SCHEMA, "sql_type": "trino"}),
+    "optimize": ("/optimize", {"sql": "SELECT DISTINCT o.order_id FROM (SELECT * FROM orders) o ORDER BY 1",
+                               "sql_type": "trino", "use_llm_fallback": False}),
+    "translate": ("/translate", {"sql": "SELECT date_trunc('month', created_at), count(*) FROM orders GROUP BY 1",
+                                 "source": "trino", "target": "spark"}),
+    "parse-schema": ("/parse-schema", {"input_type": "sql",
+                                       "data": "CREATE TABLE orders (order_id BIGINT, amount DOUBLE);"}),
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/health")
+            if json.loads(conn.getresponse().read()).get("status") == "ok":
+                return
+        except (OSError, ValueError, http.client.HTTPException):
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"API did not become ready within {timeout}s")
+
+
+def drive(port: int, path: str, body: dict, concurrency: int, duration: float) -> Dict:
+    """Each thread keeps one connection open and sends requests back to back"""
+    payload = json.dumps(body).encode()
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def worker():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                conn.request("POST", path, body=payload, headers={"Content-Type": "application/json"})
+                response = conn.getresponse()
+                response.read()
+                outcome = None if response.status == 200 else str(response.status)
+            except (OSError, http.client.HTTPException) as e:
+                outcome = type(e).__name__
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            with lock:
+                if outcome is None:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors[outcome] = errors.get(outcome, 0) + 1
+        conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 2),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HTTP API against a stub LLM")
+    parser.add_argument("--endpoint", choices=sorted(PAYLOADS), default="generate")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--pool-size", type=int, default=8, help="Agents per worker (API_AGENT_POOL_SIZE)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--median-latency", type=float, default=0.05, help="Stub LLM latency in seconds")
+    parser.add_argument("--startup-timeout", type=float, default=180.0)
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    stub, stub_url = start_stub_server(StubConfig(median_latency=args.median_latency, slow_rate=0.0))
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(
+            os.environ,
+            GROQ_API_BASE=stub_url,
+            GROQ_API_KEY="stub",
+            API_HOST="127.0.0.1",
+            API_PORT=str(port),
+            API_WORKERS=str(args.workers),
+            API_AGENT_POOL_SIZE=str(args.pool_size),
+            # Keep the run from reading or polluting the real caches
+            CACHE_DB_PATH=os.path.join(scratch, "cache.sqlite3"),
+            EXEMPLAR_STORE_PATH=os.path.join(scratch, "exemplars"),
+        )
+        server = subprocess.Popen([sys.executable, "-m", "src.api.server"], env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_ready(port, args.startup_timeout)
+            # Every worker must have preloaded before measuring, so warm up across all of them
+            path, body = PAYLOADS[args.endpoint]
+            drive(port, path, body, args.concurrency, args.warmup)
+            cpu_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+            report = drive(port, path, body, args.concurrency, args.duration)
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+            stub.shutdown()
+    cpu_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    cores = min(args.workers, os.cpu_count() or 1)
+    report.update({
+        "endpoint": args.endpoint,
+        "workers": args.workers,
+        "concurrency": args.concurrency,
+        "stub_median_latency_ms": args.median_latency * 1000,
+        "rps_per_core": round(report["rps"] / cores, 1),
+        # Reaped only at shutdown, so this covers the whole server run including startup
+        "server_cpu_seconds": round(
+            cpu_after.ru_utime + cpu_after.ru_stime - cpu_before.ru_utime - cpu_before.ru_stime, 1
+        ),
+    })
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#benchmarks/cold_start.py
+"""Cold start harness for the Streamlit entry points.
+
+Imports each entry point in a fresh interpreter with ``-X importtime``, reports
+the most expensive top-level imports and fails when the median wall time goes
+over ``settings.COLD_START_BUDGET_SECONDS`` or when a heavy subsystem is
+imported eagerly.
+
+    python -m benchmarks.cold_start --entry app --entry app2 --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from config.settings import settings
+
+# Packages that must only be imported behind an accessor, never at module top.
+HEAVY_MODULES = [
+    "langchain",
+    "langchain_community",
+    "langchain_groq",
+    "sentence_transformers",
+    "torch",
+    "faiss",
+    "pandas",
+    "pypdf",
+    "PyPDF2",
+]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Aggregate ``-X importtime`` output into cumulative microseconds per top-level package"""
+    costs: Dict[str, int] = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        _, cumulative_us, name = parts
+        # Only count imports at the outermost nesting level to avoid double counting.
+        if name.startswith("  "):
+            continue
+        costs[name.strip().split(".")[0]] += int(cumulative_us.strip())
+    return dict(costs)
+
+
+def measure_entry(entry: str) -> dict:
+    """Import ``entry`` in a fresh interpreter and record wall time and import costs"""
+    env = dict(os.environ)
+    # app.py stops early without a key; the harness only measures imports.
+    env.setdefault("GROQ_API_KEY", "cold-start-harness")
+    probe = (
+        "import sys; import {entry}; "
+        "print(','.join(sorted(m for m in {heavy!r} if m in sys.modules)))"
+    ).format(entry=entry, heavy=HEAVY_MODULES)
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {entry} failed:\n{proc.stderr[-2000:]}")
+
+    last_line = proc.stdout.strip().splitlines()[-1] if proc.stdout.strip() else ""
+    return {
+        "seconds": elapsed,
+        "import_costs_us": parse_importtime(proc.stderr),
+        "eager_heavy_modules": [m for m in last_line.split(",") if m],
+    }
+
+
+def run(entries: List[str], runs: int, budget: float, top: int) -> dict:
+    report = {"budget_seconds": budget, "entries": {}}
+    for entry in entries:
+        samples = [measure_entry(entry) for _ in range(runs)]
+        median = statistics.median(s["seconds"] for s in samples)
+        costs = samples[-1]["import_costs_us"]
+        heaviest = sorted(costs.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        eager = sorted({m for s in samples for m in s["eager_heavy_modules"]})
+        report["entries"][entry] = {
+            "median_seconds": round(median, 3),
+            "samples_seconds": [round(s["seconds"], 3) for s in samples],
+            "heaviest_imports_ms": {name: round(us / 1000, 1) for name, us in heaviest},
+            "eager_heavy_modules": eager,
+            "within_budget": median <= budget and not eager,
+        }
+    report["passed"] = all(e["within_budget"] for e in report["entries"].values())
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start of the Streamlit entry points")
+    parser.add_argument("--entry", action="append", help="Module to import (default: app, app2)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=settings.COLD_START_BUDGET_SECONDS)
+    parser.add_argument("--top", type=int, default=10, help="Number of heaviest imports to report")
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    report = run(args.entry or ["app", "app2"], args.runs, args.budget, args.top)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if not report["passed"]:
+        print(f"❌ Cold start exceeded the {args.budget:.2f}s budget or imported heavy modules eagerly")
+        sys.exit(1)
+    print("✅ Cold start within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#benchmarks/embeddings.py
+"""Embedding backends compared on the documentation corpus.
+
+For each backend spec (``huggingface``, or ``onnx:<threads>`` for the int8 ONNX
+Runtime backend with that many intra-op threads) reports model load time,
+document throughput, single-query latency and how well its nearest neighbours
+agree with the first (baseline) backend: overlap of the top-k chunks per query
+and the mean cosine similarity between both backends' vectors for the same chunk.
+
+    python -m benchmarks.embeddings --docs 2000 --backends huggingface onnx:1 onnx:4
+"""
+import argparse
+import json
+import os
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.llm_resilience import percentile
+from config.settings import settings
+
+QUERIES = [
+    "How do I truncate a timestamp to the month?",
+    "approximate distinct count of a column",
+    "convert a string to a date with a format",
+    "window function running total over partition",
+    "explode an array into rows",
+    "join hints broadcast join",
+    "how to read parquet files",
+    "unnest a map into key value columns",
+    "regular expression extract group",
+    "difference between two dates in days",
+    "percentile of a column",
+    "cast decimal precision and scale",
+    "create table as select with partitioning",
+    "json extract scalar value from a string",
+    "pivot rows into columns",
+    "lateral view with posexplode",
+]
+
+
+def load_corpus(path: str, limit: int) -> List[str]:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    splitter = RecursiveCharacterTextSplitter(chunk_size=settings.CHUNK_SIZE, chunk_overlap=settings.CHUNK_OVERLAP)
+    return splitter.split_text(text)[:limit]
+
+
+def load_backend(spec: str):
+    name, _, threads = spec.partition(":")
+    if name == "onnx":
+        from src.core.rag.onnx_embeddings import OnnxEmbeddings
+        return OnnxEmbeddings(intra_op_threads=int(threads) if threads else settings.ONNX_INTRA_OP_THREADS)
+    from src.core.rag.embeddings import get_embeddings
+    return get_embeddings.__wrapped__(backend=name)  # uncached, so load time is measured
+
+
+def normalized(vectors: List[List[float]]) -> np.ndarray:
+    array = np.asarray(vectors, dtype=np.float32)
+    return array / np.clip(np.linalg.norm(array, axis=1, keepdims=True), 1e-12, None)
+
+
+def measure(spec: str, corpus: List[str], queries: List[str], k: int, repeat: int) -> Dict:
+    start = time.perf_counter()
+    embeddings = load_backend(spec)
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    doc_vectors = normalized(embeddings.embed_documents(corpus))
+    embed_seconds = time.perf_counter() - start
+
+    latencies, query_vectors = [], []
+    for _ in range(repeat):
+        query_vectors = []
+        for query in queries:
+            start = time.perf_counter()
+            query_vectors.append(embeddings.embed_query(query))
+            latencies.append(time.perf_counter() - start)
+    query_vectors = normalized(query_vectors)
+
+    return {
+        "report": {
+            "backend": spec,
+            "load_seconds": round(load_seconds, 2),
+            "docs_per_second": round(len(corpus) / embed_seconds, 1),
+            "query_p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "query_p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        },
+        "doc_vectors": doc_vectors,
+        "top_k": np.argsort(-(query_vectors @ doc_vectors.T), axis=1)[:, :k],
+    }
+
+
+def agreement(baseline: Dict, other: Dict, k: int) -> Dict:
+    overlaps = [len(set(a) & set(b)) / k for a, b in zip(baseline["top_k"], other["top_k"])]
+    same_top1 = float(np.mean(baseline["top_k"][:, 0] == other["top_k"][:, 0]))
+    result = {f"overlap_at_{k}": round(float(np.mean(overlaps)), 4), "top1_agreement": round(same_top1, 4)}
+    if baseline["doc_vectors"].shape == other["doc_vectors"].shape:
+        cosine = np.sum(baseline["doc_vectors"] * other["doc_vectors"], axis=1)
+        result["mean_doc_cosine"] = round(float(np.mean(cosine)), 4)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare embedding backends on throughput, latency and retrieval agreement")
+    parser.add_argument("--backends", nargs="+", default=["huggingface", "onnx:1", f"onnx:{os.cpu_count() or 1}"])
+    parser.add_argument("--corpus", default=os.path.join(settings.RAW_DOCS_PATH, "trino_docs.txt"))
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the query set for latency")
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.docs)
+    print(f"{len(corpus)} chunks, {len(QUERIES)} queries")
+
+    results, reports = [], []
+    for spec in args.backends:
+        try:
+            result = measure(spec, corpus, QUERIES, args.k, args.repeat)
+        except Exception as e:
+            reports.append({"backend": spec, "error": f"{type(e).__name__}: {str(e)}"})
+            print(json.dumps(reports[-1]))
+            continue
+        if results:
+            result["report"].update(agreement(results[0], result, args.k),
+                                    baseline=results[0]["report"]["backend"])
+        results.append(result)
+        reports.append(result["report"])
+        print(json.dumps(result["report"]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#benchmarks/index_build.py
+"""Scaling of the sharded index build with the number of worker processes.
+
+Builds the index for one dialect's raw docs with each worker count, reports wall
+time, chunks per second and speedup over one worker, and checks that every build
+yields the same vectors in the same order as the single-worker one.
+
+    python -m benchmarks.index_build --dialect trino --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from config.settings import settings
+from src.core.dialects import get_dialect
+from src.core.rag.sharded_build import build_sharded_index
+from src.core.rag.vector_store import VectorStoreManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure sharded index build time against worker count")
+    parser.add_argument("--dialect", default="trino")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--docs", type=int, default=0, help="Limit the number of chunks (0 = all)")
+    parser.add_argument("--shard-size", type=int, default=settings.INDEX_SHARD_SIZE)
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    with open(os.path.join(settings.RAW_DOCS_PATH, get_dialect(args.dialect).raw_docs_file), encoding="utf-8") as f:
+        docs = VectorStoreManager().splitter.create_documents([f.read()])
+    if args.docs:
+        docs = docs[:args.docs]
+    print(f"{len(docs)} chunks, {os.cpu_count()} cores, shard size {args.shard_size}")
+
+    reports, baseline_seconds, baseline_vectors = [], None, None
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as checkpoints:
+            start = time.perf_counter()
+            store = build_sharded_index(docs, checkpoints, workers=workers, shard_size=args.shard_size)
+            seconds = time.perf_counter() - start
+        vectors = store.index.reconstruct_n(0, store.index.ntotal)
+        if baseline_seconds is None:
+            baseline_seconds, baseline_vectors = seconds, vectors
+        reports.append({
+            "workers": workers,
+            "seconds": round(seconds, 2),
+            "chunks_per_second": round(len(docs) / seconds, 1),
+            "speedup": round(baseline_seconds / seconds, 2),
+            "matches_baseline": bool(
+                vectors.shape == baseline_vectors.shape and np.allclose(vectors, baseline_vectors, atol=1e-5)
+            ),
+        })
+        print(json.dumps(reports[-1]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
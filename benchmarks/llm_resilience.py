@@ -0,0 +1,155 @@
+#benchmarks/llm_resilience.py
+"""Tail latency of LLM calls with and without the resilience policy.
+
+Starts the local stub server with injected latency and errors, drives it with
+concurrent requests under several policies (no retry, retry with backoff,
+retry plus hedging) and reports success rate and p50/p95/p99 latency. A final
+outage phase checks that the circuit breaker fails fast.
+
+    python -m benchmarks.llm_resilience --requests 300 --concurrency 8
+    python -m benchmarks.llm_resilience --client groq   # through GroqClient / ChatGroq
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from benchmarks.llm_stub_server import StubConfig, start_stub_server
+from config.settings import settings
+from src.core.llm.resilience import CircuitBreaker, CircuitOpenError, ResiliencePolicy
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+
+def http_call(base_url: str, policy: ResiliencePolicy) -> Callable[[], dict]:
+    """Minimal chat completion request through ``policy``, used when langchain_groq is not needed"""
+    body = json.dumps({"model": "stub", "messages": [{"role": "user", "content": "ping"}]}).encode()
+
+    def call():
+        request = urllib.request.Request(
+            f"{base_url}/openai/v1/chat/completions", data=body,
+            headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS) as response:
+            return json.loads(response.read())
+    return lambda: policy.call(call)
+
+
+def groq_call(base_url: str, policy: ResiliencePolicy) -> Callable[[], object]:
+    from src.core.llm.groq_client import GroqClient
+
+    settings.GROQ_API_BASE = base_url
+    settings.GROQ_API_KEY = settings.GROQ_API_KEY or "stub"
+    llm = GroqClient().llm
+    llm.policy = policy
+    return lambda: llm.invoke("ping")
+
+
+def run_scenario(name: str, make_call: Callable[[ResiliencePolicy], Callable], policy: ResiliencePolicy,
+                 requests: int, concurrency: int) -> Dict:
+    call = make_call(policy)
+
+    def one(_):
+        start = time.perf_counter()
+        try:
+            call()
+            ok = True
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+
+    latencies = [seconds for ok, seconds in results if ok]
+    return {
+        "scenario": name,
+        "success_rate": round(len(latencies) / requests, 4),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0,
+        "policy": {k: v for k, v in policy.stats().items() if not k.endswith("_seconds")},
+    }
+
+
+def measure_outage(make_call: Callable[[ResiliencePolicy], Callable], requests: int) -> Dict:
+    """Every request fails; after the breaker opens, calls must return without touching the provider"""
+    policy = ResiliencePolicy(max_retries=1, backoff_base=0.01, hedge=False,
+                              breaker=CircuitBreaker(failure_threshold=3, reset_seconds=60))
+    call = make_call(policy)
+    fast_latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        try:
+            call()
+        except CircuitOpenError:
+            fast_latencies.append(time.perf_counter() - start)
+        except Exception:
+            pass
+    return {
+        "scenario": "outage",
+        "fast_failures": len(fast_latencies),
+        "fast_failure_p99_ms": round(percentile(fast_latencies, 0.99) * 1000, 3),
+        "breaker_state": policy.breaker.state,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure LLM call tail latency under the resilience policy")
+    parser.add_argument("--client", choices=["http", "groq"], default="http")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--median-latency", type=float, default=0.1)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=2.0)
+    parser.add_argument("--rate-limit", type=float, default=0.05)
+    parser.add_argument("--server-error", type=float, default=0.05)
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        median_latency=args.median_latency,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+        rate_limit_rate=args.rate_limit,
+        retry_after=0.2,
+        server_error_rate=args.server_error,
+    )
+    server, url = start_stub_server(config)
+    outage_server, outage_url = start_stub_server(StubConfig(server_error_rate=1.0))
+
+    client = groq_call if args.client == "groq" else http_call
+    make_call = lambda base_url: lambda policy: client(base_url, policy)
+
+    never_open = lambda: CircuitBreaker(failure_threshold=10 ** 9)
+    scenarios = [
+        ("no_retry", ResiliencePolicy(max_retries=0, hedge=False, breaker=never_open())),
+        ("retry_backoff", ResiliencePolicy(hedge=False, backoff_base=0.05, breaker=never_open())),
+        # A primary and a hedge thread per concurrent request, as resilience.hedge_workers sizes it
+        ("retry_backoff_hedge", ResiliencePolicy(hedge=True, backoff_base=0.05, breaker=never_open(),
+                                                 max_workers=2 * args.concurrency)),
+    ]
+    report = {"stub": vars(config) | {"content": "..."}, "results": []}
+    try:
+        for name, policy in scenarios:
+            report["results"].append(run_scenario(name, make_call(url), policy, args.requests, args.concurrency))
+        report["results"].append(measure_outage(make_call(outage_url), requests=20))
+    finally:
+        server.shutdown()
+        outage_server.shutdown()
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#benchmarks/llm_stub_server.py
+"""Local stand-in for the Groq chat completions API with injectable latency and errors.
+
+Answers ``POST .../chat/completions`` in the OpenAI format Groq uses, so it works
+both with the plain HTTP client in ``benchmarks.llm_resilience`` and with
+``GroqClient`` when ``GROQ_API_BASE`` points at it. Requests that force a tool
+(structured output) get the content back as that tool's arguments.
+
+    python -m benchmarks.llm_stub_server --port 8089 --rate-limit 0.1 --server-error 0.05
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+DEFAULT_CONTENT = json.dumps({
+    "query": "SELECT 1",
+    "explanation": "Stub response",
+    "potential_issues": [],
+    "alternatives": [],
+})
+
+
+@dataclass
+class StubConfig:
+    median_latency: float = 0.2       # seconds, median of the lognormal body
+    latency_sigma: float = 0.3        # lognormal shape
+    slow_rate: float = 0.05           # share of requests that hit the slow tail
+    slow_latency: float = 3.0         # seconds added to a slow request
+    rate_limit_rate: float = 0.0      # share of requests answered with 429
+    retry_after: float = 0.5          # Retry-After seconds sent with a 429
+    server_error_rate: float = 0.0    # share of requests answered with 503
+    content: str = DEFAULT_CONTENT
+
+
+def _make_handler(config: StubConfig):
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: dict, headers: dict = None):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not self.path.endswith("/chat/completions"):
+                self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+                return
+
+            draw = random.random()
+            if draw < config.rate_limit_rate:
+                self._send(429, {"error": {"message": "Rate limit reached"}}, {"retry-after": str(config.retry_after)})
+                return
+            if draw < config.rate_limit_rate + config.server_error_rate:
+                self._send(503, {"error": {"message": "Service unavailable"}})
+                return
+
+            latency = random.lognormvariate(0, config.latency_sigma) * config.median_latency
+            if random.random() < config.slow_rate:
+                latency += config.slow_latency
+            time.sleep(latency)
+            message = {"role": "assistant", "content": config.content}
+            finish_reason = "stop"
+            forced = request.get("tool_choice")
+            if isinstance(forced, dict) and forced.get("function", {}).get("name"):
+                message = {"role": "assistant", "content": None, "tool_calls": [{
+                    "id": f"call_{random.getrandbits(32):08x}",
+                    "type": "function",
+                    "function": {"name": forced["function"]["name"], "arguments": config.content},
+                }]}
+                finish_reason = "tool_calls"
+            self._send(200, {
+                "id": f"stub-{random.getrandbits(32):08x}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+            })
+
+    return StubHandler
+
+
+def start_stub_server(config: StubConfig, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve in a daemon thread; returns the server and its base URL"""
+    server = ThreadingHTTPServer((host, port), _make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub of the Groq chat completions API")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--median-latency", type=float, default=0.2)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=3.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--server-error", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        median_latency=args.median_latency,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+        rate_limit_rate=args.rate_limit,
+        server_error_rate=args.server_error,
+    )
+    server, url = start_stub_server(config, port=args.port)
+    print(f"Stub LLM listening on {url} (set GROQ_API_BASE={url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
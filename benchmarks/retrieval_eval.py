@@ -0,0 +1,198 @@
+#benchmarks/retrieval_eval.py
+"""Retrieval quality, size and latency of chunking settings and FAISS index types.
+
+Uses the labeled questions in ``benchmarks/retrieval_labels.json``: a retrieved
+chunk counts as relevant when it contains one of the question's ``relevant``
+passages (whitespace and case insensitive), so labels survive any chunking.
+For every (corpus, chunk size, overlap, index type) on each dialect's docs, where the
+corpus is the raw docs or the docs after boilerplate and near-duplicate stripping
+(``src/core/rag/doc_cleaning.py``), it reports
+recall@k (share of questions with a relevant chunk in the top k), MRR, index size,
+build time (embedding + indexing), query latency and the prompt tokens that the
+``k`` chunks handed to the agent cost. It then recommends the cheapest setting
+whose recall@k stays within ``--tolerance`` of the best.
+
+    python -m benchmarks.retrieval_eval --corpora raw clean --chunk-sizes 400 800 1200 \\
+        --overlaps 0 50 200 --index-types flat hnsw ivf ivfpq
+"""
+import argparse
+import json
+import os
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.llm_resilience import percentile
+from config.settings import settings
+from src.core.dialects import get_dialect
+from src.core.llm.router import CHARS_PER_TOKEN
+
+LABELS_PATH = os.path.join(os.path.dirname(__file__), "retrieval_labels.json")
+# Chunks the agents put into the prompt (see BaseSQLAgent.documentation_search)
+PROMPT_K = 3
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def build_index(kind: str, vectors: np.ndarray):
+    """Inner-product FAISS index of the given kind over L2-normalized vectors"""
+    import faiss
+
+    n, dim = vectors.shape
+    if kind == "flat":
+        index = faiss.IndexFlatIP(dim)
+    elif kind == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efSearch = 64
+    elif kind in ("ivf", "ivfpq"):
+        nlist = max(int(np.sqrt(n)), 1)
+        quantizer = faiss.IndexFlatIP(dim)
+        if kind == "ivf":
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        else:
+            # dim/8 sub-vectors of up to 8-bit codes: 48 bytes per MiniLM vector instead of 1536;
+            # fewer bits on small corpora, as each codebook wants ~39 training points per centroid
+            nbits = int(min(8, max(4, np.log2(n / 39))))
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, max(dim // 8, 1), nbits, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.nprobe = min(8, nlist)
+    else:
+        raise ValueError(f"Unknown index type: {kind}")
+    index.add(vectors)
+    return index
+
+
+def embed(texts: List[str]) -> np.ndarray:
+    from src.core.rag.embeddings import get_embeddings
+
+    vectors = np.asarray(get_embeddings().embed_documents(texts), dtype=np.float32)
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+
+def evaluate(chunks: List[str], embed_seconds: float, vectors: np.ndarray, kind: str,
+             labels: List[Dict], query_vectors: np.ndarray, query_embed_seconds: List[float],
+             ks: List[int]) -> Dict:
+    import faiss
+
+    start = time.perf_counter()
+    index = build_index(kind, vectors)
+    index_seconds = time.perf_counter() - start
+
+    normalized_chunks = [_normalize(chunk) for chunk in chunks]
+    max_k = max(ks)
+    hits = {k: 0 for k in ks}
+    reciprocal_ranks, search_seconds = [], []
+    for label, query_vector, embed_time in zip(labels, query_vectors, query_embed_seconds):
+        start = time.perf_counter()
+        _, ids = index.search(query_vector[None, :], max_k)
+        search_seconds.append(time.perf_counter() - start)
+        needles = [_normalize(passage) for passage in label["relevant"]]
+        rank = next(
+            (position for position, i in enumerate(ids[0], start=1)
+             if i != -1 and any(needle in normalized_chunks[i] for needle in needles)),
+            None
+        )
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+        for k in ks:
+            hits[k] += bool(rank and rank <= k)
+
+    query_seconds = [e + s for e, s in zip(query_embed_seconds, search_seconds)]
+    mean_chunk_chars = float(np.mean([len(chunk) for chunk in chunks]))
+    return {
+        "index_type": kind,
+        "chunks": len(chunks),
+        **{f"recall@{k}": round(hits[k] / len(labels), 4) for k in ks},
+        f"mrr@{max_k}": round(float(np.mean(reciprocal_ranks)), 4),
+        "index_bytes": int(faiss.serialize_index(index).nbytes),
+        "text_bytes": sum(len(chunk.encode("utf-8")) for chunk in chunks),
+        "build_seconds": round(embed_seconds + index_seconds, 2),
+        "index_seconds": round(index_seconds, 3),
+        "search_p50_ms": round(percentile(search_seconds, 0.50) * 1000, 3),
+        "search_p95_ms": round(percentile(search_seconds, 0.95) * 1000, 3),
+        "query_p50_ms": round(percentile(query_seconds, 0.50) * 1000, 2),
+        "query_p95_ms": round(percentile(query_seconds, 0.95) * 1000, 2),
+        f"prompt_tokens@{PROMPT_K}": int(PROMPT_K * mean_chunk_chars / CHARS_PER_TOKEN),
+    }
+
+
+def recommend(rows: List[Dict], k: int, tolerance: float) -> Dict:
+    """Fewest prompt tokens, then smallest index, among settings within ``tolerance`` of the best recall@k"""
+    best = max(row[f"recall@{k}"] for row in rows)
+    eligible = [row for row in rows if row[f"recall@{k}"] >= best - tolerance]
+    return min(eligible, key=lambda row: (row[f"prompt_tokens@{PROMPT_K}"], row["index_bytes"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep chunking and index types for retrieval quality and cost")
+    parser.add_argument("--dialects", nargs="+", default=["trino", "spark"])
+    parser.add_argument("--corpora", nargs="+", choices=["raw", "clean"], default=["raw", "clean"])
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[500, 800, 1000])
+    parser.add_argument("--overlaps", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--index-types", nargs="+", default=["flat", "hnsw", "ivf", "ivfpq"])
+    parser.add_argument("--ks", type=int, nargs="+", default=[1, 3, 5, 10],
+                        help=f"Recall cutoffs; {PROMPT_K} (the prompt's chunk count) is always added for the recommendation")
+    parser.add_argument("--labels", default=LABELS_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.02, help="Recall@3 loss accepted for a cheaper setting")
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+    args.ks = sorted(set(args.ks) | {PROMPT_K})
+
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from src.core.rag.doc_cleaning import near_duplicates, strip_boilerplate
+
+    with open(args.labels, encoding="utf-8") as f:
+        all_labels = json.load(f)
+
+    report = {}
+    for dialect in args.dialects:
+        labels = [label for label in all_labels if label["dialect"] == dialect]
+        if not labels:
+            continue
+        with open(os.path.join(settings.RAW_DOCS_PATH, get_dialect(dialect).raw_docs_file), encoding="utf-8") as f:
+            texts = {"raw": f.read()}
+        texts["clean"] = strip_boilerplate(texts["raw"])[0]
+
+        query_vectors, query_embed_seconds = [], []
+        for label in labels:
+            start = time.perf_counter()
+            query_vectors.append(embed([label["question"]])[0])
+            query_embed_seconds.append(time.perf_counter() - start)
+        query_vectors = np.vstack(query_vectors)
+
+        rows = []
+        for corpus in args.corpora:
+            for chunk_size in args.chunk_sizes:
+                for overlap in args.overlaps:
+                    if overlap >= chunk_size:
+                        continue
+                    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=overlap)
+                    chunks = splitter.split_text(texts[corpus])
+                    if corpus == "clean":
+                        dropped = set(near_duplicates(chunks))
+                        chunks = [chunk for i, chunk in enumerate(chunks) if i not in dropped]
+                    start = time.perf_counter()
+                    vectors = embed(chunks)
+                    embed_seconds = time.perf_counter() - start
+                    for kind in args.index_types:
+                        row = {"corpus": corpus, "chunk_size": chunk_size, "overlap": overlap, **evaluate(
+                            chunks, embed_seconds, vectors, kind, labels, query_vectors, query_embed_seconds, args.ks
+                        )}
+                        rows.append(row)
+                        print(json.dumps({"dialect": dialect, **row}))
+
+        choice = recommend(rows, PROMPT_K, args.tolerance)
+        print(f"{dialect}: recommended corpus={choice['corpus']} chunk_size={choice['chunk_size']} overlap={choice['overlap']} "
+              f"index={choice['index_type']} (recall@{PROMPT_K}={choice[f'recall@{PROMPT_K}']}, "
+              f"{choice[f'prompt_tokens@{PROMPT_K}']} prompt tokens, {choice['index_bytes']:,} index bytes)")
+        report[dialect] = {"rows": rows, "recommended": choice}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#benchmarks/text2sql_eval.py
+"""Batch text-to-SQL evaluation: generation quality, judge calibration, latency and tokens.
+
+Runs every case of a local dataset (``benchmarks/text2sql_cases.json`` by default)
+through SQL generation and the self-evaluation judge with bounded concurrency. Each
+finished case is appended to a JSONL checkpoint, so an interrupted run picks up where
+it stopped when rerun with the same ``--run``; use one run name per release to keep
+their results apart. Cases whose schema has sample data are executed on DuckDB and
+compared with the gold SQL's result.
+
+The report gives execution accuracy, exact match, parse rate, how well the judge's
+confidence predicts correctness (expected calibration error, Brier score, per-bin
+accuracy), p50/p95 latency and tokens per case.
+
+    python -m benchmarks.text2sql_eval --run v1.4 --concurrency 4
+
+Dataset: ``{"schemas": {name: {"schema": ..., "sample_data": {table: [row, ...]}}},
+"cases": [{"id", "dialect", "question", "schema": name or inline schema, "gold_sql"}]}``.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from benchmarks.llm_resilience import percentile
+from config.settings import settings
+from src.core.cache.disk_cache import content_key
+from src.core.dialects import get_dialect
+from src.core.execution.sandbox import strip_sql_fences
+from src.core.llm.usage import track_usage
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), "text2sql_cases.json")
+CALIBRATION_BINS = 5
+
+_local = threading.local()
+_build_lock = threading.Lock()
+
+
+def load_cases(path: str) -> List[Dict[str, Any]]:
+    """Cases with their schema and sample data resolved"""
+    with open(path, encoding="utf-8") as f:
+        dataset = json.load(f)
+    schemas = dataset.get("schemas", {})
+    cases = []
+    for case in dataset["cases"]:
+        named = schemas.get(case["schema"]) if isinstance(case["schema"], str) else None
+        cases.append({
+            **case,
+            "schema": named["schema"] if named else case["schema"],
+            "sample_data": (named or case).get("sample_data"),
+        })
+    return cases
+
+
+class Checkpoint:
+    """Append-only JSONL of finished cases; a rerun skips every case already in it"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        records = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a line cut short by a crash; that case runs again
+                    records[record["id"]] = record
+        return records
+
+    def append(self, record: Dict[str, Any]) -> None:
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _generation_agent():
+    # Agents keep per-request state, so each worker thread gets its own. They are built one
+    # at a time: LangChain derives tool schemas with pydantic v1, which races when run concurrently.
+    if not hasattr(_local, "agent"):
+        with _build_lock:
+            if settings.ROUTER_ENABLED:
+                from src.agents.routed_generation_agent import RoutedSQLGenerationAgent
+                agent = RoutedSQLGenerationAgent()
+                agent.preload()
+            else:
+                from src.agents.sql_generation_agent import SQLGenerationAgent
+                agent = SQLGenerationAgent()
+        _local.agent = agent
+    return _local.agent
+
+
+def _normalized_sql(sql: str, dialect: str) -> Optional[str]:
+    import sqlglot
+
+    try:
+        return sqlglot.parse_one(strip_sql_fences(sql), read=dialect).sql(dialect=dialect, normalize=True)
+    except Exception:
+        return None
+
+
+def _execution_match(case: Dict[str, Any], sql: str) -> Dict[str, Any]:
+    import pandas as pd
+    from src.core.execution.sandbox import SQLSandbox
+
+    sample_data = {table: pd.DataFrame(rows) for table, rows in case["sample_data"].items()}
+    sandbox = SQLSandbox(case["schema"], case["dialect"], sample_data=sample_data)
+    try:
+        return sandbox.compare(case["gold_sql"], sql)
+    finally:
+        sandbox.close()
+
+
+def run_case(case: Dict[str, Any], evaluation_llm=None) -> Dict[str, Any]:
+    """Generate, check and (with ``evaluation_llm``) judge one case"""
+    schema = json.dumps(case["schema"])
+    record: Dict[str, Any] = {"id": case["id"], "dialect": case["dialect"]}
+    start = time.perf_counter()
+    with track_usage() as usage:
+        result = _generation_agent().generate_query(case["question"], schema, case["dialect"])
+    record.update(
+        generation_seconds=round(time.perf_counter() - start, 3),
+        generation_tokens=usage.total_tokens,
+        model=result.get("model"),
+        sql=result.get("query"),
+        error=result.get("error"),
+    )
+    if record["error"] or not record["sql"]:
+        record["error"] = record["error"] or "No query generated"
+        if case.get("sample_data"):
+            record["execution_match"] = False
+        record["seconds"] = record["generation_seconds"]
+        return record
+
+    sqlglot_dialect = get_dialect(case["dialect"]).sqlglot_dialect
+    predicted = _normalized_sql(record["sql"], sqlglot_dialect)
+    record["parses"] = predicted is not None
+    record["exact_match"] = predicted is not None and predicted == _normalized_sql(case["gold_sql"], sqlglot_dialect)
+    if case.get("sample_data"):
+        comparison = _execution_match(case, record["sql"])
+        record["execution_match"], record["execution_error"] = comparison["match"], comparison["error"]
+
+    if evaluation_llm is not None:
+        from src.core.evaluation import self_evaluate_sql
+
+        judge_start = time.perf_counter()
+        with track_usage() as usage:
+            evaluation = self_evaluate_sql(case["question"], schema, case["dialect"], record["sql"], evaluation_llm)
+        record["evaluation_seconds"] = round(time.perf_counter() - judge_start, 3)
+        record["evaluation_tokens"] = usage.total_tokens
+        try:
+            record["confidence"] = min(max(float(evaluation["evaluation_result"]["confidence_score"]) / 10, 0.0), 1.0)
+        except (KeyError, TypeError, ValueError):
+            record["evaluation_error"] = evaluation.get("error", "No confidence_score")
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def _correct(record: Dict[str, Any]) -> Optional[bool]:
+    # Execution results when the case could be executed, otherwise exact match
+    if record.get("execution_match") is not None:
+        return record["execution_match"]
+    if record.get("error"):
+        return False
+    return record.get("exact_match")
+
+
+def _rate(values: List[Optional[bool]]) -> Optional[float]:
+    known = [v for v in values if v is not None]
+    return round(sum(known) / len(known), 4) if known else None
+
+
+def calibration(records: List[Dict[str, Any]], bins: int = CALIBRATION_BINS) -> Dict[str, Any]:
+    """Expected calibration error and Brier score of the judge's confidence against correctness"""
+    pairs = [(r["confidence"], bool(_correct(r))) for r in records if "confidence" in r and _correct(r) is not None]
+    if not pairs:
+        return {"cases": 0}
+    table, ece = [], 0.0
+    for b in range(bins):
+        low, high = b / bins, (b + 1) / bins
+        members = [(c, ok) for c, ok in pairs if low <= c < high or (b == bins - 1 and c == 1.0)]
+        if not members:
+            continue
+        confidence = sum(c for c, _ in members) / len(members)
+        accuracy = sum(ok for _, ok in members) / len(members)
+        ece += len(members) / len(pairs) * abs(confidence - accuracy)
+        table.append({"bin": f"{low:.1f}-{high:.1f}", "cases": len(members),
+                      "mean_confidence": round(confidence, 3), "accuracy": round(accuracy, 3)})
+    return {
+        "cases": len(pairs),
+        "ece": round(ece, 4),
+        "brier": round(sum((c - ok) ** 2 for c, ok in pairs) / len(pairs), 4),
+        "bins": table,
+    }
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def latency(key: str) -> Dict[str, Optional[float]]:
+        values = [r[key] for r in records if key in r]
+        return {
+            "p50_seconds": round(percentile(values, 0.50), 3) if values else None,
+            "p95_seconds": round(percentile(values, 0.95), 3) if values else None,
+        }
+
+    tokens = [r.get("generation_tokens", 0) + r.get("evaluation_tokens", 0) for r in records]
+    report = {
+        "cases": len(records),
+        "generation_errors": sum(bool(r.get("error")) for r in records),
+        "accuracy": _rate([_correct(r) for r in records]),
+        "execution_accuracy": _rate([r["execution_match"] for r in records if "execution_match" in r]),
+        "exact_match": _rate([r.get("exact_match", False) for r in records]),
+        "parse_rate": _rate([r.get("parses", False) for r in records]),
+        "calibration": calibration(records),
+        "latency": {"generation": latency("generation_seconds"), "evaluation": latency("evaluation_seconds"),
+                    "case": latency("seconds")},
+        "tokens_per_case": {
+            "generation": round(sum(r.get("generation_tokens", 0) for r in records) / len(records), 1),
+            "evaluation": round(sum(r.get("evaluation_tokens", 0) for r in records) / len(records), 1),
+            "total": round(sum(tokens) / len(records), 1),
+        } if records else {},
+        "by_dialect": {},
+    }
+    for dialect in sorted({r["dialect"] for r in records}):
+        subset = [r for r in records if r["dialect"] == dialect]
+        report["by_dialect"][dialect] = {"cases": len(subset), "accuracy": _rate([_correct(r) for r in subset])}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate SQL generation over a labeled dataset")
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--run", help="Run name; reruns with the same name resume its checkpoint "
+                                      "(default: derived from the dataset and model settings)")
+    parser.add_argument("--concurrency", type=int, default=settings.EVAL_CONCURRENCY)
+    parser.add_argument("--limit", type=int, default=0, help="Only the first N cases (0 = all)")
+    parser.add_argument("--no-judge", action="store_true", help="Skip the self-evaluation judge")
+    parser.add_argument("--restart", action="store_true", help="Discard the run's checkpoint first")
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    cases = load_cases(args.dataset)[:args.limit or None]
+    with open(args.dataset, "rb") as f:
+        run = args.run or content_key(
+            f.read(), settings.ROUTER_ENABLED, settings.ROUTER_MODELS, settings.DEFAULT_LLM_MODEL, args.no_judge
+        )[:12]
+    checkpoint = Checkpoint(os.path.join(settings.EVAL_RUNS_PATH, f"{run}.jsonl"))
+    if args.restart and os.path.exists(checkpoint.path):
+        os.remove(checkpoint.path)
+
+    done = checkpoint.load()
+    pending = [case for case in cases if case["id"] not in done]
+    print(f"run {run}: {len(cases)} cases, {len(cases) - len(pending)} already in {checkpoint.path}")
+
+    evaluation_llm = None
+    if not args.no_judge:
+        from src.core.llm.groq_client import GroqClient
+        evaluation_llm = GroqClient().llm
+
+    with ThreadPoolExecutor(max_workers=max(args.concurrency, 1)) as pool:
+        futures = {pool.submit(run_case, case, evaluation_llm): case for case in pending}
+        for finished, future in enumerate(as_completed(futures), start=1):
+            case = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                # Not checkpointed, so the case is retried on the next run
+                print(f"[{finished}/{len(pending)}] {case['id']}: {type(e).__name__}: {str(e)}")
+                continue
+            checkpoint.append(record)
+            done[record["id"]] = record
+            outcome = "error" if record.get("error") else "correct" if _correct(record) else "wrong"
+            print(f"[{finished}/{len(pending)}] {record['id']}: {outcome} in {record['seconds']:.1f}s")
+
+    records = [done[case["id"]] for case in cases if case["id"] in done]
+    report = {"run": run, **summarize(records)}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,106 @@
-import os
-from pydantic_settings import BaseSettings
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-class Settings(BaseSettings):
-    GROQ_API_KEY: str = os.getenv("GROQ_API_KEY")
-    TAVILY_API_KEY: str = os.getenv("TAVILY_API_URL")
-    EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
-    CHUNK_SIZE: int = 800
-    CHUNK_OVERLAP: int = 50
-    VECTOR_STORE_PATH: str = "data/vector_stores"
-    RAW_DOCS_PATH: str = "data/raw_docs"
-
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-
-settings = Settings()
-
+import os
+from typing import List, Optional
+from pydantic_settings import BaseSettings
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+class Settings(BaseSettings):
+    GROQ_API_KEY: str = os.getenv("GROQ_API_KEY")
+    GROQ_API_BASE: Optional[str] = None
+    DEFAULT_LLM_MODEL: str = "qwen-2.5-coder-32b"
+    TAVILY_API_KEY: str = os.getenv("TAVILY_API_URL")
+    EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    EMBEDDING_DEVICE: str = "cpu"
+    # "huggingface" (PyTorch sentence-transformers) or "onnx" (int8 ONNX Runtime); indexes built
+    # with one backend should be rebuilt after switching, as the vectors differ slightly
+    EMBEDDING_BACKEND: str = "huggingface"
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_MAX_SEQ_LENGTH: int = 256
+    ONNX_MODEL_DIR: str = "data/models"
+    ONNX_INTRA_OP_THREADS: int = 0
+    ONNX_INTER_OP_THREADS: int = 1
+    CHUNK_SIZE: int = 800
+    CHUNK_OVERLAP: int = 50
+    VECTOR_STORE_PATH: str = "data/vector_stores"
+    INDEX_BUILD_WORKERS: int = 0  # 0 = one per core
+    INDEX_BUILD_THREADS_PER_WORKER: int = 1
+    INDEX_SHARD_SIZE: int = 512
+    RAW_DOCS_PATH: str = "data/raw_docs"
+    # Boilerplate and near-duplicate stripping of the scraped docs before they are embedded
+    DOC_CLEANING_ENABLED: bool = True
+    BOILERPLATE_WINDOW: int = 4
+    BOILERPLATE_MIN_REPEATS: int = 5
+    SHINGLE_SIZE: int = 5
+    MINHASH_PERMUTATIONS: int = 64
+    MINHASH_BANDS: int = 16
+    NEAR_DUPLICATE_THRESHOLD: float = 0.9
+    CACHE_DB_PATH: str = "data/cache/cache.sqlite3"
+    SCHEMA_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    SCHEMA_CACHE_MAX_ENTRIES: int = 5000
+    EXEMPLAR_STORE_PATH: str = "data/exemplars"
+    COLD_START_BUDGET_SECONDS: float = 2.0
+    FAST_PATH_ENABLED: bool = True
+    RETRIEVAL_CACHE_SIZE: int = 2048
+    RETRIEVAL_CACHE_TTL_SECONDS: float = 3600
+    ENABLED_DIALECTS: List[str] = ["trino", "spark"]
+    DIALECT_IDLE_TTL_SECONDS: float = 1800
+    SANDBOX_ROW_LIMIT: int = 100
+    SANDBOX_TIMEOUT_SECONDS: float = 2.0
+    STATS_EXACT_NDV_MAX_ROWS: int = 1_000_000
+    BENCH_BASE_ROWS: int = 100_000
+    BENCH_REPEAT: int = 3
+    BENCH_TIMEOUT_SECONDS: float = 30.0  # per query run; slower alternatives are reported as timed out
+    EVAL_RUNS_PATH: str = "data/eval_runs"
+    EVAL_CONCURRENCY: int = 4
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_RETRIES: int = 3
+    LLM_BACKOFF_BASE_SECONDS: float = 0.5
+    LLM_BACKOFF_MAX_SECONDS: float = 20.0
+    LLM_HEDGE_ENABLED: bool = False
+    LLM_HEDGE_QUANTILE: float = 0.95
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_MAX_WORKERS: int = 0  # 0: two threads per concurrent caller (see resilience.hedge_workers)
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    ROUTER_ENABLED: bool = True
+    ROUTER_MODELS: List[str] = ["llama3-8b-8192", "mixtral-8x7b-32768", "qwen-2.5-coder-32b"]
+    ROUTER_SCORE_THRESHOLDS: List[float] = [2.0, 5.0]
+    EXEMPLARS_ENABLED: bool = True
+    EXEMPLAR_TOP_K: int = 3
+    EXEMPLAR_MIN_SIMILARITY: float = 0.6
+    EXEMPLAR_IVF_THRESHOLD: int = 50_000
+    EXEMPLAR_NPROBE: int = 16
+    EXEMPLAR_SAVE_EVERY: int = 100
+    EXEMPLAR_IVF_RETRAIN_GROWTH: float = 4.0  # retrain IVF once entries grow this many times past its training size
+    PDF_VECTOR_STORE_DIR: str = "temp_vector_stores"
+    JOB_DB_PATH: str = "data/jobs/jobs.sqlite3"
+    JOB_WORK_DIR: str = "data/jobs/work"
+    JOB_WORKERS: int = 1
+    JOB_POLL_SECONDS: float = 1.0
+    JOB_LEASE_SECONDS: float = 60.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_WORKER_IDLE_SECONDS: float = 600.0
+    JOB_EMBED_BATCH_SIZE: int = 64
+    BLOB_STORE_PATH: str = "data/blobs"
+    BLOB_STORE_MAX_BYTES: int = 2 * 1024 ** 3
+    PDF_STORE_CACHE_SIZE: int = 8  # PDF indexes kept loaded, shared by every session in the process
+    CHAT_MEMORY_MAX_TOKENS: int = 1000  # older turns are summarized beyond this
+    CHAT_SUMMARY_MODEL: str = "llama3-8b-8192"
+    CHAT_HISTORY_MAX_TURNS: int = 20
+    API_HOST: str = "0.0.0.0"
+    API_PORT: int = 8000
+    API_WORKERS: int = 2
+    API_AGENT_POOL_SIZE: int = 4
+    API_POOL_TIMEOUT_SECONDS: float = 30.0
+    API_KEEPALIVE_SECONDS: int = 30
+    API_SSE_HEARTBEAT_SECONDS: float = 10.0
+    API_CORS_ORIGINS: List[str] = ["http://localhost:3000"]
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+
+settings = Settings()
+
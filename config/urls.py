@@ -1,247 +1,247 @@
-
-#config/urls.py 
-TRINO_DOC_URLS= [   # total urls = > 109
-    "https://trino.io/docs/current/sql.html",
-    "https://trino.io/docs/current/language.html",
-    "https://trino.io/docs/current/functions/ai.html",
-    "https://trino.io/docs/current/functions/aggregate.html",
-    "https://trino.io/docs/current/functions/array.html",
-    "https://trino.io/docs/current/functions/binary.html",
-    "https://trino.io/docs/current/functions/bitwise.html",
-    "https://trino.io/docs/current/functions/color.html",
-    "https://trino.io/docs/current/functions/comparison.html",
-    "https://trino.io/docs/current/functions/datetime.html",
-    "https://trino.io/docs/current/functions/decimal.html",
-    "https://trino.io/docs/current/functions/geospatial.html",
-    "https://trino.io/docs/current/functions/hyperloglog.html",
-    "https://trino.io/docs/current/functions/ipaddress.html",
-    "https://trino.io/docs/current/functions/json.html",
-    "https://trino.io/docs/current/functions/lambda.html",
-    "https://trino.io/docs/current/functions/logical.html",
-    "https://trino.io/docs/current/functions/ml.html",
-    "https://trino.io/docs/current/functions/map.html",
-    "https://trino.io/docs/current/functions/math.html",
-    "https://trino.io/docs/current/functions/qdigest.html",
-    "https://trino.io/docs/current/functions/regexp.html",
-    "https://trino.io/docs/current/functions/session.html",
-    "https://trino.io/docs/current/functions/setdigest.html",
-    "https://trino.io/docs/current/functions/string.html",
-    "https://trino.io/docs/current/functions/system.html",
-    "https://trino.io/docs/current/functions/table.html",
-    "https://trino.io/docs/current/functions/teradata.html",
-    "https://trino.io/docs/current/functions/tdigest.html",
-    "https://trino.io/docs/current/functions/url.html",
-    "https://trino.io/docs/current/functions/uuid.html",
-    "https://trino.io/docs/current/functions/window.html",
-    "https://trino.io/docs/current/functions.html",
-    "https://trino.io/docs/current/sql/alter-materialized-view.html",
-    "https://trino.io/docs/current/sql/alter-schema.html",
-    "https://trino.io/docs/current/sql/alter-table.html",
-    "https://trino.io/docs/current/sql/alter-view.html",
-    "https://trino.io/docs/current/sql/analyze.html",
-    "https://trino.io/docs/current/sql/call.html",
-    "https://trino.io/docs/current/sql/comment.html",
-    "https://trino.io/docs/current/sql/commit.html",
-    "https://trino.io/docs/current/sql/create-catalog.html",
-    "https://trino.io/docs/current/sql/create-function.html",
-    "https://trino.io/docs/current/sql/create-materialized-view.html",
-    "https://trino.io/docs/current/sql/create-role.html",
-    "https://trino.io/docs/current/sql/create-schema.html",
-    "https://trino.io/docs/current/sql/create-table.html",
-    "https://trino.io/docs/current/sql/create-table-as.html",
-    "https://trino.io/docs/current/sql/create-view.html",
-    "https://trino.io/docs/current/sql/deallocate-prepare.html",
-    "https://trino.io/docs/current/sql/delete.html",
-    "https://trino.io/docs/current/sql/deny.html",
-    "https://trino.io/docs/current/sql/describe.html",
-    "https://trino.io/docs/current/sql/describe-input.html",
-    "https://trino.io/docs/current/sql/describe-output.html",
-    "https://trino.io/docs/current/sql/drop-catalog.html",
-    "https://trino.io/docs/current/sql/drop-function.html",
-    "https://trino.io/docs/current/sql/drop-materialized-view.html",
-    "https://trino.io/docs/current/sql/drop-role.html",
-    "https://trino.io/docs/current/sql/drop-schema.html",
-    "https://trino.io/docs/current/sql/drop-table.html",
-    "https://trino.io/docs/current/sql/drop-view.html",
-    "https://trino.io/docs/current/sql/execute.html",
-    "https://trino.io/docs/current/sql/execute-immediate.html",
-    "https://trino.io/docs/current/sql/explain.html",
-    "https://trino.io/docs/current/sql/explain-analyze.html",
-    "https://trino.io/docs/current/sql/grant.html",
-    "https://trino.io/docs/current/sql/grant-roles.html",
-    "https://trino.io/docs/current/sql/insert.html",
-    "https://trino.io/docs/current/sql/match-recognize.html",
-    "https://trino.io/docs/current/sql/merge.html",
-    "https://trino.io/docs/current/sql/prepare.html",
-    "https://trino.io/docs/current/sql/refresh-materialized-view.html",
-    "https://trino.io/docs/current/sql/reset-session.html",
-    "https://trino.io/docs/current/sql/reset-session-authorization.html",
-    "https://trino.io/docs/current/sql/revoke.html",
-    "https://trino.io/docs/current/sql/revoke-roles.html",
-    "https://trino.io/docs/current/sql/rollback.html",
-    "https://trino.io/docs/current/sql/select.html",
-    "https://trino.io/docs/current/sql/set-path.html",
-    "https://trino.io/docs/current/sql/set-role.html",
-    "https://trino.io/docs/current/sql/set-session.html",
-    "https://trino.io/docs/current/sql/set-session-authorization.html",
-    "https://trino.io/docs/current/sql/set-time-zone.html",
-    "https://trino.io/docs/current/sql/show-catalogs.html",
-    "https://trino.io/docs/current/sql/show-columns.html",
-    "https://trino.io/docs/current/sql/show-create-function.html",
-    "https://trino.io/docs/current/sql/show-create-materialized-view.html",
-    "https://trino.io/docs/current/sql/show-create-schema.html",
-    "https://trino.io/docs/current/sql/show-create-table.html",
-    "https://trino.io/docs/current/sql/show-create-view.html",
-    "https://trino.io/docs/current/sql/show-functions.html",
-    "https://trino.io/docs/current/sql/show-grants.html",
-    "https://trino.io/docs/current/sql/show-role-grants.html",
-    "https://trino.io/docs/current/sql/show-roles.html",
-    "https://trino.io/docs/current/sql/show-schemas.html",
-    "https://trino.io/docs/current/sql/show-session.html",
-    "https://trino.io/docs/current/sql/show-stats.html",
-    "https://trino.io/docs/current/sql/show-tables.html",
-    "https://trino.io/docs/current/sql/start-transaction.html",
-    "https://trino.io/docs/current/sql/truncate.html",
-    "https://trino.io/docs/current/sql/update.html",
-    "https://trino.io/docs/current/sql/use.html",
-    "https://trino.io/docs/current/sql/values.html",
-    "https://trino.io/docs/current/optimizer/statistics.html",
-    "https://trino.io/docs/current/optimizer/cost-in-explain.html",
-    "https://trino.io/docs/current/optimizer/cost-based-optimizations.html",
-    "https://trino.io/docs/current/optimizer/pushdown.html",
-    "https://trino.io/docs/current/optimizer/adaptive-plan-optimizations.html",
-]
-
-
-
-SPARK_DOC_URLS= [ # total urls = > 178 something
-"https://spark.apache.org/contributing.html",
-"https://spark.apache.org/docs/latest/api/R/index.html",
-"https://spark.apache.org/docs/latest/api/java/index.html",
-"https://spark.apache.org/docs/latest/api/python/getting_started/index.html",
-"https://spark.apache.org/docs/latest/api/python/index.html",
-"https://spark.apache.org/docs/latest/api/scala/org/apache/spark/index.html",
-"https://spark.apache.org/docs/latest/api/sql/index.html",
-"https://spark.apache.org/docs/latest/building-spark.html",
-"https://spark.apache.org/docs/latest/cluster-overview.html",
-"https://spark.apache.org/docs/latest/configuration.html",
-"https://spark.apache.org/docs/latest/graphx-programming-guide.html",
-"https://spark.apache.org/docs/latest/hardware-provisioning.html",
-"https://spark.apache.org/docs/latest/index.html",
-"https://spark.apache.org/docs/latest/job-scheduling.html",
-"https://spark.apache.org/docs/latest/migration-guide.html",
-"https://spark.apache.org/docs/latest/ml-guide.html",
-"https://spark.apache.org/docs/latest/monitoring.html",
-"https://spark.apache.org/docs/latest/quick-start.html",
-"https://spark.apache.org/docs/latest/rdd-programming-guide.html",
-"https://spark.apache.org/docs/latest/running-on-kubernetes.html",
-"https://spark.apache.org/docs/latest/running-on-mesos.html",
-"https://spark.apache.org/docs/latest/running-on-yarn.html",
-"https://spark.apache.org/docs/latest/security.html",
-"https://spark.apache.org/docs/latest/spark-standalone.html",
-"https://spark.apache.org/docs/latest/sparkr.html",
-"https://spark.apache.org/docs/latest/sql-data-sources.html",
-"https://spark.apache.org/docs/latest/sql-distributed-sql-engine.html",
-"https://spark.apache.org/docs/latest/sql-error-conditions.html",
-"https://spark.apache.org/docs/latest/sql-getting-started.html",
-"https://spark.apache.org/docs/latest/sql-migration-guide.html",
-"https://spark.apache.org/docs/latest/sql-performance-tuning.html",
-"https://spark.apache.org/docs/latest/sql-programming-guide.html",
-"https://spark.apache.org/docs/latest/sql-pyspark-pandas-with-arrow.html",
-"https://spark.apache.org/docs/latest/sql-ref-ansi-compliance.html",
-"https://spark.apache.org/docs/latest/sql-ref-datatypes.html",
-"https://spark.apache.org/docs/latest/sql-ref-datetime-pattern.html",
-"https://spark.apache.org/docs/latest/sql-ref-functions-builtin.html",
-"https://spark.apache.org/docs/latest/sql-ref-functions-udf-aggregate.html",
-"https://spark.apache.org/docs/latest/sql-ref-functions-udf-hive.html",
-"https://spark.apache.org/docs/latest/sql-ref-functions-udf-scalar.html",
-"https://spark.apache.org/docs/latest/sql-ref-functions.html",
-"https://spark.apache.org/docs/latest/sql-ref-identifier-clause.html",
-"https://spark.apache.org/docs/latest/sql-ref-identifier.html",
-"https://spark.apache.org/docs/latest/sql-ref-literals.html",
-"https://spark.apache.org/docs/latest/sql-ref-null-semantics.html",
-"https://spark.apache.org/docs/latest/sql-ref-number-pattern.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-analyze-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-cache-cache-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-cache-clear-cache.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-cache-refresh-function.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-cache-refresh-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-cache-refresh.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-cache-uncache-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-conf-mgmt-reset.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-conf-mgmt-set.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-describe-database.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-describe-function.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-describe-query.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-describe-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-resource-mgmt-add-file.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-resource-mgmt-add-jar.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-resource-mgmt-list-file.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-resource-mgmt-list-jar.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-columns.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-create-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-databases.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-functions.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-partitions.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-tables.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-tblproperties.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-views.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-alter-database.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-alter-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-alter-view.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-create-database.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-create-function.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-create-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-create-view.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-drop-database.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-drop-function.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-drop-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-drop-view.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-repair-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-truncate-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-usedb.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-dml-insert-overwrite-directory.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-dml-insert-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-dml-load.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-explain.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-aggregate.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-case.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-clusterby.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-cte.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-distribute-by.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-file.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-groupby.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-having.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-hints.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-inline-table.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-join.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-lateral-subquery.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-lateral-view.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-like.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-limit.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-offset.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-orderby.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-pivot.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-sampling.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-setops.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-sortby.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-transform.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-tvf.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-unpivot.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-where.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-window.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax.html",
-"https://spark.apache.org/docs/latest/sql-ref-syntax.html#auxiliary-statements",
-"https://spark.apache.org/docs/latest/sql-ref-syntax.html#data-retrieval-statements",
-"https://spark.apache.org/docs/latest/sql-ref-syntax.html#ddl-statements",
-"https://spark.apache.org/docs/latest/sql-ref-syntax.html#dml-statements",
-"https://spark.apache.org/docs/latest/sql-ref.html",
-"https://spark.apache.org/docs/latest/streaming-programming-guide.html",
-"https://spark.apache.org/docs/latest/structured-streaming-programming-guide.html",
-"https://spark.apache.org/docs/latest/submitting-applications.html",
-"https://spark.apache.org/docs/latest/tuning.html",
-"https://spark.apache.org/third-party-projects.html",
-
+
+#config/urls.py 
+TRINO_DOC_URLS= [   # total urls = > 109
+    "https://trino.io/docs/current/sql.html",
+    "https://trino.io/docs/current/language.html",
+    "https://trino.io/docs/current/functions/ai.html",
+    "https://trino.io/docs/current/functions/aggregate.html",
+    "https://trino.io/docs/current/functions/array.html",
+    "https://trino.io/docs/current/functions/binary.html",
+    "https://trino.io/docs/current/functions/bitwise.html",
+    "https://trino.io/docs/current/functions/color.html",
+    "https://trino.io/docs/current/functions/comparison.html",
+    "https://trino.io/docs/current/functions/datetime.html",
+    "https://trino.io/docs/current/functions/decimal.html",
+    "https://trino.io/docs/current/functions/geospatial.html",
+    "https://trino.io/docs/current/functions/hyperloglog.html",
+    "https://trino.io/docs/current/functions/ipaddress.html",
+    "https://trino.io/docs/current/functions/json.html",
+    "https://trino.io/docs/current/functions/lambda.html",
+    "https://trino.io/docs/current/functions/logical.html",
+    "https://trino.io/docs/current/functions/ml.html",
+    "https://trino.io/docs/current/functions/map.html",
+    "https://trino.io/docs/current/functions/math.html",
+    "https://trino.io/docs/current/functions/qdigest.html",
+    "https://trino.io/docs/current/functions/regexp.html",
+    "https://trino.io/docs/current/functions/session.html",
+    "https://trino.io/docs/current/functions/setdigest.html",
+    "https://trino.io/docs/current/functions/string.html",
+    "https://trino.io/docs/current/functions/system.html",
+    "https://trino.io/docs/current/functions/table.html",
+    "https://trino.io/docs/current/functions/teradata.html",
+    "https://trino.io/docs/current/functions/tdigest.html",
+    "https://trino.io/docs/current/functions/url.html",
+    "https://trino.io/docs/current/functions/uuid.html",
+    "https://trino.io/docs/current/functions/window.html",
+    "https://trino.io/docs/current/functions.html",
+    "https://trino.io/docs/current/sql/alter-materialized-view.html",
+    "https://trino.io/docs/current/sql/alter-schema.html",
+    "https://trino.io/docs/current/sql/alter-table.html",
+    "https://trino.io/docs/current/sql/alter-view.html",
+    "https://trino.io/docs/current/sql/analyze.html",
+    "https://trino.io/docs/current/sql/call.html",
+    "https://trino.io/docs/current/sql/comment.html",
+    "https://trino.io/docs/current/sql/commit.html",
+    "https://trino.io/docs/current/sql/create-catalog.html",
+    "https://trino.io/docs/current/sql/create-function.html",
+    "https://trino.io/docs/current/sql/create-materialized-view.html",
+    "https://trino.io/docs/current/sql/create-role.html",
+    "https://trino.io/docs/current/sql/create-schema.html",
+    "https://trino.io/docs/current/sql/create-table.html",
+    "https://trino.io/docs/current/sql/create-table-as.html",
+    "https://trino.io/docs/current/sql/create-view.html",
+    "https://trino.io/docs/current/sql/deallocate-prepare.html",
+    "https://trino.io/docs/current/sql/delete.html",
+    "https://trino.io/docs/current/sql/deny.html",
+    "https://trino.io/docs/current/sql/describe.html",
+    "https://trino.io/docs/current/sql/describe-input.html",
+    "https://trino.io/docs/current/sql/describe-output.html",
+    "https://trino.io/docs/current/sql/drop-catalog.html",
+    "https://trino.io/docs/current/sql/drop-function.html",
+    "https://trino.io/docs/current/sql/drop-materialized-view.html",
+    "https://trino.io/docs/current/sql/drop-role.html",
+    "https://trino.io/docs/current/sql/drop-schema.html",
+    "https://trino.io/docs/current/sql/drop-table.html",
+    "https://trino.io/docs/current/sql/drop-view.html",
+    "https://trino.io/docs/current/sql/execute.html",
+    "https://trino.io/docs/current/sql/execute-immediate.html",
+    "https://trino.io/docs/current/sql/explain.html",
+    "https://trino.io/docs/current/sql/explain-analyze.html",
+    "https://trino.io/docs/current/sql/grant.html",
+    "https://trino.io/docs/current/sql/grant-roles.html",
+    "https://trino.io/docs/current/sql/insert.html",
+    "https://trino.io/docs/current/sql/match-recognize.html",
+    "https://trino.io/docs/current/sql/merge.html",
+    "https://trino.io/docs/current/sql/prepare.html",
+    "https://trino.io/docs/current/sql/refresh-materialized-view.html",
+    "https://trino.io/docs/current/sql/reset-session.html",
+    "https://trino.io/docs/current/sql/reset-session-authorization.html",
+    "https://trino.io/docs/current/sql/revoke.html",
+    "https://trino.io/docs/current/sql/revoke-roles.html",
+    "https://trino.io/docs/current/sql/rollback.html",
+    "https://trino.io/docs/current/sql/select.html",
+    "https://trino.io/docs/current/sql/set-path.html",
+    "https://trino.io/docs/current/sql/set-role.html",
+    "https://trino.io/docs/current/sql/set-session.html",
+    "https://trino.io/docs/current/sql/set-session-authorization.html",
+    "https://trino.io/docs/current/sql/set-time-zone.html",
+    "https://trino.io/docs/current/sql/show-catalogs.html",
+    "https://trino.io/docs/current/sql/show-columns.html",
+    "https://trino.io/docs/current/sql/show-create-function.html",
+    "https://trino.io/docs/current/sql/show-create-materialized-view.html",
+    "https://trino.io/docs/current/sql/show-create-schema.html",
+    "https://trino.io/docs/current/sql/show-create-table.html",
+    "https://trino.io/docs/current/sql/show-create-view.html",
+    "https://trino.io/docs/current/sql/show-functions.html",
+    "https://trino.io/docs/current/sql/show-grants.html",
+    "https://trino.io/docs/current/sql/show-role-grants.html",
+    "https://trino.io/docs/current/sql/show-roles.html",
+    "https://trino.io/docs/current/sql/show-schemas.html",
+    "https://trino.io/docs/current/sql/show-session.html",
+    "https://trino.io/docs/current/sql/show-stats.html",
+    "https://trino.io/docs/current/sql/show-tables.html",
+    "https://trino.io/docs/current/sql/start-transaction.html",
+    "https://trino.io/docs/current/sql/truncate.html",
+    "https://trino.io/docs/current/sql/update.html",
+    "https://trino.io/docs/current/sql/use.html",
+    "https://trino.io/docs/current/sql/values.html",
+    "https://trino.io/docs/current/optimizer/statistics.html",
+    "https://trino.io/docs/current/optimizer/cost-in-explain.html",
+    "https://trino.io/docs/current/optimizer/cost-based-optimizations.html",
+    "https://trino.io/docs/current/optimizer/pushdown.html",
+    "https://trino.io/docs/current/optimizer/adaptive-plan-optimizations.html",
+]
+
+
+
+SPARK_DOC_URLS= [ # total urls = > 178 something
+"https://spark.apache.org/contributing.html",
+"https://spark.apache.org/docs/latest/api/R/index.html",
+"https://spark.apache.org/docs/latest/api/java/index.html",
+"https://spark.apache.org/docs/latest/api/python/getting_started/index.html",
+"https://spark.apache.org/docs/latest/api/python/index.html",
+"https://spark.apache.org/docs/latest/api/scala/org/apache/spark/index.html",
+"https://spark.apache.org/docs/latest/api/sql/index.html",
+"https://spark.apache.org/docs/latest/building-spark.html",
+"https://spark.apache.org/docs/latest/cluster-overview.html",
+"https://spark.apache.org/docs/latest/configuration.html",
+"https://spark.apache.org/docs/latest/graphx-programming-guide.html",
+"https://spark.apache.org/docs/latest/hardware-provisioning.html",
+"https://spark.apache.org/docs/latest/index.html",
+"https://spark.apache.org/docs/latest/job-scheduling.html",
+"https://spark.apache.org/docs/latest/migration-guide.html",
+"https://spark.apache.org/docs/latest/ml-guide.html",
+"https://spark.apache.org/docs/latest/monitoring.html",
+"https://spark.apache.org/docs/latest/quick-start.html",
+"https://spark.apache.org/docs/latest/rdd-programming-guide.html",
+"https://spark.apache.org/docs/latest/running-on-kubernetes.html",
+"https://spark.apache.org/docs/latest/running-on-mesos.html",
+"https://spark.apache.org/docs/latest/running-on-yarn.html",
+"https://spark.apache.org/docs/latest/security.html",
+"https://spark.apache.org/docs/latest/spark-standalone.html",
+"https://spark.apache.org/docs/latest/sparkr.html",
+"https://spark.apache.org/docs/latest/sql-data-sources.html",
+"https://spark.apache.org/docs/latest/sql-distributed-sql-engine.html",
+"https://spark.apache.org/docs/latest/sql-error-conditions.html",
+"https://spark.apache.org/docs/latest/sql-getting-started.html",
+"https://spark.apache.org/docs/latest/sql-migration-guide.html",
+"https://spark.apache.org/docs/latest/sql-performance-tuning.html",
+"https://spark.apache.org/docs/latest/sql-programming-guide.html",
+"https://spark.apache.org/docs/latest/sql-pyspark-pandas-with-arrow.html",
+"https://spark.apache.org/docs/latest/sql-ref-ansi-compliance.html",
+"https://spark.apache.org/docs/latest/sql-ref-datatypes.html",
+"https://spark.apache.org/docs/latest/sql-ref-datetime-pattern.html",
+"https://spark.apache.org/docs/latest/sql-ref-functions-builtin.html",
+"https://spark.apache.org/docs/latest/sql-ref-functions-udf-aggregate.html",
+"https://spark.apache.org/docs/latest/sql-ref-functions-udf-hive.html",
+"https://spark.apache.org/docs/latest/sql-ref-functions-udf-scalar.html",
+"https://spark.apache.org/docs/latest/sql-ref-functions.html",
+"https://spark.apache.org/docs/latest/sql-ref-identifier-clause.html",
+"https://spark.apache.org/docs/latest/sql-ref-identifier.html",
+"https://spark.apache.org/docs/latest/sql-ref-literals.html",
+"https://spark.apache.org/docs/latest/sql-ref-null-semantics.html",
+"https://spark.apache.org/docs/latest/sql-ref-number-pattern.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-analyze-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-cache-cache-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-cache-clear-cache.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-cache-refresh-function.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-cache-refresh-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-cache-refresh.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-cache-uncache-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-conf-mgmt-reset.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-conf-mgmt-set.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-describe-database.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-describe-function.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-describe-query.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-describe-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-resource-mgmt-add-file.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-resource-mgmt-add-jar.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-resource-mgmt-list-file.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-resource-mgmt-list-jar.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-columns.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-create-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-databases.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-functions.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-partitions.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-tables.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-tblproperties.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-aux-show-views.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-alter-database.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-alter-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-alter-view.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-create-database.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-create-function.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-create-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-create-view.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-drop-database.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-drop-function.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-drop-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-drop-view.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-repair-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-truncate-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-ddl-usedb.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-dml-insert-overwrite-directory.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-dml-insert-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-dml-load.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-explain.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-aggregate.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-case.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-clusterby.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-cte.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-distribute-by.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-file.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-groupby.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-having.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-hints.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-inline-table.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-join.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-lateral-subquery.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-lateral-view.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-like.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-limit.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-offset.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-orderby.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-pivot.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-sampling.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-setops.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-sortby.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-transform.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-tvf.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-unpivot.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-where.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select-window.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax-qry-select.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax.html",
+"https://spark.apache.org/docs/latest/sql-ref-syntax.html#auxiliary-statements",
+"https://spark.apache.org/docs/latest/sql-ref-syntax.html#data-retrieval-statements",
+"https://spark.apache.org/docs/latest/sql-ref-syntax.html#ddl-statements",
+"https://spark.apache.org/docs/latest/sql-ref-syntax.html#dml-statements",
+"https://spark.apache.org/docs/latest/sql-ref.html",
+"https://spark.apache.org/docs/latest/streaming-programming-guide.html",
+"https://spark.apache.org/docs/latest/structured-streaming-programming-guide.html",
+"https://spark.apache.org/docs/latest/submitting-applications.html",
+"https://spark.apache.org/docs/latest/tuning.html",
+"https://spark.apache.org/third-party-projects.html",
+
               ]
\ No newline at end of file
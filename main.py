@@ -1,23 +1,29 @@
-#main.py
-from src.data_loader.document_loader import DocumentationLoader
-from src.core.rag.vector_store import VectorStoreManager
-from config.settings import settings
-
-def initialize_system():
-    # Load documents
-    loader = DocumentationLoader()
-    loader.load_documents()
-    
-    # Create vector stores
-    vsm = VectorStoreManager()
-    
-    with open(f"{settings.RAW_DOCS_PATH}/trino_docs.txt", "r", encoding="utf-8") as f:  # Add encoding
-        vsm.create_vector_store(f.read(), "trino_faiss_index")
-    
-    # Process Spark docs
-    with open(f"{settings.RAW_DOCS_PATH}/spark_docs.txt", "r", encoding="utf-8") as f:  # Add encoding
-        vsm.create_vector_store(f.read(), "spark_faiss_index")
-
-if __name__ == "__main__":
-    initialize_system()
-    print("✅ System initialized successfully!")
\ No newline at end of file
+#main.py
+import sys
+from src.data_loader.document_loader import DocumentationLoader
+from src.core.rag.vector_store import VectorStoreManager
+from src.core.dialects import get_dialect, enabled_dialects
+from config.settings import settings
+
+def initialize_system(dialects=None):
+    """Download docs and build indexes up front for the given (default: enabled) dialects.
+
+    Optional: indexes are otherwise built lazily the first time a dialect is queried.
+    """
+    dialects = dialects or enabled_dialects()
+
+    # Load documents
+    loader = DocumentationLoader()
+    loader.load_documents(dialects)
+    
+    # Create vector stores
+    vsm = VectorStoreManager()
+    
+    for name in dialects:
+        dialect = get_dialect(name)
+        with open(f"{settings.RAW_DOCS_PATH}/{dialect.raw_docs_file}", "r", encoding="utf-8") as f:  # Add encoding
+            vsm.create_vector_store(f.read(), dialect.index_name)
+
+if __name__ == "__main__":
+    initialize_system(sys.argv[1:] or None)
+    print("✅ System initialized successfully!")
@@ -1,89 +1,111 @@
-from langchain.agents import AgentExecutor, Tool
-from langchain.agents.format_scratchpad.openai_functions import format_to_openai_function_messages
-from langchain.agents.output_parsers import OpenAIFunctionsAgentOutputParser
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.runnables import RunnablePassthrough
-from src.core.rag.vector_store import VectorStoreManager
-from src.core.llm.groq_client import GroqClient
-from typing import List, Optional, Dict, Any
-import logging
-
-class BaseSQLAgent:
-    def __init__(self, system_prompt: str, verbose: bool = True, max_iterations: int = 5):
-        self.vector_store = VectorStoreManager()
-        self.tools = self._initialize_tools()
-        self.llm = GroqClient().llm.bind_tools(self.tools)
-        self.system_prompt = system_prompt
-        self.verbose = verbose
-        self.max_iterations = max_iterations
-        self.agent_executor = self._create_agent()
-
-    def _initialize_tools(self) -> List[Tool]:
-        return [
-            Tool(
-                name="DocumentationSearch",
-                func=self._search_docs,
-                description="Access SQL documentation for syntax verification"
-            )
-        ]
-
-    def _search_docs(self, query: str, sql_type: str) -> str:
-        try:
-            # Determine the appropriate FAISS index based on sql_type
-            faiss_index = "trino_faiss_index" if sql_type.lower() == "trino" else "spark_faiss_index"
-
-            # Load the selected FAISS index
-            db = self.vector_store.load_vector_store(faiss_index)
-            
-            # Perform similarity search (fetch top 3 relevant documents)
-            docs = db.similarity_search(query, k=3)
-
-            # Return the retrieved documentation content
-            return "\n\n".join([d.page_content for d in docs])
-        
-        except Exception as e:
-            logging.error(f"Document search failed: {str(e)}")
-            return "Documentation unavailable"
-
-
-    def _create_agent(self) -> AgentExecutor:
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", self.system_prompt),
-            ("user", "Schema: {schema}\nQuery: {query}"),
-            MessagesPlaceholder(variable_name="agent_scratchpad"),
-        ])
-
-        agent = (
-            RunnablePassthrough.assign(
-                agent_scratchpad=lambda x: self._format_scratchpad(
-                    x.get("intermediate_steps", [])
-                )
-            )
-            | prompt
-            | self.llm
-            | OpenAIFunctionsAgentOutputParser()
-        )
-
-        return AgentExecutor(
-            agent=agent,
-            tools=self.tools,
-            verbose=self.verbose,
-            max_iterations=self.max_iterations,
-            handle_parsing_errors=self._handle_parsing_error,
-        )
-
-    def _format_scratchpad(self, intermediate_steps) -> list:
-        try:
-            return format_to_openai_function_messages(intermediate_steps)
-        except (KeyError, TypeError) as e:
-            logging.warning(f"Scratchpad formatting error: {str(e)}")
-            return []
-
-    def _handle_parsing_error(self, error: Exception) -> Dict[str, Any]:
-        logging.error(f"Parsing error: {str(error)}")
-        return {
-            "output": {
-                "error": f"Parsing error: {str(error)}",
-                "raw_response": str(error)
-            }
+from langchain.agents import AgentExecutor, Tool
+from langchain.agents.format_scratchpad.openai_functions import format_to_openai_function_messages
+from langchain.agents.output_parsers import OpenAIFunctionsAgentOutputParser
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnablePassthrough
+from src.core.rag.vector_store import VectorStoreManager
+from src.core.rag.dialect_indexes import dialect_indexes
+from src.core.dialects import get_dialect
+from src.core.llm.groq_client import GroqClient
+from config.settings import settings
+from typing import List, Optional, Dict, Any
+import logging
+
+class BaseSQLAgent:
+    def __init__(self, system_prompt: str, verbose: bool = True, max_iterations: int = 5,
+                 model_name: Optional[str] = None):
+        self.vector_store = VectorStoreManager()
+        self.sql_type = "trino"
+        self._tool_cache: Dict[tuple, Any] = {}
+        self.tools = self._initialize_tools()
+        self.model_name = model_name or settings.DEFAULT_LLM_MODEL
+        self.base_llm = GroqClient(self.model_name).llm
+        self.llm = self.base_llm.bind_tools(self.tools)
+        self.system_prompt = system_prompt
+        self.verbose = verbose
+        self.max_iterations = max_iterations
+        self.agent_executor = self._create_agent()
+
+    def _initialize_tools(self) -> List[Tool]:
+        return [
+            Tool(
+                name="DocumentationSearch",
+                func=lambda query: self._search_docs(query, self.sql_type),
+                description="Access SQL documentation for syntax verification"
+            )
+        ]
+
+    def _begin_request(self, sql_type: str) -> None:
+        """Reset per-request state so tool results are memoized only within one request"""
+        self.sql_type = sql_type
+        self._tool_cache = {}
+
+    def _call_tool_memoized(self, tool_name: str, func, *args) -> Any:
+        """Run a tool once per distinct input within the current request"""
+        key = (tool_name,) + tuple(
+            " ".join(arg.lower().split()) if isinstance(arg, str) else arg for arg in args
+        )
+        if key not in self._tool_cache:
+            self._tool_cache[key] = func(*args)
+        return self._tool_cache[key]
+
+    def _search_docs(self, query: str, sql_type: str) -> str:
+        # Determine the appropriate FAISS index from the dialect registry
+        faiss_index = get_dialect(sql_type).index_name
+        return self._call_tool_memoized("DocumentationSearch", self._search_index, faiss_index, query)
+
+    def _search_index(self, faiss_index: str, query: str) -> str:
+        try:
+            # Perform a cached similarity search (fetch top 3 relevant documents),
+            # building or loading the dialect's index on first use
+            docs = dialect_indexes.similarity_search(faiss_index, query, k=3)
+
+            # Return the retrieved documentation content
+            return "\n\n".join([d.page_content for d in docs])
+        
+        except Exception as e:
+            logging.error(f"Document search failed: {str(e)}")
+            return "Documentation unavailable"
+
+
+    def _create_agent(self) -> AgentExecutor:
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", self.system_prompt),
+            ("user", "Schema: {schema}\nQuery: {query}"),
+            MessagesPlaceholder(variable_name="agent_scratchpad"),
+        ])
+
+        agent = (
+            RunnablePassthrough.assign(
+                agent_scratchpad=lambda x: self._format_scratchpad(
+                    x.get("intermediate_steps", [])
+                )
+            )
+            | prompt
+            | self.llm
+            | OpenAIFunctionsAgentOutputParser()
+        )
+
+        return AgentExecutor(
+            agent=agent,
+            tools=self.tools,
+            verbose=self.verbose,
+            max_iterations=self.max_iterations,
+            handle_parsing_errors=self._handle_parsing_error,
+        )
+
+    def _format_scratchpad(self, intermediate_steps) -> list:
+        try:
+            return format_to_openai_function_messages(intermediate_steps)
+        except (KeyError, TypeError) as e:
+            logging.warning(f"Scratchpad formatting error: {str(e)}")
+            return []
+
+    def _handle_parsing_error(self, error: Exception) -> Dict[str, Any]:
+        logging.error(f"Parsing error: {str(error)}")
+        return {
+            "output": {
+                "error": f"Parsing error: {str(error)}",
+                "raw_response": str(error)
+            }
         }
\ No newline at end of file
@@ -1,23 +1,104 @@
-from .base_agent import BaseSQLAgent
-from pydantic import BaseModel
-
-class PerformanceEstimate(BaseModel):
-    complexity: str
-    resource_estimate: dict
-    potential_bottlenecks: list[str]
-    optimization_suggestions: list[str]
-
-class PerformanceAgent(BaseSQLAgent):
-    SYSTEM_PROMPT = """Analyze SQL query performance characteristics:
-    1. Estimate computational complexity
-    2. Predict resource requirements
-    3. Identify potential bottlenecks"""
-
-    def __init__(self):
-        super().__init__(self.SYSTEM_PROMPT)
-
-    def estimate_performance(self, sql: str) -> dict:
-        result = self.agent_executor.invoke({
-            "input": f"Analyze performance of:\n{sql}"
-        })
-        return PerformanceEstimate.parse_raw(result["output"]).dict()
\ No newline at end of file
+from .base_agent import BaseSQLAgent
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from src.core.analysis.cost_model import analyze_sql
+from src.core.analysis.fingerprint import analysis_store
+from src.core.table_stats import table_rows as stats_table_rows
+import logging
+
+class PerformanceEstimate(BaseModel):
+    complexity: str
+    resource_estimate: dict
+    potential_bottlenecks: list[str]
+    optimization_suggestions: list[str]
+    estimated_cost: float = 0.0
+
+class PerformanceAgent(BaseSQLAgent):
+    SYSTEM_PROMPT = """Analyze SQL query performance characteristics:
+    1. Estimate computational complexity
+    2. Predict resource requirements
+    3. Identify potential bottlenecks"""
+
+    NARRATIVE_PROMPT = """You are a {sql_type} performance expert. A static analyzer already measured this query:
+    Complexity: {complexity}
+    Estimated cost (rows processed): {estimated_cost}
+    Bottlenecks: {bottlenecks}
+
+    Query:
+    {sql}
+
+    Give at most 3 additional, concrete optimization suggestions, one per line, each starting with "- ".
+    Do not repeat the bottlenecks above."""
+
+    def __init__(self):
+        super().__init__(self.SYSTEM_PROMPT)
+
+    def estimate_performance(self, sql: str, sql_type: str = "trino",
+                             table_rows: Optional[Dict[str, int]] = None,
+                             partition_columns: Optional[Dict[str, List[str]]] = None,
+                             narrative: bool = False,
+                             table_stats: Optional[Dict[str, dict]] = None) -> dict:
+        """
+        Estimates query cost with the local static analyzer; the LLM only adds narrative suggestions.
+
+        Args:
+            sql (str): Query to analyze.
+            sql_type (str): Dialect of the query.
+            table_rows (dict): Optional row counts per table.
+            partition_columns (dict): Optional partition columns per table.
+            narrative (bool): Also ask the LLM for extra suggestions on top of the rule-based ones;
+                off by default, as it turns a millisecond estimate into an LLM round trip.
+            table_stats (dict): Optional per-table statistics; their row counts fill in table_rows.
+
+        Returns:
+            dict: PerformanceEstimate fields, or an error if the SQL cannot be parsed.
+        """
+        table_rows = {**stats_table_rows(table_stats), **(table_rows or {})}
+        # The cost model does not look at literal values, so one estimate serves every
+        # query with the same fingerprint
+        return analysis_store.get_or_compute(
+            "performance", sql, sql_type,
+            lambda: self._estimate_performance(sql, sql_type, table_rows, partition_columns, narrative),
+            key_parts=(sql_type.lower(), table_rows, partition_columns, narrative, self.model_name if narrative else None),
+            # Bottlenecks and suggestions name the query's aliases
+            alias_sensitive=True
+        )
+
+    def _estimate_performance(self, sql: str, sql_type: str, table_rows: Dict[str, int],
+                              partition_columns: Optional[Dict[str, List[str]]], narrative: bool) -> dict:
+        try:
+            analysis = analyze_sql(sql, sql_type, table_rows, partition_columns)
+        except Exception as e:
+            return {"error": f"Could not analyze SQL: {str(e)}"}
+
+        suggestions = list(analysis.suggestions)
+        if narrative:
+            suggestions.extend(self._narrative_suggestions(sql, sql_type, analysis))
+
+        return PerformanceEstimate(
+            complexity=analysis.complexity,
+            resource_estimate={
+                "estimated_rows_scanned": analysis.estimated_rows_scanned,
+                "estimated_cost_units": analysis.estimated_cost,
+                "tables": analysis.tables,
+                "join_count": analysis.join_count,
+                "join_types": analysis.join_types,
+            },
+            potential_bottlenecks=analysis.bottlenecks,
+            optimization_suggestions=suggestions,
+            estimated_cost=analysis.estimated_cost
+        ).dict()
+
+    def _narrative_suggestions(self, sql: str, sql_type: str, analysis) -> list[str]:
+        try:
+            response = self.base_llm.invoke(self.NARRATIVE_PROMPT.format(
+                sql_type=sql_type,
+                complexity=analysis.complexity,
+                estimated_cost=analysis.estimated_cost,
+                bottlenecks="; ".join(analysis.bottlenecks) or "none",
+                sql=sql
+            )).content
+        except Exception as e:
+            logging.warning(f"Narrative suggestions unavailable: {str(e)}")
+            return []
+        return [line.strip()[2:].strip() for line in response.splitlines() if line.strip().startswith("- ")][:3]
@@ -1,57 +1,142 @@
-from .base_agent import BaseSQLAgent
-from pydantic import BaseModel, ValidationError
-import json
-
-class OptimizationResult(BaseModel):
-    original_query: str
-    optimized_query: str
-    techniques_used: list[str]
-    performance_improvement: str
-
-class QueryOptimizerAgent(BaseSQLAgent):
-    SYSTEM_PROMPT = """You are an expert SQL query optimizer.
-    Optimize SQL queries based on the following techniques:
-    1. Predicate pushdown
-    2. Join ordering
-    3. Index utilization
-    4. Cost-based optimizations
-    Ensure that optimizations are specific to the SQL type: {sql_type} (Trino/Spark)."""
-
-    def __init__(self):
-        super().__init__(self.SYSTEM_PROMPT)
-
-    def optimize_query(self, sql: str, sql_type: str) -> dict:
-
-        result = None
-        try:
-            result = self.agent_executor.invoke({
-                "query": sql,
-                "sql_type": sql_type
-            })
-
-            if not result or "output" not in result:
-                return {"error": "Empty or invalid response from optimizer"}
-
-            return self._parse_result(result["output"], sql)
-        except Exception as e:
-            return {
-                "error": f"Execution failed: {str(e)}",
-                "raw_response": str(result) if result else "No response generated"
-            }
-
-    def _parse_result(self, raw_output: str, original_query: str) -> dict:
- 
-        try:
-            parsed = json.loads(raw_output)
-            validated = OptimizationResult(**parsed)
-            return validated.dict()
-        except json.JSONDecodeError as e:
-            return {
-                "error": f"Invalid JSON format: {str(e)}",
-                "raw_response": raw_output
-            }
-        except ValidationError as e:
-            return {
-                "error": f"Validation failed: {e.errors()}",
-                "raw_response": raw_output
-            }
+from .base_agent import BaseSQLAgent
+from pydantic import BaseModel
+from typing import Dict, Optional
+from src.core.analysis.rewriter import rewrite_sql
+from src.core.analysis.cost_model import analyze_sql
+from src.core.analysis.fingerprint import analysis_store
+from src.core.cache.disk_cache import content_key
+from src.core.cache.singleflight import single_flight
+from src.core.table_stats import format_stats_compact, table_rows
+from src.core.llm.structured_output import parse_structured, StructuredOutputError
+import json
+import logging
+
+class OptimizationResult(BaseModel):
+    original_query: str
+    optimized_query: str
+    techniques_used: list[str]
+    performance_improvement: str
+
+class QueryOptimizerAgent(BaseSQLAgent):
+    SYSTEM_PROMPT = """You are an expert SQL query optimizer.
+    A rule engine has already applied predicate pushdown, projection pruning, constant folding,
+    subquery-to-join and redundant DISTINCT/ORDER BY removal without improving this query.
+    Optimize it only with techniques beyond those, such as:
+    1. Join ordering
+    2. Index utilization
+    3. Cost-based optimizations
+    Ensure that optimizations are specific to the SQL type: {sql_type} (Trino/Spark).
+    Return JSON with EXACTLY these fields: original_query, optimized_query,
+    techniques_used (list of strings), performance_improvement."""
+
+    def __init__(self):
+        super().__init__(self.SYSTEM_PROMPT)
+
+    def optimize_query(self, sql: str, sql_type: str,
+                       schema: Optional[Dict[str, Dict[str, str]]] = None,
+                       use_llm_fallback: bool = True,
+                       table_stats: Optional[Dict[str, dict]] = None) -> dict:
+        """
+        Optimizes a query with the local rewrite engine, using the LLM only when no rule applies.
+
+        Args:
+            sql (str): Query to optimize.
+            sql_type (str): Dialect of the query.
+            schema (dict): Optional {table: {column: type}} mapping.
+            use_llm_fallback (bool): Ask the LLM when the rule engine cannot improve the query.
+            table_stats (dict): Optional per-table statistics from src.core.table_stats.
+
+        Returns:
+            dict: OptimizationResult fields or an error.
+        """
+        # Raw SQL: whitespace inside string literals is significant
+        key = content_key(sql, sql_type.lower(), schema, use_llm_fallback, table_stats, self.model_name)
+        # Queries that differ only in literals, aliases or layout reuse the stored result,
+        # with the optimized query re-bound to this query's literals and aliases
+        return single_flight.do(
+            "optimization", key,
+            lambda: analysis_store.get_or_compute(
+                "optimization", sql, sql_type,
+                lambda: self._optimize_query(sql, sql_type, schema, use_llm_fallback, table_stats),
+                key_parts=(sql_type.lower(), schema, use_llm_fallback, table_stats, self.model_name),
+                sql_fields=("optimized_query",),
+                input_fields=("original_query",)
+            )
+        )
+
+    def _optimize_query(self, sql: str, sql_type: str, schema: Optional[Dict[str, Dict[str, str]]],
+                        use_llm_fallback: bool, table_stats: Optional[Dict[str, dict]]) -> dict:
+        try:
+            optimized, techniques = rewrite_sql(sql, sql_type, schema)
+        except Exception as e:
+            logging.info(f"Rule engine could not parse query, using LLM: {str(e)}")
+            optimized, techniques = sql, []
+
+        if techniques:
+            return OptimizationResult(
+                original_query=sql,
+                optimized_query=optimized,
+                techniques_used=techniques,
+                performance_improvement=self._estimate_improvement(sql, optimized, sql_type, table_stats)
+            ).dict()
+
+        if not use_llm_fallback:
+            return OptimizationResult(
+                original_query=sql,
+                optimized_query=sql,
+                techniques_used=[],
+                performance_improvement="No applicable rewrite rules"
+            ).dict()
+
+        return self._optimize_with_llm(sql, sql_type, schema, table_stats)
+
+    def _estimate_improvement(self, original: str, optimized: str, sql_type: str,
+                              table_stats: Optional[Dict[str, dict]] = None) -> str:
+        rows = table_rows(table_stats)
+        try:
+            before = analyze_sql(original, sql_type, rows).estimated_cost
+            after = analyze_sql(optimized, sql_type, rows).estimated_cost
+        except Exception:
+            return "Mechanical rewrite; cost could not be estimated"
+        if before <= 0 or after >= before:
+            return "Less data read and processed (same estimated scan cost)"
+        return f"Estimated cost reduced by {100 * (before - after) / before:.0f}% ({before:,.0f} -> {after:,.0f} rows processed)"
+
+    def _optimize_with_llm(self, sql: str, sql_type: str, schema: Optional[dict],
+                           table_stats: Optional[Dict[str, dict]] = None) -> dict:
+        result = None
+        self._begin_request(sql_type)
+        schema_text = json.dumps(schema) if schema else "Not provided"
+        if table_stats:
+            schema_text += f"\nTable statistics:\n{format_stats_compact(table_stats)}"
+        try:
+            result = self.agent_executor.invoke({
+                "query": sql,
+                "schema": schema_text,
+                "sql_type": sql_type
+            })
+
+            if not result or "output" not in result:
+                return {"error": "Empty or invalid response from optimizer"}
+
+            return self._parse_result(result["output"], sql)
+        except Exception as e:
+            return {
+                "error": f"Execution failed: {str(e)}",
+                "raw_response": str(result) if result else "No response generated"
+            }
+
+    def _parse_result(self, raw_output: str, original_query: str) -> dict:
+ 
+        try:
+            validated = parse_structured(
+                raw_output, OptimizationResult, llm=self.base_llm, source="query_optimizer",
+                aliases={"query": "optimized_query", "optimized_sql": "optimized_query", "techniques": "techniques_used"},
+                defaults={"original_query": original_query}
+            )
+            return validated.dict()
+        except StructuredOutputError as e:
+            return {
+                "error": f"Invalid structured output: {str(e)}",
+                "raw_response": raw_output
+            }
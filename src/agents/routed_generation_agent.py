@@ -0,0 +1,58 @@
+from .sql_generation_agent import SQLGenerationAgent, StatusCallback, validation_error
+from config.settings import settings
+from src.core.llm.router import ModelRouter, model_router
+from typing import Optional, Dict, Any
+import time
+
+# Retrieved documentation that ends up in the prompt (3 chunks)
+DOCS_CONTEXT_CHARS = 3 * settings.CHUNK_SIZE
+
+
+class RoutedSQLGenerationAgent:
+    """Sends each generation request to the model the router picks, escalating on invalid output"""
+
+    def __init__(self, router: ModelRouter = model_router):
+        self.router = router
+        self._agents: Dict[str, SQLGenerationAgent] = {}
+
+    def _agent(self, model_name: str) -> SQLGenerationAgent:
+        if model_name not in self._agents:
+            self._agents[model_name] = SQLGenerationAgent(model_name=model_name)
+        return self._agents[model_name]
+
+    def preload(self) -> None:
+        """Build the agent for every model on the ladder up front instead of on first use"""
+        for model_name in self.router.ladder:
+            self._agent(model_name)
+
+    def generate_query(self, question: str, schema: str, sql_type: str,
+                       table_stats: Optional[str] = None, routing_question: Optional[str] = None,
+                       extra_context_chars: int = 0,
+                       on_status: Optional[StatusCallback] = None) -> Dict[str, Any]:
+        """
+        ``routing_question`` is what the router scores when ``question`` carries added
+        context (e.g. a RAG answer), whose length is passed as ``extra_context_chars``.
+        ``on_status`` gets the routing decision, then each attempt's stages.
+        """
+        report = on_status or (lambda status: None)
+        decision = self.router.route(
+            routing_question or question, schema,
+            context_chars=len(table_stats or "") + DOCS_CONTEXT_CHARS + extra_context_chars
+        )
+        model = decision.model
+        report({"stage": "routing", "model": model, "score": decision.score})
+
+        while True:
+            start = time.perf_counter()
+            result = self._agent(model).generate_query(question, schema, sql_type, table_stats, on_status=on_status)
+            error = validation_error(result, sql_type)
+            next_model = self.router.escalate(model) if error else None
+            if next_model:
+                report({"stage": "escalation", "model": next_model, "reason": error})
+            outcome = "ok" if error is None else "escalated" if next_model else "failed"
+            self.router.record(decision, model, time.perf_counter() - start, outcome)
+
+            if next_model is None:
+                result["model"] = model
+                return result
+            model = next_model
@@ -1,136 +1,254 @@
-from .base_agent import BaseSQLAgent
-from pydantic import BaseModel, ValidationError
-import json
-from typing import Optional, Dict, Any
-
-class GenerationResult(BaseModel):
-    query: str
-    explanation: str
-    potential_issues: list[str]
-    alternatives: list[str]
-
-class SQLGenerationAgent(BaseSQLAgent):
-    SYSTEM_PROMPT = """
-    You are a SQL expert. Follow these rules:
-        ## **Supported Features ✅**
-    **Use the following features in queries: for SPARK only**
-    - **Date Functions:** `date_trunc`, `date_add`, `current_date`, `unix_timestamp`
-    - **Filtering:** `WHERE`, `BETWEEN`
-    - **Aggregations:** `GROUP BY`, `HAVING`
-    - **Joins:** `INNER, LEFT, RIGHT, FULL OUTER JOIN`
-    - **CTEs (WITH clause):** Use for complex queries
-    - **Window Functions:** `RANK(), ROW_NUMBER(), LEAD(), LAG()`
-    - **JSON Handling:** `get_json_object(), json_tuple()`
-    - **Bucketing & Partitioning:** `PARTITIONED BY`, `CLUSTERED BY`
-
-        **DO NOT generate queries using the following: for TRINO only**
-    `CREATE INDEX` (Use **partitioning** instead)  
-    `CREATE MATERIALIZED VIEW` (Use **regular views** instead)  
-    `MERGE INTO` (Use `INSERT INTO ... SELECT` instead)  
-    `UPDATE/DELETE` (Limited support; Use **CTAS or INSERT INTO ... SELECT** instead)  
-    `AUTO_INCREMENT` (Use `UUID()` or `ROW_NUMBER()`)  
-    `BEGIN TRANSACTION` (Use **ETL pipelines** instead)  
-    `CREATE PROCEDURE / TRIGGER` (Use **external orchestration** tools like Airflow) 
-
-    1. Return JSON with EXACTLY these fields:
-       - query: Valid SQL string
-       - explanation: Technical rationale
-       - potential_issues: List of strings
-       - alternatives: List of Top 3 optimized SQL queries using CTEs, indexing, partitioning, etc. in markdown format
-    2. Use this schema:
-       {schema}  # ✅ Proper variable
-    3. Use this SQL-Type (Trino / Spark): 
-       {sql_type} # ✅ Proper variable
-    4. Example response:
-       {{
-         "query": "SELECT id FROM users",  # ✅ No stray formatting
-         "explanation": "Simple ID retrieval",
-         "potential_issues": ["No index on id"],
-         "alternatives": [```SELECT user_id FROM accounts```, ```SELECT id FROM users WHERE created_at > '2023-01-01'```]"]
-       }}
-       
-       
-       """
-
-    def __init__(self):
-        super().__init__(self.SYSTEM_PROMPT)
-
-    def generate_query(self, question: str, schema: str, sql_type: str) -> Dict[str, Any]:
-
-        result: Optional[dict] = None
-
-        # Select the correct FAISS index
-        faiss_index = self.select_faiss_index(sql_type)
-
-        # Retrieve relevant documentation snippets
-        documentation_snippets = self.documentation_search(faiss_index, question)
-
-        try:
-            result = self.agent_executor.invoke({
-                "query": question,
-                "schema": schema,
-                "sql_type": sql_type,
-                "docs": documentation_snippets  # Pass documentation search results
-            })
-
-            if not result:
-                return {"error": "Empty response from SQL agent"}
-
-            return self._parse_result(result)
-        except Exception as e:
-            return {
-                "error": f"Execution failed: {str(e)}",
-                "raw_response": str(result) if result else "No response generated"
-            }
-
-    def select_faiss_index(self, sql_type: str):
-        return "trino_faiss_index" if sql_type.lower() == "trino" else "spark_faiss_index"
-
-    def documentation_search(self, faiss_index: str, query: str):
-        """
-        Searches documentation for SQL-specific syntax related to the query.
-
-        Args:
-            faiss_index (str): The FAISS index for the SQL dialect.
-            query (str): The natural language query.
-
-        Returns:
-            list: Relevant documentation snippets.
-        """
-        return self.use_tool("DocumentationSearch", {"index": faiss_index, "query": query})
-    
-    def use_tool(self, tool_name: str, params: dict):
-        """
-        Uses a tool (e.g., FAISS documentation search) if available.
-
-        Args:
-            tool_name (str): Name of the tool to use.
-            params (dict): Parameters for the tool.
-
-        Returns:
-            list: Output from the tool.
-        """
-        if tool_name in self.tools:
-            return self.tools[tool_name].invoke(params)
-        return []
-    
-    def _parse_result(self, result: dict) -> Dict[str, Any]:
-
-        if "output" not in result:
-            return {"error": "Missing 'output' in agent response"}
-
-        raw_output = result["output"]
-        try:
-            parsed = json.loads(raw_output)
-            validated = GenerationResult(**parsed)
-            return validated.dict()
-        except json.JSONDecodeError as e:
-            return {
-                "error": f"Invalid JSON: {str(e)}",
-                "raw_response": raw_output
-            }
-        except ValidationError as e:
-            return {
-                "error": f"Validation errors: {e.errors()}",
-                "raw_response": raw_output
-            },
\ No newline at end of file
+from .base_agent import BaseSQLAgent
+from pydantic import BaseModel
+from langchain_core.prompts import ChatPromptTemplate
+from config.settings import settings
+from src.core.cache.disk_cache import content_key
+from src.core.cache.singleflight import normalize_text, single_flight
+from src.core.dialects import get_dialect
+from src.core.execution.sandbox import strip_sql_fences
+from src.core.llm.structured_output import parse_stats, parse_structured, StructuredOutputError
+import logging
+from typing import Callable, Optional, Dict, Any
+
+# Receives progress of a generation run, e.g. {"stage": "draft", "query": ...}
+StatusCallback = Callable[[Dict[str, Any]], None]
+
+
+def validation_error(result: Dict[str, Any], sql_type: str) -> Optional[str]:
+    """Why a generation result is unusable (an error or SQL that does not parse), or None"""
+    if "error" in result:
+        return result["error"]
+    import sqlglot
+
+    try:
+        sqlglot.parse_one(strip_sql_fences(result.get("query", "")), read=get_dialect(sql_type).sqlglot_dialect)
+    except Exception as e:
+        return f"Generated query does not parse: {str(e)}"
+    return None
+
+
+class GenerationResult(BaseModel):
+    query: str
+    explanation: str
+    potential_issues: list[str]
+    alternatives: list[str]
+
+class SQLGenerationAgent(BaseSQLAgent):
+    SYSTEM_PROMPT = """
+    You are a SQL expert. Follow these rules:
+    {dialect_rules}
+
+    1. Return JSON with EXACTLY these fields:
+       - query: Valid SQL string
+       - explanation: Technical rationale
+       - potential_issues: List of strings
+       - alternatives: List of Top 3 optimized SQL queries using CTEs, indexing, partitioning, etc. in markdown format
+    2. Use this schema:
+       {schema}  # ✅ Proper variable
+    3. Use this SQL-Type (Trino / Spark): 
+       {sql_type} # ✅ Proper variable
+    4. Example response:
+       {{
+         "query": "SELECT id FROM users",  # ✅ No stray formatting
+         "explanation": "Simple ID retrieval",
+         "potential_issues": ["No index on id"],
+         "alternatives": [```SELECT user_id FROM accounts```, ```SELECT id FROM users WHERE created_at > '2023-01-01'```]"]
+       }}
+    5. Previously accepted queries for similar questions (follow their conventions when relevant):
+       {exemplars}
+       
+       
+       """
+
+    FAST_PATH_USER_PROMPT = """Relevant {sql_type} documentation:
+    {docs}
+
+    Schema: {schema}
+    Query: {query}"""
+
+    def __init__(self, fast_path: bool = settings.FAST_PATH_ENABLED, model_name: Optional[str] = None):
+        super().__init__(self.SYSTEM_PROMPT, model_name=model_name)
+        self.fast_path = fast_path
+        self.fast_path_chain = self._create_fast_path_chain()
+
+    def _create_fast_path_chain(self):
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", self.system_prompt),
+            ("user", self.FAST_PATH_USER_PROMPT),
+        ])
+        return prompt | self.base_llm.with_structured_output(GenerationResult, include_raw=True)
+
+    def generate_query(self, question: str, schema: str, sql_type: str,
+                       table_stats: Optional[str] = None,
+                       on_status: Optional[StatusCallback] = None) -> Dict[str, Any]:
+        """
+        Generates SQL; identical requests already in flight share that run's result.
+        ``on_status`` receives each stage as it completes: retrieval, draft, validation.
+        """
+        key = content_key(normalize_text(question), schema, sql_type.lower(), table_stats,
+                          self.model_name, self.fast_path)
+        return single_flight.do(
+            "generation", key,
+            lambda: self._generate_query(question, schema, sql_type, table_stats,
+                                         lambda status: single_flight.publish("generation", key, status)),
+            listener=on_status
+        )
+
+    def _generate_query(self, question: str, schema: str, sql_type: str,
+                        table_stats: Optional[str] = None,
+                        report: Optional[StatusCallback] = None) -> Dict[str, Any]:
+        report = report or (lambda status: None)
+        result = self._draft_query(question, schema, sql_type, table_stats, report)
+        if "error" not in result:
+            report({"stage": "draft", "model": self.model_name, "query": result["query"]})
+        error = validation_error(result, sql_type)
+        report({"stage": "validation", "model": self.model_name, "valid": error is None, "error": error})
+        return result
+
+    def _draft_query(self, question: str, schema: str, sql_type: str, table_stats: Optional[str],
+                     report: StatusCallback) -> Dict[str, Any]:
+        result: Optional[dict] = None
+        self._begin_request(sql_type)
+
+        # Accepted queries for similar questions, retrieved before statistics are appended to the schema
+        exemplars = self.exemplar_search(question, schema, sql_type)
+
+        # Compact statistics (see src.core.table_stats.format_stats_compact) guide join order and filters
+        if table_stats:
+            schema = f"{schema}\nTable statistics (use for join order and partition filters):\n{table_stats}"
+
+        # Select the correct FAISS index
+        faiss_index = self.select_faiss_index(sql_type)
+
+        # Retrieve relevant documentation snippets
+        documentation_snippets = self.documentation_search(faiss_index, question)
+        report({"stage": "retrieval", "documentation": bool(documentation_snippets),
+                "exemplars": exemplars != "None"})
+
+        if self.fast_path:
+            fast_result = self._generate_single_shot(question, schema, sql_type, documentation_snippets, exemplars)
+            if fast_result is not None:
+                return fast_result
+
+        try:
+            result = self.agent_executor.invoke({
+                "query": question,
+                "schema": schema,
+                "sql_type": sql_type,
+                "dialect_rules": get_dialect(sql_type).prompt_rules,
+                "exemplars": exemplars,
+                "docs": documentation_snippets  # Pass documentation search results
+            })
+
+            if not result:
+                return {"error": "Empty response from SQL agent"}
+
+            return self._parse_result(result)
+        except Exception as e:
+            return {
+                "error": f"Execution failed: {str(e)}",
+                "raw_response": str(result) if result else "No response generated"
+            }
+
+    def _generate_single_shot(self, question: str, schema: str, sql_type: str, docs: str,
+                              exemplars: str = "None") -> Optional[Dict[str, Any]]:
+        """
+        Makes exactly one structured-output LLM call with the retrieved docs in the prompt.
+
+        Returns:
+            dict: The validated GenerationResult, or None when the agent loop should take over.
+        """
+        try:
+            response = self.fast_path_chain.invoke({
+                "query": question,
+                "schema": schema,
+                "sql_type": sql_type,
+                "dialect_rules": get_dialect(sql_type).prompt_rules,
+                "exemplars": exemplars,
+                "docs": docs or "Documentation unavailable"
+            })
+        except Exception as e:
+            logging.warning(f"Fast path failed, falling back to agent loop: {str(e)}")
+            return None
+
+        parsed = response.get("parsed") if isinstance(response, dict) else response
+        if isinstance(parsed, GenerationResult):
+            parse_stats.record("sql_generation_fast_path", "clean")
+            return parsed.dict()
+
+        # Salvage tool-call arguments that failed strict parsing instead of paying for the agent loop
+        raw = response.get("raw") if isinstance(response, dict) else None
+        tool_calls = getattr(raw, "additional_kwargs", {}).get("tool_calls") or []
+        if tool_calls:
+            try:
+                return parse_structured(
+                    tool_calls[0]["function"]["arguments"], GenerationResult,
+                    llm=self.base_llm, source="sql_generation_fast_path"
+                ).dict()
+            except StructuredOutputError:
+                pass  # recorded as failed by parse_structured
+            except KeyError:
+                parse_stats.record("sql_generation_fast_path", "failed")
+        else:
+            parse_stats.record("sql_generation_fast_path", "failed")
+
+        logging.info(f"Fast path produced no valid GenerationResult: {response.get('parsing_error') if isinstance(response, dict) else response}")
+        return None
+
+    def exemplar_search(self, question: str, schema: str, sql_type: str) -> str:
+        """Top accepted (question, SQL) pairs for this dialect, formatted for the prompt"""
+        if not settings.EXEMPLARS_ENABLED:
+            return "None"
+        try:
+            from src.core.rag.exemplar_store import get_exemplar_store, format_exemplars
+            return format_exemplars(get_exemplar_store().search(question, schema, sql_type))
+        except Exception as e:
+            logging.warning(f"Exemplar search failed: {str(e)}")
+            return "None"
+
+    def select_faiss_index(self, sql_type: str):
+        return get_dialect(sql_type).index_name
+
+    def documentation_search(self, faiss_index: str, query: str):
+        """
+        Searches documentation for SQL-specific syntax related to the query.
+
+        Args:
+            faiss_index (str): The FAISS index for the SQL dialect.
+            query (str): The natural language query.
+
+        Returns:
+            list: Relevant documentation snippets.
+        """
+        return self._call_tool_memoized("DocumentationSearch", self._search_index, faiss_index, query)
+    
+    def use_tool(self, tool_name: str, params: dict):
+        """
+        Uses a tool (e.g., FAISS documentation search) if available.
+
+        Args:
+            tool_name (str): Name of the tool to use.
+            params (dict): Parameters for the tool.
+
+        Returns:
+            list: Output from the tool.
+        """
+        tool = next((t for t in self.tools if t.name == tool_name), None)
+        if tool is not None:
+            return tool.invoke(params)
+        return []
+    
+    def _parse_result(self, result: dict) -> Dict[str, Any]:
+
+        if "output" not in result:
+            return {"error": "Missing 'output' in agent response"}
+
+        raw_output = result["output"]
+        try:
+            validated = parse_structured(raw_output, GenerationResult, llm=self.base_llm, source="sql_generation")
+            return validated.dict()
+        except StructuredOutputError as e:
+            return {
+                "error": f"Invalid structured output: {str(e)}",
+                "raw_response": raw_output
+            }
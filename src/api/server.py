@@ -0,0 +1,351 @@
+#src/api/server.py
+"""
+HTTP API used by the Next.js frontend.
+
+Run with ``python -m src.api.server`` (uvicorn, ``API_WORKERS`` processes). Each worker
+loads embeddings, the dialect indexes already on disk and a pool of agents once at
+startup, so requests never pay for model or index loading.
+"""
+import asyncio
+import json
+import logging
+import queue
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from starlette.concurrency import run_in_threadpool
+
+from config.settings import settings
+from src.core.cache.disk_cache import content_key
+from src.core.cache.singleflight import normalize_text, single_flight
+from src.core.dialects import enabled_dialects, get_dialect
+
+
+class AgentPool:
+    """
+    Fixed set of agent instances handed out one request at a time. Agents keep
+    per-request state (dialect, retrieved docs), so an instance is never shared
+    between concurrent requests; the pool size also bounds LLM concurrency.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = settings.API_AGENT_POOL_SIZE,
+                 timeout: float = settings.API_POOL_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self._agents = queue.Queue()
+        for _ in range(size):
+            self._agents.put(factory())
+
+    @contextmanager
+    def acquire(self):
+        try:
+            agent = self._agents.get(timeout=self.timeout)
+        except queue.Empty:
+            raise HTTPException(status_code=503, detail="All agents are busy, retry later")
+        try:
+            yield agent
+        finally:
+            self._agents.put(agent)
+
+
+def _generation_agent():
+    if settings.ROUTER_ENABLED:
+        from src.agents.routed_generation_agent import RoutedSQLGenerationAgent
+        agent = RoutedSQLGenerationAgent()
+        agent.preload()
+        return agent
+    from src.agents.sql_generation_agent import SQLGenerationAgent
+    return SQLGenerationAgent()
+
+
+def _optimizer_agent():
+    from src.agents.query_optimizer_agent import QueryOptimizerAgent
+    return QueryOptimizerAgent()
+
+
+def preload(state: Dict[str, Any]) -> Dict[str, float]:
+    """Load everything a request needs into this worker; returns seconds spent per component"""
+    timings = {}
+
+    start = time.perf_counter()
+    try:
+        from src.core.rag.embeddings import get_embeddings
+        get_embeddings()
+    except Exception as e:
+        logging.warning(f"Embeddings unavailable, documentation search disabled: {str(e)}")
+    timings["embeddings"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from src.core.rag.dialect_indexes import dialect_indexes
+    for name in enabled_dialects():
+        try:
+            if not dialect_indexes.preload(get_dialect(name).index_name):
+                logging.warning(f"No {name} index on disk; it will be built on first use")
+        except Exception as e:
+            logging.warning(f"Could not load {name} index: {str(e)}")
+    timings["indexes"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from src.core.llm.groq_client import GroqClient
+    state["generation"] = AgentPool(_generation_agent)
+    state["optimizer"] = AgentPool(_optimizer_agent)
+    # Used directly by /evaluate and for constructs /translate cannot map without it
+    state["llm"] = GroqClient().llm
+    timings["agents"] = time.perf_counter() - start
+
+    logging.info("API worker ready: " + ", ".join(f"{k} {v:.2f}s" for k, v in timings.items()))
+    return timings
+
+
+_state: Dict[str, Any] = {}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _state["preload_seconds"] = await run_in_threadpool(preload, _state)
+    yield
+    _state.clear()
+
+
+app = FastAPI(title="SQL Assistant API", lifespan=lifespan)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.API_CORS_ORIGINS,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+class GenerateRequest(BaseModel):
+    # "schema" would shadow BaseModel.schema, so the field is aliased
+    model_config = ConfigDict(populate_by_name=True)
+
+    question: str
+    db_schema: Union[dict, list, str] = Field(alias="schema")
+    sql_type: str = "trino"
+    table_stats: Optional[str] = None
+    # Other dialects to return the query in, translated from the one generation run
+    translate_to: List[str] = []
+
+
+class OptimizeRequest(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    sql: str
+    sql_type: str = "trino"
+    db_schema: Optional[Dict[str, Dict[str, str]]] = Field(default=None, alias="schema")
+    use_llm_fallback: bool = True
+    # {table: statistics} as collected by src.core.table_stats.collect_table_stats
+    table_stats: Optional[Dict[str, dict]] = None
+
+
+class EvaluateRequest(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    question: str
+    db_schema: Union[dict, list, str] = Field(alias="schema")
+    sql: str
+    sql_type: str = "trino"
+
+
+class ParseSchemaRequest(BaseModel):
+    input_type: str  # natural_language, csv or sql
+    data: str  # CSV files are sent as text
+
+
+class TranslateRequest(BaseModel):
+    sql: str
+    source: str
+    target: str
+    use_llm_fallback: bool = True
+
+
+def _checked_dialect(name: str) -> None:
+    try:
+        get_dialect(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _agent_result(result: dict) -> dict:
+    """Agents report failures as {"error": ...}; surface those as a bad gateway"""
+    if "error" in result:
+        raise HTTPException(status_code=502, detail=result)
+    return result
+
+
+def _generate(request: GenerateRequest, on_status: Optional[Callable[[dict], None]] = None) -> dict:
+    schema = request.db_schema if isinstance(request.db_schema, str) else json.dumps(request.db_schema)
+    # Coalesced before acquire(), so requests waiting on an identical one do not hold an agent
+    key = content_key(normalize_text(request.question), schema, request.sql_type.lower(), request.table_stats)
+
+    def run() -> dict:
+        with _state["generation"].acquire() as agent:
+            return agent.generate_query(
+                request.question, schema, request.sql_type, request.table_stats,
+                on_status=lambda status: single_flight.publish("api_generation", key, status)
+            )
+
+    result = single_flight.do("api_generation", key, run, listener=on_status)
+    if request.translate_to and "error" not in result:
+        from src.core.analysis.transpiler import translate_generation
+        result["translations"] = translate_generation(result, request.sql_type, request.translate_to, _state["llm"])
+    return result
+
+
+@app.post("/generate")
+async def generate(request: GenerateRequest) -> dict:
+    _checked_dialect(request.sql_type)
+    for target in request.translate_to:
+        _checked_dialect(target)
+    return _agent_result(await run_in_threadpool(_generate, request))
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.post("/generate/stream")
+async def generate_stream(request: GenerateRequest) -> StreamingResponse:
+    """
+    Server-sent events: a ``status`` event per stage as it completes (routing, retrieval,
+    draft with the SQL, validation, escalation), then ``result`` or ``error``, then ``done``
+    """
+    _checked_dialect(request.sql_type)
+    for target in request.translate_to:
+        _checked_dialect(target)
+
+    async def events():
+        loop = asyncio.get_running_loop()
+        updates: asyncio.Queue = asyncio.Queue()
+        yield _sse("status", {"stage": "queued"})
+        # Stages are reported from the worker thread; hand them to this loop without blocking it
+        task = asyncio.ensure_future(run_in_threadpool(
+            _generate, request, lambda status: loop.call_soon_threadsafe(updates.put_nowait, status)
+        ))
+        while True:
+            update = asyncio.ensure_future(updates.get())
+            done, _ = await asyncio.wait({task, update}, timeout=settings.API_SSE_HEARTBEAT_SECONDS,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if update in done:
+                yield _sse("status", update.result())
+                continue
+            update.cancel()
+            if task in done:
+                break
+            # Comment lines keep proxies and the browser from timing out the stream
+            yield ": keep-alive\n\n"
+        # Stages reported just before the result was returned
+        while not updates.empty():
+            yield _sse("status", updates.get_nowait())
+        try:
+            result = task.result()
+        except HTTPException as e:
+            result = {"error": e.detail}
+        except Exception as e:
+            result = {"error": f"Generation failed: {str(e)}"}
+        yield _sse("error" if "error" in result else "result", result)
+        yield _sse("done", {})
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+def _optimize(request: OptimizeRequest) -> dict:
+    with _state["optimizer"].acquire() as agent:
+        return agent.optimize_query(request.sql, request.sql_type, request.db_schema,
+                                    use_llm_fallback=request.use_llm_fallback,
+                                    table_stats=request.table_stats)
+
+
+@app.post("/optimize")
+async def optimize(request: OptimizeRequest) -> dict:
+    _checked_dialect(request.sql_type)
+    return _agent_result(await run_in_threadpool(_optimize, request))
+
+
+@app.post("/evaluate")
+async def evaluate(request: EvaluateRequest) -> dict:
+    from src.core.evaluation import self_evaluate_sql
+
+    _checked_dialect(request.sql_type)
+    return _agent_result(await run_in_threadpool(
+        self_evaluate_sql, request.question, request.db_schema, request.sql_type, request.sql,
+        _state["llm"]
+    ))
+
+
+@app.post("/parse-schema")
+async def parse_schema(request: ParseSchemaRequest) -> dict:
+    from src.core.schema_parser import SchemaParser
+
+    data = request.data.encode("utf-8") if request.input_type == "csv" else request.data
+    try:
+        return await run_in_threadpool(SchemaParser.parse_input, data, request.input_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _translate(request: TranslateRequest) -> dict:
+    from src.core.analysis.transpiler import translate_sql
+
+    try:
+        return translate_sql(request.sql, request.source, request.target,
+                             llm=_state["llm"] if request.use_llm_fallback else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/translate")
+async def translate(request: TranslateRequest) -> dict:
+    return await run_in_threadpool(_translate, request)
+
+
+@app.get("/health")
+async def health() -> dict:
+    from src.core.rag.dialect_indexes import dialect_indexes
+
+    return {
+        "status": "ok" if "generation" in _state else "starting",
+        "dialects": enabled_dialects(),
+        "loaded_indexes": dialect_indexes.loaded_indexes(),
+        "preload_seconds": _state.get("preload_seconds", {}),
+    }
+
+
+@app.get("/stats")
+async def stats() -> dict:
+    from src.core.analysis.fingerprint import analysis_store
+    from src.core.llm.resilience import policy_stats
+    from src.core.llm.router import model_router
+    from src.core.llm.structured_output import parse_stats
+    from src.core.rag.retrieval_cache import retrieval_cache
+
+    return {
+        "parse": parse_stats.stats(),
+        "single_flight": single_flight.stats(),
+        "retrieval_cache": retrieval_cache.stats(),
+        "sql_analysis": analysis_store.stats(),
+        "llm": policy_stats(),
+        "routing": model_router.history()[-20:],
+    }
+
+
+def main():
+    import uvicorn
+
+    uvicorn.run(
+        "src.api.server:app",
+        host=settings.API_HOST,
+        port=settings.API_PORT,
+        workers=settings.API_WORKERS,
+        timeout_keep_alive=settings.API_KEEPALIVE_SECONDS,
+    )
+
+
+if __name__ == "__main__":
+    main()
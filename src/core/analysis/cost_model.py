@@ -0,0 +1,201 @@
+#src/core/analysis/cost_model.py
+import math
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from src.core.dialects import get_dialect
+
+# Row count assumed for tables with no statistics
+DEFAULT_TABLE_ROWS = 1_000_000
+# Fraction of rows assumed to survive a WHERE predicate on a table
+FILTER_SELECTIVITY = 0.25
+# Tables above this size are worth flagging when scanned without any filter
+LARGE_TABLE_ROWS = 10_000_000
+
+
+class CostAnalysis(BaseModel):
+    tables: List[str] = []
+    join_count: int = 0
+    join_types: Dict[str, int] = {}
+    cross_joins: int = 0
+    unbounded_joins: int = 0
+    select_star: bool = False
+    correlated_subqueries: int = 0
+    unpartitioned_windows: int = 0
+    missing_partition_filters: List[str] = []
+    global_sorts: int = 0
+    estimated_rows_scanned: int = 0
+    estimated_cost: float = 0.0
+    complexity: str = "Low"
+    bottlenecks: List[str] = []
+    suggestions: List[str] = []
+
+
+def _filtered_aliases(where) -> set:
+    if where is None:
+        return set()
+    from sqlglot import exp
+    return {col.table for col in where.find_all(exp.Column) if col.table}
+
+
+def _filtered_columns(where, alias: str) -> set:
+    """Column names the WHERE clause filters on for ``alias`` (unqualified columns count for every table)"""
+    if where is None:
+        return set()
+    from sqlglot import exp
+    return {col.name.lower() for col in where.find_all(exp.Column) if col.table in ("", alias)}
+
+
+def _has_equi_predicate(where, alias: str) -> bool:
+    """True when the WHERE clause links ``alias`` to another table with an equality (old-style join)"""
+    if where is None:
+        return False
+    from sqlglot import exp
+    for eq in where.find_all(exp.EQ):
+        tables = {col.table for col in eq.find_all(exp.Column)}
+        if alias in tables and len(tables) > 1:
+            return True
+    return False
+
+
+def _complexity_label(cost: float, has_cartesian: bool, has_sort: bool) -> str:
+    if cost < 1e6:
+        level = "Low"
+    elif cost < 1e8:
+        level = "Medium"
+    elif cost < 1e10:
+        level = "High"
+    else:
+        level = "Very High"
+    big_o = "O(n*m)" if has_cartesian else "O(n log n)" if has_sort else "O(n)"
+    return f"{level} ({big_o})"
+
+
+def analyze_sql(sql: str, sql_type: str = "trino",
+                table_rows: Optional[Dict[str, int]] = None,
+                partition_columns: Optional[Dict[str, List[str]]] = None) -> CostAnalysis:
+    """
+    Walks the SQL AST and produces a deterministic cost estimate with a list of bottlenecks.
+
+    Args:
+        sql (str): Query to analyze.
+        sql_type (str): Dialect the query is written in.
+        table_rows (dict): Optional row counts per table name.
+        partition_columns (dict): Optional partition columns per table name.
+
+    Returns:
+        CostAnalysis: Cost in "rows processed" units plus the detected problems.
+    """
+    import sqlglot
+    from sqlglot import exp
+    from sqlglot.optimizer.scope import build_scope
+
+    table_rows = {k.lower(): v for k, v in (table_rows or {}).items()}
+    partition_columns = {k.lower(): [c.lower() for c in v] for k, v in (partition_columns or {}).items()}
+    analysis = CostAnalysis()
+
+    ast = sqlglot.parse_one(sql, read=get_dialect(sql_type).sqlglot_dialect)
+    root = build_scope(ast)
+    scopes = list(root.traverse()) if root else []
+
+    total_cost = 0.0
+    scanned = 0
+    tables = []
+
+    for scope in scopes:
+        select = scope.expression
+        if not isinstance(select, exp.Select):
+            continue
+        where = select.args.get("where")
+        filtered = _filtered_aliases(where)
+
+        if scope.is_correlated_subquery:
+            analysis.correlated_subqueries += 1
+            analysis.bottlenecks.append("Correlated subquery is re-evaluated per outer row")
+            analysis.suggestions.append("Rewrite the correlated subquery as a JOIN or window function")
+
+        # Scan cost of base tables in this scope
+        scope_rows: Dict[str, float] = {}
+        for alias, source in scope.sources.items():
+            if not isinstance(source, exp.Table):
+                continue
+            name = source.name.lower()
+            rows = table_rows.get(name, DEFAULT_TABLE_ROWS)
+            tables.append(name)
+            scanned += rows
+            total_cost += rows
+            scope_rows[alias] = rows * (FILTER_SELECTIVITY if alias in filtered else 1.0)
+
+            if name in partition_columns and not set(partition_columns[name]) & _filtered_columns(where, alias):
+                analysis.missing_partition_filters.append(name)
+                analysis.bottlenecks.append(f"No partition predicate on {name}; every partition is scanned")
+                analysis.suggestions.append(
+                    f"Filter {name} on its partition column(s): {', '.join(partition_columns[name])}"
+                )
+            elif where is None and rows >= LARGE_TABLE_ROWS:
+                analysis.bottlenecks.append(f"Full scan of large table {name} ({rows:,} rows) without a filter")
+
+        # Join cost: hash joins are linear in both inputs, cartesian products multiply them
+        joins = select.args.get("joins") or []
+        # sqlglot renamed the FROM arg to "from_" in newer releases
+        from_expr = select.args.get("from") or select.args.get("from_")
+        running = scope_rows.get(from_expr.this.alias_or_name, DEFAULT_TABLE_ROWS) if from_expr else 0
+        for join in joins:
+            analysis.join_count += 1
+            kind = " ".join(filter(None, [join.args.get("side"), join.args.get("kind")])) or "INNER"
+            analysis.join_types[kind] = analysis.join_types.get(kind, 0) + 1
+            right_alias = join.this.alias_or_name
+            right_rows = scope_rows.get(right_alias, DEFAULT_TABLE_ROWS)
+            has_condition = join.args.get("on") is not None or join.args.get("using")
+
+            if join.args.get("kind") == "CROSS" or (not has_condition and not _has_equi_predicate(where, right_alias)):
+                if join.args.get("kind") == "CROSS":
+                    analysis.cross_joins += 1
+                    analysis.bottlenecks.append(f"CROSS JOIN with {right_alias} produces a cartesian product")
+                else:
+                    analysis.unbounded_joins += 1
+                    analysis.bottlenecks.append(f"Join with {right_alias} has no join condition (cartesian product)")
+                analysis.suggestions.append(f"Add an equi-join condition for {right_alias}")
+                total_cost += running * right_rows
+                running = running * right_rows
+            else:
+                total_cost += running + right_rows
+                running = max(running, right_rows)
+
+        # SELECT * (but not COUNT(*))
+        if any(isinstance(e, exp.Star) or (isinstance(e, exp.Column) and isinstance(e.this, exp.Star))
+               for e in select.expressions):
+            analysis.select_star = True
+
+        for window in select.find_all(exp.Window):
+            if window.find_ancestor(exp.Select) is not select:
+                continue  # belongs to a nested scope
+            if not window.args.get("partition_by"):
+                analysis.unpartitioned_windows += 1
+                analysis.bottlenecks.append("Window function without PARTITION BY sorts the whole input on one worker")
+                analysis.suggestions.append("Add PARTITION BY to window functions where the logic allows it")
+                total_cost += running * math.log2(max(running, 2))
+
+        if select.args.get("group") or select.args.get("distinct"):
+            total_cost += running
+
+        if select.args.get("order") and not select.args.get("limit") and scope.is_root:
+            analysis.global_sorts += 1
+            analysis.bottlenecks.append("ORDER BY without LIMIT forces a global sort")
+            total_cost += running * math.log2(max(running, 2))
+
+    if analysis.select_star:
+        analysis.bottlenecks.append("SELECT * reads every column and defeats columnar pruning")
+        analysis.suggestions.append("Select only the columns you need")
+
+    analysis.tables = sorted(set(tables))
+    analysis.estimated_rows_scanned = int(scanned)
+    analysis.estimated_cost = round(total_cost, 2)
+    analysis.complexity = _complexity_label(
+        total_cost,
+        has_cartesian=bool(analysis.cross_joins or analysis.unbounded_joins),
+        has_sort=bool(analysis.global_sorts or analysis.unpartitioned_windows)
+    )
+    # Keep the order stable but drop repeats from multiple scopes
+    analysis.bottlenecks = list(dict.fromkeys(analysis.bottlenecks))
+    analysis.suggestions = list(dict.fromkeys(analysis.suggestions))
+    return analysis
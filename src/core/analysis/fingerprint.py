@@ -0,0 +1,256 @@
+#src/core/analysis/fingerprint.py
+import copy
+import re
+import threading
+from functools import reduce
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from pydantic import BaseModel
+from src.core.cache.disk_cache import DiskCache, content_key
+from src.core.dialects import get_dialect
+from src.core.execution.sandbox import strip_sql_fences
+
+_NAMED_PLACEHOLDER = re.compile(r":p\d+\b")
+
+
+class SQLFingerprint(BaseModel):
+    fingerprint: str
+    canonical_sql: str  # literals as "?", table aliases as t1, t2, ...
+    parameterized_sql: str  # literals as :p0, :p1, ... in canonical order
+    literals: List[Dict[str, Any]]  # {"value": str, "string": bool} per placeholder
+    aliases: Dict[str, str]  # the query's table/CTE alias -> canonical alias
+
+
+def _sort_key(node) -> str:
+    # Placeholders are numbered by position, so they must not influence the order
+    return _NAMED_PLACEHOLDER.sub("?", node.sql())
+
+
+def order_commutative(node):
+    """Sort the operands of AND/OR chains and both sides of (in)equality comparisons"""
+    from sqlglot import exp
+
+    if isinstance(node, (exp.And, exp.Or)):
+        operands = sorted(node.flatten(), key=_sort_key)
+        return reduce(lambda left, right: type(node)(this=left, expression=right), operands)
+    if isinstance(node, (exp.EQ, exp.NEQ, exp.NullSafeEQ)) and _sort_key(node.expression) < _sort_key(node.this):
+        return type(node)(this=node.expression, expression=node.this)
+    return node
+
+
+def _rename_aliases(tree, mapping: Dict[str, str]):
+    """Rename table and CTE aliases, the columns qualified by them and references to the CTEs"""
+    from sqlglot import exp
+
+    if not mapping:
+        return tree
+    cte_names = {cte.alias for cte in tree.find_all(exp.CTE)}
+    for alias in tree.find_all(exp.TableAlias):
+        if alias.name in mapping:
+            alias.set("this", exp.to_identifier(mapping[alias.name]))
+    for column in tree.find_all(exp.Column):
+        if column.table in mapping:
+            column.set("table", exp.to_identifier(mapping[column.table]))
+    for table in tree.find_all(exp.Table):
+        if not table.args.get("db") and table.name in cte_names and table.name in mapping:
+            table.set("this", exp.to_identifier(mapping[table.name]))
+    return tree
+
+
+def _literals(tree) -> list:
+    from sqlglot import exp
+
+    # Precision and scale of types are part of the structure, not parameters
+    return [lit for lit in tree.find_all(exp.Literal) if not lit.find_ancestor(exp.DataType)]
+
+
+def _parse(sql: str, dialect: str):
+    import sqlglot
+    from sqlglot.optimizer.normalize_identifiers import normalize_identifiers
+
+    return normalize_identifiers(sqlglot.parse_one(strip_sql_fences(sql), read=dialect), dialect=dialect)
+
+
+def fingerprint_sql(sql: str, sql_type: str) -> SQLFingerprint:
+    """
+    Fingerprint of a query's structure: identifiers normalized to the dialect's case,
+    table and CTE aliases renamed in order of appearance, literals replaced by
+    placeholders, operands of AND/OR and (in)equalities sorted. Queries that differ only
+    in literals, table aliases, formatting or predicate order share the fingerprint;
+    ``literals`` and ``aliases`` keep what is needed to re-bind results to each of them.
+    Output column aliases are kept, as they name the result's columns.
+    """
+    from sqlglot import exp
+
+    dialect = get_dialect(sql_type).sqlglot_dialect
+    tree = _parse(sql, dialect)
+
+    aliases: Dict[str, str] = {}
+    for alias in tree.find_all(exp.TableAlias):
+        if isinstance(alias.parent, (exp.Table, exp.Subquery, exp.CTE)) and alias.name and alias.name not in aliases:
+            aliases[alias.name] = f"t{len(aliases) + 1}"
+    tree = _rename_aliases(tree, aliases)
+
+    values = {}
+    for i, literal in enumerate(_literals(tree)):
+        values[f"p{i}"] = {"value": literal.this, "string": literal.is_string}
+        literal.replace(exp.Placeholder(this=f"p{i}"))
+    tree = tree.transform(order_commutative)
+
+    # Number the placeholders again in the order they appear in the canonical SQL
+    order: Dict[str, str] = {}
+    for name in _NAMED_PLACEHOLDER.findall(tree.sql(dialect=dialect)):
+        order.setdefault(name[1:], f"p{len(order)}")
+    literals = [values[name] for name in order]
+    parameterized = _NAMED_PLACEHOLDER.sub(lambda m: f":{order[m.group()[1:]]}", tree.sql(dialect=dialect))
+    canonical = _NAMED_PLACEHOLDER.sub("?", parameterized)
+    return SQLFingerprint(
+        fingerprint=content_key(dialect, canonical),
+        canonical_sql=canonical,
+        parameterized_sql=parameterized,
+        literals=literals,
+        aliases=aliases,
+    )
+
+
+def to_template(result_sql: str, fingerprint: SQLFingerprint, sql_type: str) -> Optional[str]:
+    """
+    ``result_sql`` (e.g. an optimized version of the fingerprinted query) with the
+    query's literals and table aliases turned into placeholders and canonical aliases,
+    or None when it cannot be re-bound safely: a literal value that occurs at several
+    positions, a new literal, or a query literal that was dropped or folded away.
+    """
+    from sqlglot import exp
+
+    dialect = get_dialect(sql_type).sqlglot_dialect
+    tree = _rename_aliases(_parse(result_sql, dialect), fingerprint.aliases)
+
+    positions: Dict[tuple, List[int]] = {}
+    for i, literal in enumerate(fingerprint.literals):
+        positions.setdefault((literal["value"], literal["string"]), []).append(i)
+
+    used = set()
+    for literal in _literals(tree):
+        matches = positions.get((literal.this, literal.is_string))
+        if not matches or len(matches) > 1:
+            return None
+        used.add(matches[0])
+        literal.replace(exp.Placeholder(this=f"p{matches[0]}"))
+    if len(used) < len(fingerprint.literals):
+        # A literal was dropped or folded, which may not happen for other values
+        return None
+    return tree.sql(dialect=dialect)
+
+
+def bind_template(template: str, fingerprint: SQLFingerprint, sql_type: str) -> str:
+    """Fill a template from ``to_template`` with another query's literals and aliases"""
+    import sqlglot
+    from sqlglot import exp
+
+    dialect = get_dialect(sql_type).sqlglot_dialect
+    tree = sqlglot.parse_one(template, read=dialect)
+    for placeholder in list(tree.find_all(exp.Placeholder)):
+        literal = fingerprint.literals[int(placeholder.name[1:])]
+        placeholder.replace(exp.Literal(this=literal["value"], is_string=literal["string"]))
+    tree = _rename_aliases(tree, {canonical: alias for alias, canonical in fingerprint.aliases.items()})
+    return tree.sql(dialect=dialect)
+
+
+def _get_path(result: dict, path: str):
+    for part in path.split("."):
+        result = result.get(part) if isinstance(result, dict) else None
+    return result
+
+
+def _set_path(result: dict, path: str, value: Any) -> None:
+    *parents, leaf = path.split(".")
+    for part in parents:
+        result = result[part]
+    result[leaf] = value
+
+
+class FingerprintStore:
+    """
+    Persistent analysis results keyed by SQL fingerprint, so a query that differs from
+    an earlier one only in literals, aliases or formatting reuses its result. SQL inside
+    a result (``sql_fields``) is stored as a template and re-bound to the new query;
+    results that cannot be templated are reused only for the exact same literals.
+    """
+
+    def __init__(self, namespace: str):
+        self.cache = DiskCache(namespace=namespace)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, kind: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(kind, {"reused": 0, "computed": 0})
+            counts[outcome] += 1
+
+    def get_or_compute(self, kind: str, sql: str, sql_type: str, compute: Callable[[], dict],
+                       key_parts: Sequence[Any] = (), sql_fields: Sequence[str] = (),
+                       input_fields: Sequence[str] = (), literal_sensitive: bool = False,
+                       alias_sensitive: bool = False) -> dict:
+        """
+        Args:
+            kind: Result type, part of the key ("optimization", "performance", ...).
+            key_parts: Everything besides the query's structure the result depends on.
+            sql_fields: Dotted paths of SQL-valued fields to template and re-bind.
+            input_fields: Paths that echo the input query; set to ``sql`` on reuse.
+            literal_sensitive: The result depends on literal values (e.g. a correctness verdict).
+            alias_sensitive: The result has free text naming the query's aliases (bottlenecks,
+                explanations), which cannot be re-bound like ``sql_fields``.
+        """
+        try:
+            fingerprint = fingerprint_sql(sql, sql_type)
+        except Exception:
+            # Unparseable SQL has no fingerprint; analyze it as is
+            return compute()
+
+        key = content_key(kind, fingerprint.fingerprint, list(key_parts),
+                          fingerprint.literals if literal_sensitive else None,
+                          fingerprint.aliases if alias_sensitive else None)
+        exact_key = content_key(key, fingerprint.literals, fingerprint.aliases)
+        cached = self.cache.get(key)
+        if cached is not None:
+            result = copy.deepcopy(cached["result"])
+            try:
+                for path, template in cached["templates"].items():
+                    _set_path(result, path, bind_template(template, fingerprint, sql_type))
+            except Exception:
+                # A template that does not bind for this query; analyze it instead
+                result = None
+        else:
+            cached = self.cache.get(exact_key)
+            result = cached["result"] if cached is not None else None
+        if result is not None:
+            for path in input_fields:
+                _set_path(result, path, sql)
+            self._count(kind, "reused")
+            return result
+
+        result = compute()
+        self._count(kind, "computed")
+        if not isinstance(result, dict) or "error" in result:
+            return result
+        templates = {}
+        for path in sql_fields:
+            value = _get_path(result, path)
+            if not value:
+                continue
+            try:
+                template = to_template(value, fingerprint, sql_type)
+            except Exception:
+                template = None
+            if template is None:
+                self.cache.set(exact_key, {"result": result, "templates": {}})
+                return result
+            templates[path] = template
+        self.cache.set(key, {"result": result, "templates": templates})
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {kind: dict(counts) for kind, counts in self._counts.items()}
+
+
+analysis_store = FingerprintStore("sql_analysis")
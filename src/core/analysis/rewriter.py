@@ -0,0 +1,151 @@
+#src/core/analysis/rewriter.py
+from typing import Dict, List, Optional, Tuple
+from src.core.dialects import get_dialect
+
+
+def _is_membership_subquery(select) -> bool:
+    """True for the SELECT of an IN (...) or EXISTS (...) predicate, where row order and duplicates never matter"""
+    from sqlglot import exp
+
+    parent = select.parent
+    if isinstance(parent, exp.Subquery):
+        parent = parent.parent
+    return isinstance(parent, (exp.In, exp.Exists))
+
+
+def _is_nested(select) -> bool:
+    from sqlglot import exp
+
+    return isinstance(select.parent, (exp.Subquery, exp.CTE, exp.Exists, exp.In))
+
+
+def _subquery_to_join(expression, schema):
+    from sqlglot.optimizer.unnest_subqueries import unnest_subqueries
+    return unnest_subqueries(expression)
+
+
+def _pushdown_predicates(expression, schema):
+    from sqlglot.optimizer.pushdown_predicates import pushdown_predicates
+    return pushdown_predicates(expression)
+
+
+def _prune_projections(expression, schema):
+    from sqlglot.optimizer.pushdown_projections import pushdown_projections
+    # Stars were already expanded against the schema during qualification
+    return pushdown_projections(expression)
+
+
+def _remove_redundant_distinct(expression, schema):
+    from sqlglot import exp
+
+    for select in list(expression.find_all(exp.Select)):
+        if not select.args.get("distinct"):
+            continue
+        group = select.args.get("group")
+        projected = {e.unalias().sql() for e in select.expressions}
+        grouped_and_projected = group is not None and {g.sql() for g in group.expressions} <= projected
+        if _is_membership_subquery(select) or grouped_and_projected:
+            select.set("distinct", None)
+    return expression
+
+
+def _remove_redundant_order_by(expression, schema):
+    from sqlglot import exp
+
+    for select in list(expression.find_all(exp.Select)):
+        if not select.args.get("order") or select.args.get("limit") or select.args.get("offset"):
+            continue
+        if _is_nested(select):
+            select.set("order", None)
+    return expression
+
+
+# Applied in order after constant folding; the name of every rule that changes the query
+# ends up in techniques_used.
+REWRITE_RULES = [
+    ("Subquery to join", _subquery_to_join),
+    ("Redundant DISTINCT removal", _remove_redundant_distinct),
+    ("Redundant ORDER BY removal", _remove_redundant_order_by),
+    ("Predicate pushdown", _pushdown_predicates),
+    ("Projection pruning", _prune_projections),
+]
+
+
+def _size(expression) -> int:
+    return sum(1 for _ in expression.walk())
+
+
+def _canonical(expression, dialect: str) -> str:
+    """SQL with commutative operands in a fixed order, so reordering alone is not a change"""
+    from src.core.analysis.fingerprint import order_commutative
+    return expression.copy().transform(order_commutative).sql(dialect=dialect)
+
+
+def _drop_trivial_aliases(expression, original_sql: str):
+    """Remove the "col AS col" / "tbl AS tbl" / "_col_N" noise added by qualification"""
+    from sqlglot import exp
+
+    for alias in list(expression.find_all(exp.Alias)):
+        if isinstance(alias.this, exp.Column) and alias.this.name == alias.alias:
+            alias.replace(alias.this)
+    if isinstance(expression, exp.Select):
+        for projection in list(expression.expressions):
+            if (isinstance(projection, exp.Alias) and projection.alias.startswith("_col_")
+                    and projection.alias not in original_sql):
+                projection.replace(projection.this)
+    for table in expression.find_all(exp.Table):
+        if table.alias and table.alias == table.name:
+            table.set("alias", None)
+    return expression
+
+
+def rewrite_sql(sql: str, sql_type: str,
+                schema: Optional[Dict[str, Dict[str, str]]] = None) -> Tuple[str, List[str]]:
+    """
+    Applies mechanical, semantics-preserving rewrites to a Trino/Spark query.
+
+    Args:
+        sql (str): Query to rewrite.
+        sql_type (str): Dialect of the query; the output uses the same dialect.
+        schema (dict): Optional {table: {column: type}} mapping, enables SELECT * expansion.
+
+    Returns:
+        tuple: (rewritten SQL, names of the rules that fired). The SQL is returned
+        untouched when no rule fired.
+    """
+    import sqlglot
+    from sqlglot.optimizer.qualify import qualify
+    from sqlglot.optimizer.simplify import simplify
+
+    dialect = get_dialect(sql_type).sqlglot_dialect
+    expression = sqlglot.parse_one(sql, read=dialect)
+    expression = qualify(
+        expression,
+        dialect=dialect,
+        schema=schema or None,
+        quote_identifiers=False,
+        identify=False,
+        validate_qualify_columns=False
+    )
+
+    # simplify() also reorders operands and expands BETWEEN, so its output is the baseline
+    # the rules are compared against; as a rewrite of its own it counts only when it folds
+    # something away
+    simplified = simplify(expression.copy())
+    fired: List[str] = ["Constant folding"] if _size(simplified) < _size(expression) else []
+    expression = simplified
+    for name, rule in REWRITE_RULES:
+        before = _canonical(expression, dialect)
+        try:
+            # Rules leave leftovers such as "WHERE TRUE"; simplifying after every rule keeps
+            # those from counting as a rewrite of the next one.
+            candidate = simplify(rule(expression.copy(), schema))
+        except Exception:
+            continue  # a rule that cannot handle this shape simply does not fire
+        if _canonical(candidate, dialect) != before:
+            expression = candidate
+            fired.append(name)
+
+    if not fired:
+        return sql, []
+    return _drop_trivial_aliases(expression, sql).sql(dialect=dialect, pretty=True), fired
@@ -0,0 +1,145 @@
+#src/core/analysis/transpiler.py
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+from src.core.cache.disk_cache import DiskCache, content_key
+from src.core.dialects import get_dialect
+from src.core.execution.sandbox import strip_sql_fences
+from src.core.llm.structured_output import parse_structured, StructuredOutputError
+
+# Dropped without changing the result, so not worth an LLM call
+_BENIGN_UNSUPPORTED = ("Hints are not supported",)
+
+TRANSLATION_PROMPT = """Translate this {source} SQL to {target} SQL.
+A deterministic transpiler produced the draft below but could not map these constructs:
+{issues}
+
+{source} SQL:
+{sql}
+
+Draft {target} SQL:
+{draft}
+
+Keep everything the draft already translated and rewrite only the constructs listed above
+with equivalent {target} features. Return JSON with EXACTLY these fields:
+sql (the complete {target} query), notes (list of strings on semantic differences, may be empty)."""
+
+translation_cache = DiskCache(namespace="translation")
+
+
+class LLMTranslation(BaseModel):
+    sql: str
+    notes: list[str] = []
+
+
+class Translation(BaseModel):
+    sql: str
+    source: str
+    target: str
+    method: str  # "transpiler", or "llm" when unmappable constructs were rewritten by the LLM
+    unsupported: list[str] = []  # constructs the transpiler could not map
+    warnings: list[str] = []
+
+
+def transpile(sql: str, source: str, target: str, pretty: bool = True) -> Tuple[str, List[str], List[str]]:
+    """
+    Deterministic translation with sqlglot.
+
+    Returns:
+        (sql, unsupported, warnings): ``unsupported`` lists constructs the target cannot
+        express as translated: features the generator dropped, and functions neither
+        dialect defines (kept verbatim, so they may not exist in the target).
+
+    Raises:
+        ValueError: Unknown dialect or SQL that does not parse in the source dialect.
+    """
+    import sqlglot
+    from sqlglot import exp
+    from sqlglot.dialects.dialect import Dialect
+    from sqlglot.errors import ErrorLevel
+
+    read = get_dialect(source).sqlglot_dialect
+    write = Dialect.get_or_raise(get_dialect(target).sqlglot_dialect)
+    try:
+        trees = [tree for tree in sqlglot.parse(strip_sql_fences(sql), read=read) if tree is not None]
+    except sqlglot.errors.ParseError as e:
+        raise ValueError(f"Could not parse {source} SQL: {str(e)}")
+
+    statements, unsupported, warnings = [], [], []
+    target_functions = write.parser_class.FUNCTIONS
+    for tree in trees:
+        generator = write.generator(unsupported_level=ErrorLevel.IGNORE, pretty=pretty)
+        statements.append(generator.generate(tree))
+        for message in generator.unsupported_messages:
+            (warnings if message.startswith(_BENIGN_UNSUPPORTED) else unsupported).append(message)
+        for function in tree.find_all(exp.Anonymous):
+            if function.name.upper() not in target_functions:
+                unsupported.append(f"Function {function.name}() is not known in {target}")
+    return ";\n".join(statements), list(dict.fromkeys(unsupported)), list(dict.fromkeys(warnings))
+
+
+def _translate_with_llm(sql: str, source: str, target: str, draft: str, unsupported: List[str], llm) -> Optional[LLMTranslation]:
+    import sqlglot
+
+    model = getattr(getattr(llm, "inner", llm), "model_name", None)
+    key = content_key(sql, source.lower(), target.lower(), unsupported, model)
+    cached = translation_cache.get(key)
+    if cached is not None:
+        return LLMTranslation(**cached)
+    try:
+        response = llm.invoke(TRANSLATION_PROMPT.format(
+            source=source, target=target, sql=sql, draft=draft,
+            issues="\n".join(f"- {issue}" for issue in unsupported)
+        ))
+        translated = parse_structured(response, LLMTranslation, llm=llm, source="translation",
+                                      aliases={"query": "sql", "translated_sql": "sql", target.lower(): "sql"})
+        translated.sql = strip_sql_fences(translated.sql)
+        sqlglot.parse(translated.sql, read=get_dialect(target).sqlglot_dialect)
+    except StructuredOutputError as e:
+        logging.warning(f"LLM translation unusable: {str(e)}")
+        return None
+    except sqlglot.errors.ParseError as e:
+        logging.warning(f"LLM translation does not parse as {target}: {str(e)}")
+        return None
+    except Exception as e:
+        logging.warning(f"LLM translation failed: {str(e)}")
+        return None
+    translation_cache.set(key, translated.dict())
+    return translated
+
+
+def translate_sql(sql: str, source: str, target: str, llm=None, pretty: bool = True) -> dict:
+    """
+    Translates SQL between dialects locally, asking ``llm`` (when given) only to rewrite
+    the constructs the transpiler cannot map. If the LLM is unavailable or its output
+    does not parse in the target dialect, the deterministic draft is returned with the
+    unmapped constructs listed in ``unsupported``.
+
+    Raises:
+        ValueError: Unknown dialect or SQL that does not parse in the source dialect.
+    """
+    draft, unsupported, warnings = transpile(sql, source, target, pretty)
+    translation = Translation(sql=draft, source=source, target=target, method="transpiler",
+                              unsupported=unsupported, warnings=warnings)
+    if unsupported and llm is not None:
+        rewritten = _translate_with_llm(sql, source, target, draft, unsupported, llm)
+        if rewritten is not None:
+            translation.sql, translation.method = rewritten.sql, "llm"
+            translation.warnings.extend(rewritten.notes)
+    return translation.dict()
+
+
+def translate_generation(result: Dict[str, Any], source: str, targets: List[str], llm=None) -> Dict[str, dict]:
+    """
+    Translations of a generation result's query to each of ``targets``, so one
+    generation run serves every dialect. A target that fails gets an ``error`` entry.
+    """
+    translations = {}
+    for target in targets:
+        if target.lower() == source.lower():
+            continue
+        try:
+            translations[target] = translate_sql(result.get("query", ""), source, target, llm)
+        except ValueError as e:
+            translations[target] = {"error": str(e)}
+    return translations
@@ -0,0 +1,88 @@
+#src/core/cache/blob_store.py
+import os
+import threading
+import uuid
+from typing import Dict, Optional
+from config.settings import settings
+from src.core.cache.disk_cache import content_key
+
+
+class BlobStore:
+    """
+    Content-addressed files for large values (extracted document text) that would
+    otherwise sit in every session's state. The key is the SHA-256 of the content, so
+    sessions working on the same document share one copy on disk and hold only the key.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: int = settings.BLOB_STORE_MAX_BYTES):
+        self.root = root or settings.BLOB_STORE_PATH
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def put(self, data: bytes) -> str:
+        key = content_key(data)
+        path = self._path(key)
+        if os.path.exists(path):
+            os.utime(path)  # refresh its place in the eviction order
+            return key
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(partial, "wb") as f:
+            f.write(data)
+        os.replace(partial, path)
+        self.prune()
+        return key
+
+    def put_text(self, text: str) -> str:
+        return self.put(text.encode("utf-8"))
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            return None
+        return data
+
+    def get_text(self, key: str) -> Optional[str]:
+        data = self.get(key)
+        return data.decode("utf-8") if data is not None else None
+
+    def size(self, key: str) -> int:
+        try:
+            return os.path.getsize(self._path(key))
+        except FileNotFoundError:
+            return 0
+
+    def prune(self) -> int:
+        """Delete least recently used blobs until the store fits ``max_bytes``; returns bytes freed"""
+        with self._lock:
+            entries = []
+            for directory, _, files in os.walk(self.root):
+                for name in files:
+                    if not name.endswith(".tmp"):
+                        stat = os.stat(os.path.join(directory, name))
+                        entries.append((stat.st_mtime, stat.st_size, os.path.join(directory, name)))
+            total = sum(size for _, size, _ in entries)
+            freed = 0
+            for _, size, path in sorted(entries):
+                if total - freed <= self.max_bytes:
+                    break
+                os.remove(path)
+                freed += size
+            return freed
+
+    def stats(self) -> Dict[str, int]:
+        blobs = total = 0
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                blobs += 1
+                total += os.path.getsize(os.path.join(directory, name))
+        return {"blobs": blobs, "bytes": total}
+
+
+blob_store = BlobStore()
@@ -0,0 +1,127 @@
+#src/core/cache/disk_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from config.settings import settings
+
+
+def content_key(*parts: Any) -> str:
+    """SHA-256 over the given parts; bytes are hashed as-is, other values by their JSON form"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            data = part
+        elif isinstance(part, str):
+            data = part.encode("utf-8")
+        else:
+            data = json.dumps(part, sort_keys=True, default=str).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Persistent key-value store with JSON values, backed by SQLite so it is shared
+    across Streamlit sessions, reruns and worker processes. ``ttl_seconds`` expires
+    entries by age and ``max_entries`` drops the oldest writes beyond that count.
+    """
+
+    def __init__(self, namespace: str, path: Optional[str] = None,
+                 ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.namespace = namespace
+        self.path = path or settings.CACHE_DB_PATH
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._initialized = False
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            # The table is created on first use so importing the cache costs nothing
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache ("
+                    "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                    "created_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+                )
+                conn.commit()
+                self._initialized = True
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+            if row is not None and self.ttl_seconds is not None and time.time() - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+                conn.commit()
+                row = None
+        finally:
+            conn.close()
+        with self._lock:
+            if row is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), time.time())
+            )
+            if self.max_entries is not None:
+                conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key IN (SELECT key FROM cache WHERE namespace = ? "
+                    "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.namespace, self.namespace, self.max_entries)
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_or_set(self, key: str, compute: Callable[[], Any],
+                   should_cache: Callable[[Any], bool] = lambda value: value is not None) -> Any:
+        """Return the cached value for ``key``, computing and storing it on a miss"""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = compute()
+        if should_cache(value):
+            self.set(key, value)
+        return value
+
+    def delete(self, key: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def clear(self) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self._hits + self._misses
+            return {"hits": self._hits, "misses": self._misses, "hit_rate": self._hits / total if total else 0.0}
@@ -0,0 +1,106 @@
+#src/core/cache/singleflight.py
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace-insensitive form of a question or document used in coalescing keys (not for SQL)"""
+    return " ".join(text.split())
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+        self.events: List[Any] = []
+        self.listeners: List[Callable[[Any], None]] = []
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: the first caller for a key runs the
+    computation, callers arriving while it is in flight wait and get a copy of the
+    same result (or the same exception). Nothing is kept once the call finishes,
+    so this deduplicates only overlapping requests, not repeated ones. Progress the
+    running call ``publish``es reaches every caller's ``listener``, replayed for late joiners.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple[str, Hashable], _Call] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, group: str, outcome: str) -> None:
+        counts = self._counts.setdefault(group, {"executed": 0, "saved": 0})
+        counts[outcome] += 1
+
+    def do(self, group: str, key: Hashable, fn: Callable[[], Any],
+           listener: Optional[Callable[[Any], None]] = None) -> Any:
+        """
+        Run ``fn`` unless an identical call (same group and key) is already running.
+        ``listener`` receives the events published for this call, including earlier ones when joining.
+        """
+        with self._lock:
+            call = self._calls.get((group, key))
+            leader = call is None
+            if leader:
+                call = self._calls[(group, key)] = _Call()
+                self._count(group, "executed")
+            else:
+                call.waiters += 1
+                self._count(group, "saved")
+            if listener is not None:
+                call.listeners.append(listener)
+            missed = list(call.events) if listener is not None else []
+        # Listeners may publish themselves (nested single-flight calls), so they run unlocked
+        for event in missed:
+            listener(event)
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[(group, key)]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        # Each caller gets its own copy, since callers annotate results in place
+        return copy.deepcopy(call.result) if call.waiters else call.result
+
+    def publish(self, group: str, key: Hashable, event: Any) -> None:
+        """Pass ``event`` to the listeners of the running call for this group and key"""
+        with self._lock:
+            call = self._calls.get((group, key))
+            if call is None:
+                return
+            call.events.append(event)
+            listeners = list(call.listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:
+                # One caller's listener must not fail the call all callers share
+                pass
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Executed and saved calls per group, plus how many are running right now"""
+        with self._lock:
+            in_flight: Dict[str, int] = {}
+            for group, _ in self._calls:
+                in_flight[group] = in_flight.get(group, 0) + 1
+            return {
+                group: {**counts, "in_flight": in_flight.get(group, 0)}
+                for group, counts in self._counts.items()
+            }
+
+
+single_flight = SingleFlight()
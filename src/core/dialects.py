@@ -0,0 +1,83 @@
+#src/core/dialects.py
+from dataclasses import dataclass, field
+from typing import Dict, List
+from config.settings import settings
+from config.urls import TRINO_DOC_URLS, SPARK_DOC_URLS
+
+
+@dataclass(frozen=True)
+class Dialect:
+    """Everything the system needs to know about one SQL dialect"""
+    name: str
+    doc_urls: List[str] = field(default_factory=list)
+    raw_docs_file: str = ""
+    index_name: str = ""
+    prompt_rules: str = ""
+    sqlglot_dialect: str = ""  # name understood by sqlglot for parsing/transpiling
+
+
+_DIALECTS: Dict[str, Dialect] = {}
+
+
+def register_dialect(dialect: Dialect) -> Dialect:
+    """Add or replace a dialect in the registry"""
+    _DIALECTS[dialect.name.lower()] = dialect
+    return dialect
+
+
+def get_dialect(name: str) -> Dialect:
+    try:
+        return _DIALECTS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported SQL type: {name}. Available: {', '.join(_DIALECTS)}")
+
+
+def dialect_for_index(index_name: str) -> Dialect:
+    for dialect in _DIALECTS.values():
+        if dialect.index_name == index_name:
+            return dialect
+    raise ValueError(f"No dialect owns index: {index_name}")
+
+
+def available_dialects() -> List[str]:
+    return list(_DIALECTS)
+
+
+def enabled_dialects() -> List[str]:
+    """Dialects this deployment serves, in the order configured by ``settings.ENABLED_DIALECTS``"""
+    return [name for name in settings.ENABLED_DIALECTS if name.lower() in _DIALECTS]
+
+
+register_dialect(Dialect(
+    name="trino",
+    doc_urls=TRINO_DOC_URLS,
+    raw_docs_file="trino_docs.txt",
+    index_name="trino_faiss_index",
+    sqlglot_dialect="trino",
+    prompt_rules="""**DO NOT generate queries using the following: for TRINO only**
+    `CREATE INDEX` (Use **partitioning** instead)  
+    `CREATE MATERIALIZED VIEW` (Use **regular views** instead)  
+    `MERGE INTO` (Use `INSERT INTO ... SELECT` instead)  
+    `UPDATE/DELETE` (Limited support; Use **CTAS or INSERT INTO ... SELECT** instead)  
+    `AUTO_INCREMENT` (Use `UUID()` or `ROW_NUMBER()`)  
+    `BEGIN TRANSACTION` (Use **ETL pipelines** instead)  
+    `CREATE PROCEDURE / TRIGGER` (Use **external orchestration** tools like Airflow)"""
+))
+
+register_dialect(Dialect(
+    name="spark",
+    doc_urls=SPARK_DOC_URLS,
+    raw_docs_file="spark_docs.txt",
+    index_name="spark_faiss_index",
+    sqlglot_dialect="spark",
+    prompt_rules="""## **Supported Features ✅**
+    **Use the following features in queries: for SPARK only**
+    - **Date Functions:** `date_trunc`, `date_add`, `current_date`, `unix_timestamp`
+    - **Filtering:** `WHERE`, `BETWEEN`
+    - **Aggregations:** `GROUP BY`, `HAVING`
+    - **Joins:** `INNER, LEFT, RIGHT, FULL OUTER JOIN`
+    - **CTEs (WITH clause):** Use for complex queries
+    - **Window Functions:** `RANK(), ROW_NUMBER(), LEAD(), LAG()`
+    - **JSON Handling:** `get_json_object(), json_tuple()`
+    - **Bucketing & Partitioning:** `PARTITIONED BY`, `CLUSTERED BY`"""
+))
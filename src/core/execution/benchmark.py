@@ -0,0 +1,210 @@
+#src/core/execution/benchmark.py
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+from config.settings import settings
+from src.core.execution.sandbox import quote_table, strip_sql_fences, to_duckdb
+from src.core.schema_parser import SchemaParser
+
+# Default number of distinct values for generated string columns without statistics
+DEFAULT_STRING_NDV = 100
+
+
+def _column_kind(sql_type: str) -> str:
+    sql_type = sql_type.upper()
+    if any(t in sql_type for t in ("INT", "LONG", "SERIAL")):
+        return "int"
+    if any(t in sql_type for t in ("FLOAT", "DOUBLE", "DECIMAL", "NUMERIC", "REAL")):
+        return "float"
+    if "TIMESTAMP" in sql_type or "DATETIME" in sql_type:
+        return "timestamp"
+    if "DATE" in sql_type:
+        return "date"
+    if "BOOL" in sql_type:
+        return "bool"
+    return "string"
+
+
+def generate_synthetic_tables(tables: Dict[str, Dict[str, str]], scale_factor: float, output_dir: str,
+                              base_rows: int = settings.BENCH_BASE_ROWS,
+                              table_stats: Optional[Dict[str, dict]] = None,
+                              seed: int = 0) -> Dict[str, str]:
+    """
+    Writes one Parquet file per table with vectorized NumPy-generated columns.
+
+    Integer key columns share one value domain so joins between tables produce matches.
+    Column statistics, when given, set row counts and string cardinalities.
+
+    Returns:
+        dict: {table_name: parquet path}
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rng = np.random.default_rng(seed)
+    table_stats = table_stats or {}
+    key_domain = max(int(base_rows * scale_factor), 1)
+    paths: Dict[str, str] = {}
+
+    for table_name, columns in tables.items():
+        stats = table_stats.get(table_name, {})
+        rows = max(int(stats.get("row_count", base_rows) * scale_factor), 1)
+        data = {}
+        for name, col_type in columns.items():
+            col_stats = stats.get("columns", {}).get(name, {})
+            kind = _column_kind(col_type)
+            if kind == "int":
+                if name.lower() == "id":
+                    data[name] = np.arange(rows, dtype=np.int64)
+                else:
+                    data[name] = rng.integers(0, key_domain, size=rows, dtype=np.int64)
+            elif kind == "float":
+                data[name] = rng.random(rows) * 1000
+            elif kind == "timestamp":
+                seconds = rng.integers(0, 365 * 86400, size=rows)
+                data[name] = np.datetime64("2024-01-01T00:00:00") + seconds.astype("timedelta64[s]")
+            elif kind == "date":
+                days = rng.integers(0, 365, size=rows)
+                data[name] = np.datetime64("2024-01-01") + days.astype("timedelta64[D]")
+            elif kind == "bool":
+                data[name] = rng.random(rows) < 0.5
+            else:
+                ndv = max(int(col_stats.get("ndv", DEFAULT_STRING_NDV)), 1)
+                vocabulary = np.array([f"{name}_{i}" for i in range(min(ndv, rows))])
+                data[name] = vocabulary[rng.integers(0, len(vocabulary), size=rows)]
+
+        path = os.path.join(output_dir, f"{table_name.replace('.', '__')}.parquet")
+        pq.write_table(pa.table(data), path)
+        paths[table_name] = path
+    return paths
+
+
+def _result_digest(rows: List[tuple]) -> str:
+    """Order-insensitive digest of a result set, tolerant to float rounding"""
+    normalized = sorted(
+        repr(tuple(round(v, 6) if isinstance(v, float) else v for v in row)) for row in rows
+    )
+    return hashlib.sha256("\n".join(normalized).encode()).hexdigest()
+
+
+def _run_query(label: str, sql: str, paths: Dict[str, str], repeat: int, threads: int,
+               timeout_seconds: float) -> Dict[str, Any]:
+    """Worker: run one query against the Parquet tables and measure latency and peak memory"""
+    import json
+    import duckdb
+
+    conn = duckdb.connect(database=":memory:")
+    conn.execute(f"SET threads={threads}")
+    for table_name, path in paths.items():
+        parts = table_name.split(".")
+        for i in range(1, len(parts)):
+            conn.execute(f'CREATE SCHEMA IF NOT EXISTS {quote_table(".".join(parts[:i]))}')
+        conn.execute(f"CREATE VIEW {quote_table(table_name)} AS SELECT * FROM read_parquet('{path}')")
+
+    timed_out = threading.Event()
+
+    def interrupt():
+        timed_out.set()
+        conn.interrupt()
+
+    def execute() -> List[tuple]:
+        # Same guard as the sandbox: a runaway alternative (e.g. a cross join) is interrupted
+        timer = threading.Timer(timeout_seconds, interrupt)
+        timer.start()
+        try:
+            return conn.execute(sql).fetchall()
+        finally:
+            timer.cancel()
+
+    timings = []
+    rows: List[tuple] = []
+    profile_path = os.path.join(os.path.dirname(next(iter(paths.values()))), f"profile_{os.getpid()}.json")
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = execute()
+            timings.append((time.perf_counter() - start) * 1000)
+        # One extra profiled run for the engine's peak buffer memory; kept out of the timings
+        conn.execute("SET enable_profiling='json'")
+        conn.execute(f"SET profiling_output='{profile_path}'")
+        execute()
+        with open(profile_path) as f:
+            peak_bytes = json.load(f).get("system_peak_buffer_memory", 0)
+    except Exception as e:
+        if timed_out.is_set():
+            return {"label": label, "error": f"Timed out after {timeout_seconds:g}s"}
+        return {"label": label, "error": str(e)}
+    finally:
+        conn.close()
+
+    return {
+        "label": label,
+        "latency_ms": round(min(timings), 3),
+        "peak_memory_mb": round(peak_bytes / 2 ** 20, 1),
+        "rows": len(rows),
+        "digest": _result_digest(rows),
+    }
+
+
+def rank_alternatives(generation: dict, schema: Union[dict, list, str], sql_type: str,
+                      scale_factor: float = 1.0,
+                      table_stats: Optional[Dict[str, dict]] = None,
+                      repeat: int = settings.BENCH_REPEAT,
+                      timeout_seconds: float = settings.BENCH_TIMEOUT_SECONDS) -> List[Dict[str, Any]]:
+    """
+    Runs the generated query and every alternative on synthetic data and ranks them.
+
+    Queries run one at a time, each in a fresh process with every core, so they do not
+    compete for CPU and skew the timings they are ranked by.
+
+    Args:
+        generation (dict): GenerationResult fields ("query" and "alternatives").
+        schema: Parsed schema in any shape SchemaParser.to_table_columns accepts.
+        sql_type (str): Dialect of the generated SQL.
+        scale_factor (float): Multiplier on the base (or statistics) row counts.
+        table_stats (dict): Optional per-table statistics from src.core.table_stats.
+        repeat (int): Runs per query; the fastest run is reported.
+        timeout_seconds (float): Limit per run; a query that exceeds it is reported as an error.
+
+    Returns:
+        list: One entry per query: results matching the main query first, fastest first,
+        then results that differ, then failures. Each entry reports latency_ms,
+        peak_memory_mb, rows and whether its result matches the main query.
+    """
+    candidates = [("Generated query", generation.get("query", ""))] + [
+        (f"Alternative {i + 1}", alt) for i, alt in enumerate(generation.get("alternatives", []))
+    ]
+    tables = SchemaParser.to_table_columns(schema)
+    if not tables:
+        raise ValueError("Schema has no tables to generate data for")
+
+    prepared, results = [], []
+    for label, sql in candidates:
+        sql = strip_sql_fences(sql)
+        try:
+            prepared.append((label, sql, to_duckdb(sql, sql_type)))
+        except Exception as e:
+            results.append({"label": label, "sql": sql, "error": f"Transpile failed: {str(e)}"})
+
+    threads = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory(prefix="sql_bench_") as data_dir:
+        paths = generate_synthetic_tables(tables, scale_factor, data_dir, table_stats=table_stats)
+        # Fresh process per query so no query runs against another one's warm caches
+        with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+            for label, sql, duck_sql in prepared:
+                run = pool.submit(_run_query, label, duck_sql, paths, repeat, threads, timeout_seconds)
+                results.append({**run.result(), "sql": sql})
+
+    main_digest = next((r.get("digest") for r in results if r["label"] == "Generated query"), None)
+    for result in results:
+        if "digest" in result:
+            result["matches_main"] = main_digest is not None and result.pop("digest") == main_digest
+
+    # A faster query that returns different rows is not a better version of this one
+    return sorted(results, key=lambda r: ("error" in r, not r.get("matches_main", False),
+                                          r.get("latency_ms", float("inf")), r.get("peak_memory_mb", 0)))
@@ -0,0 +1,193 @@
+#src/core/execution/sandbox.py
+import re
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Union
+from pydantic import BaseModel
+from config.settings import settings
+from src.core.dialects import get_dialect
+from src.core.schema_parser import SchemaParser
+
+
+class SandboxResult(BaseModel):
+    sql: str
+    translated_sql: str = ""
+    valid: bool
+    stage: str  # "transpile", "explain", "execute" or "ok"
+    error: Optional[str] = None
+    explain_ms: float = 0.0
+    execution_ms: float = 0.0
+    rows_returned: int = 0
+
+
+def strip_sql_fences(text: str) -> str:
+    """Return the SQL inside a markdown code fence, or the text itself when unfenced"""
+    match = re.search(r"```(?:sql)?\s*(.*?)```", text, flags=re.IGNORECASE | re.DOTALL)
+    return (match.group(1) if match else text).strip().rstrip(";").strip()
+
+
+def to_duckdb(sql: str, sql_type: str) -> str:
+    """Transpile a single Trino/Spark statement to DuckDB SQL"""
+    import sqlglot
+
+    statements = sqlglot.transpile(sql, read=get_dialect(sql_type).sqlglot_dialect, write="duckdb")
+    if len(statements) != 1:
+        raise ValueError(f"Expected exactly one statement, got {len(statements)}")
+    return statements[0]
+
+
+def quote_table(table_name: str) -> str:
+    """DuckDB reference to a possibly schema-qualified table, every part quoted (tables named "order" etc.)"""
+    from sqlglot import exp
+
+    return ".".join(exp.to_identifier(part, quoted=True).sql("duckdb") for part in table_name.split("."))
+
+
+class SQLSandbox:
+    """Embedded DuckDB engine that dry-runs Trino/Spark SQL against tables built from a parsed schema"""
+
+    def __init__(self, schema: Union[dict, list, str], sql_type: str,
+                 sample_data: Optional[Dict[str, Any]] = None,
+                 row_limit: int = settings.SANDBOX_ROW_LIMIT,
+                 timeout_seconds: float = settings.SANDBOX_TIMEOUT_SECONDS):
+        import duckdb
+
+        self.sql_type = sql_type
+        self.source_dialect = get_dialect(sql_type).sqlglot_dialect
+        self.row_limit = row_limit
+        self.timeout_seconds = timeout_seconds
+        self.tables = SchemaParser.to_table_columns(schema)
+        self.conn = duckdb.connect(database=":memory:")
+        self._build_tables(sample_data or {})
+
+    def _duckdb_type(self, sql_type: str) -> str:
+        from sqlglot import exp
+
+        try:
+            return exp.DataType.build(sql_type, dialect=self.source_dialect).sql("duckdb")
+        except Exception:
+            return "VARCHAR"
+
+    def _build_tables(self, sample_data: Dict[str, Any]) -> None:
+        """Create an empty table per schema table, filled from ``sample_data`` DataFrames when given"""
+        for table_name, columns in self.tables.items():
+            parts = table_name.split(".")
+            for i in range(1, len(parts)):
+                self.conn.execute(f'CREATE SCHEMA IF NOT EXISTS {quote_table(".".join(parts[:i]))}')
+            column_defs = ", ".join(f'"{name}" {self._duckdb_type(col_type)}' for name, col_type in columns.items())
+            self.conn.execute(f"CREATE TABLE {quote_table(table_name)} ({column_defs})")
+
+            sample = sample_data.get(table_name)
+            if sample is not None:
+                self.conn.register("_sandbox_sample", sample)
+                shared = [f'"{c}"' for c in sample.columns if c in columns]
+                if shared:
+                    self.conn.execute(
+                        f"INSERT INTO {quote_table(table_name)} ({', '.join(shared)}) "
+                        f"SELECT {', '.join(shared)} FROM _sandbox_sample LIMIT {self.row_limit}"
+                    )
+                self.conn.unregister("_sandbox_sample")
+
+    def translate(self, sql: str) -> str:
+        return to_duckdb(sql, self.sql_type)
+
+    def _timed(self, sql: str):
+        """Run ``sql`` with an interrupt after ``timeout_seconds``; returns (rows, elapsed ms)"""
+        timer = threading.Timer(self.timeout_seconds, self.conn.interrupt)
+        start = time.perf_counter()
+        timer.start()
+        try:
+            rows = self.conn.execute(sql).fetchall()
+        finally:
+            timer.cancel()
+        return rows, (time.perf_counter() - start) * 1000
+
+    def dry_run(self, sql: str) -> SandboxResult:
+        """EXPLAIN then execute ``sql`` with a row limit, reporting the first failing stage"""
+        sql = strip_sql_fences(sql)
+        try:
+            translated = self.translate(sql)
+        except Exception as e:
+            return SandboxResult(sql=sql, valid=False, stage="transpile", error=str(e))
+
+        result = SandboxResult(sql=sql, translated_sql=translated, valid=False, stage="explain")
+        try:
+            _, result.explain_ms = self._timed(f"EXPLAIN {translated}")
+        except Exception as e:
+            result.error = str(e)
+            return result
+
+        result.stage = "execute"
+        try:
+            rows, result.execution_ms = self._timed(f"SELECT * FROM ({translated}) AS _sandbox LIMIT {self.row_limit}")
+        except Exception as e:
+            # Statements that cannot be wrapped (DDL/DML) were already validated by EXPLAIN.
+            if "syntax error" in str(e).lower():
+                try:
+                    rows, result.execution_ms = self._timed(translated)
+                except Exception as inner:
+                    result.error = str(inner)
+                    return result
+            else:
+                result.error = str(e)
+                return result
+
+        result.rows_returned = len(rows)
+        result.valid = True
+        result.stage = "ok"
+        return result
+
+    def dry_run_generation(self, generation: dict) -> Dict[str, Any]:
+        """Dry-run the main query and every alternative of a GenerationResult dict"""
+        return {
+            "query": self.dry_run(generation.get("query", "")).dict(),
+            "alternatives": [self.dry_run(alt).dict() for alt in generation.get("alternatives", [])],
+        }
+
+    def fetch(self, sql: str) -> List[tuple]:
+        """Every row ``sql`` returns on the sandbox tables"""
+        rows, _ = self._timed(self.translate(strip_sql_fences(sql)))
+        return rows
+
+    def compare(self, gold_sql: str, sql: str) -> Dict[str, Any]:
+        """
+        Whether ``sql`` returns the same rows as ``gold_sql``: as a sequence when the
+        gold query orders its output, as a multiset otherwise. Column names are ignored.
+        ``match`` is None when the gold query itself fails.
+        """
+        try:
+            gold_rows = self.fetch(gold_sql)
+        except Exception as e:
+            return {"match": None, "error": f"gold: {str(e)}"}
+        try:
+            rows = self.fetch(sql)
+        except Exception as e:
+            return {"match": False, "error": str(e), "gold_rows": len(gold_rows)}
+
+        gold_rows, rows = [_comparable(row) for row in gold_rows], [_comparable(row) for row in rows]
+        if not _is_ordered(gold_sql, self.source_dialect):
+            gold_rows, rows = sorted(gold_rows, key=repr), sorted(rows, key=repr)
+        return {"match": gold_rows == rows, "error": None, "gold_rows": len(gold_rows), "rows": len(rows)}
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _comparable(row: tuple) -> tuple:
+    # DuckDB returns Decimal for SUM over decimals and float for AVG; compare numbers by value
+    values = []
+    for value in row:
+        if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+            value = round(float(value), 6)
+        values.append(value)
+    return tuple(values)
+
+
+def _is_ordered(sql: str, dialect: str) -> bool:
+    import sqlglot
+
+    try:
+        return bool(sqlglot.parse_one(strip_sql_fences(sql), read=dialect).args.get("order"))
+    except Exception:
+        return False
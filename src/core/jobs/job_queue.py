@@ -0,0 +1,248 @@
+#src/core/jobs/job_queue.py
+import json
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config.settings import settings
+
+
+@dataclass
+class StageContext:
+    """What a stage gets to work with; everything it writes under ``work_dir`` survives a crash"""
+    job_id: str
+    payload: Dict[str, Any]
+    outputs: Dict[str, Any]  # merged outputs of the stages completed so far
+    work_dir: str
+    report: Callable[[float, str], None]  # (fraction of this stage done, message)
+
+
+Stage = Tuple[str, Callable[[StageContext], Optional[Dict[str, Any]]]]
+
+_PIPELINES: Dict[str, List[Stage]] = {}
+
+
+def register_pipeline(kind: str, stages: List[Stage]) -> None:
+    """Declare the ordered stages run for jobs of ``kind``"""
+    _PIPELINES[kind] = stages
+
+
+def get_pipeline(kind: str) -> List[Stage]:
+    try:
+        return _PIPELINES[kind]
+    except KeyError:
+        raise ValueError(f"Unknown job kind: {kind}. Available: {', '.join(_PIPELINES)}")
+
+
+class JobQueue:
+    """
+    Persistent job queue in SQLite, shared by the UI and worker processes.
+
+    A job runs its pipeline's stages in order and records each completed stage and
+    its outputs. Workers hold a lease renewed by heartbeats; a job whose lease has
+    expired (worker crashed or was killed) is claimed again and resumes at the first
+    stage that has not completed.
+    """
+
+    def __init__(self, path: Optional[str] = None, work_dir: Optional[str] = None,
+                 lease_seconds: float = settings.JOB_LEASE_SECONDS,
+                 max_attempts: int = settings.JOB_MAX_ATTEMPTS):
+        self.path = path or settings.JOB_DB_PATH
+        self.work_root = work_dir or settings.JOB_WORK_DIR
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, payload TEXT NOT NULL, "
+                "stages TEXT NOT NULL, outputs TEXT NOT NULL, message TEXT, error TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, heartbeat_at REAL, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS workers (id TEXT PRIMARY KEY, pid INTEGER, heartbeat_at REAL NOT NULL)"
+            )
+            self._initialized = True
+        return conn
+
+    def work_dir(self, job_id: str) -> str:
+        path = os.path.join(self.work_root, job_id)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def submit(self, kind: str, payload: Dict[str, Any], files: Optional[Dict[str, bytes]] = None) -> str:
+        """Queue a job; ``files`` are written to its work directory before any worker can see it"""
+        stages = {name: {"status": "pending", "progress": 0.0} for name, _ in get_pipeline(kind)}
+        job_id = uuid.uuid4().hex
+        work_dir = self.work_dir(job_id)
+        for name, data in (files or {}).items():
+            with open(os.path.join(work_dir, name), "wb") as f:
+                f.write(data)
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, stages, outputs, created_at, updated_at) "
+                "VALUES (?, ?, 'queued', ?, ?, '{}', ?, ?)",
+                (job_id, kind, json.dumps(payload), json.dumps(stages), now, now)
+            )
+        finally:
+            conn.close()
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Take the oldest queued job, or one whose worker stopped heartbeating"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            while True:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT id, attempts FROM jobs WHERE status = 'queued' "
+                    "OR (status = 'running' AND heartbeat_at < ?) ORDER BY created_at LIMIT 1",
+                    (now - self.lease_seconds,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                job_id, attempts = row
+                if attempts >= self.max_attempts:
+                    # Crashed the worker too often; stop retrying it
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+                        (f"Abandoned after {attempts} attempts", now, job_id)
+                    )
+                    conn.execute("COMMIT")
+                    continue
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, heartbeat_at = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (worker_id, now, now, job_id)
+                )
+                conn.execute("COMMIT")
+                return self.get(job_id)
+        finally:
+            conn.close()
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        conn = self._connect()
+        try:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+        finally:
+            conn.close()
+
+    def heartbeat(self, job_id: str) -> None:
+        self._update(job_id, heartbeat_at=time.time())
+
+    def set_stage(self, job_id: str, stage: str, status: str, progress: float,
+                  message: Optional[str] = None, outputs: Optional[Dict[str, Any]] = None,
+                  seconds: Optional[float] = None) -> None:
+        """Record a stage's progress; ``outputs`` are merged into the job's outputs"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            stages_json, outputs_json = conn.execute(
+                "SELECT stages, outputs FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            stages = json.loads(stages_json)
+            stages[stage].update(status=status, progress=round(progress, 4))
+            if seconds is not None:
+                stages[stage]["seconds"] = round(seconds, 2)
+            merged = {**json.loads(outputs_json), **(outputs or {})}
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET stages = ?, outputs = ?, message = COALESCE(?, message), "
+                "heartbeat_at = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(stages), json.dumps(merged), message, now, now, job_id)
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def finish(self, job_id: str) -> None:
+        self._update(job_id, status="done", message="Done")
+
+    def fail(self, job_id: str, error: str) -> None:
+        job = self.get(job_id)
+        stages = {
+            name: {**state, "status": "failed"} if state["status"] == "running" else state
+            for name, state in job["stages"].items()
+        }
+        self._update(job_id, status="failed", error=error, stages=json.dumps(stages))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT id, kind, status, payload, stages, outputs, message, error, attempts, "
+                "created_at, updated_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        stages = json.loads(row[4])
+        return {
+            "id": row[0], "kind": row[1], "status": row[2], "payload": json.loads(row[3]),
+            "stages": stages, "outputs": json.loads(row[5]), "message": row[6], "error": row[7],
+            "attempts": row[8], "created_at": row[9], "updated_at": row[10],
+            "progress": sum(s["progress"] for s in stages.values()) / len(stages) if stages else 0.0,
+        }
+
+    def list(self, limit: int = 20) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            ids = [r[0] for r in conn.execute("SELECT id FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))]
+        finally:
+            conn.close()
+        return [self.get(job_id) for job_id in ids]
+
+    def remove(self, job_id: str) -> None:
+        """Delete a job and its work directory (not the artifacts it published elsewhere)"""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        finally:
+            conn.close()
+        shutil.rmtree(os.path.join(self.work_root, job_id), ignore_errors=True)
+
+    def worker_heartbeat(self, worker_id: str, pid: Optional[int] = None) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO workers (id, pid, heartbeat_at) VALUES (?, ?, ?)",
+                (worker_id, pid or os.getpid(), time.time())
+            )
+        finally:
+            conn.close()
+
+    def worker_exit(self, worker_id: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM workers WHERE id = ?", (worker_id,))
+        finally:
+            conn.close()
+
+    def live_workers(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT COUNT(*) FROM workers WHERE heartbeat_at >= ?", (time.time() - self.lease_seconds,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+
+job_queue = JobQueue()
@@ -0,0 +1,124 @@
+#src/core/jobs/pdf_ingestion.py
+"""PDF ingestion as a resumable pipeline: extract -> chunk -> embed -> index -> schema"""
+import json
+import os
+from typing import Any, Dict
+from config.settings import settings
+from src.core.cache.blob_store import blob_store
+from src.core.jobs.job_queue import StageContext, job_queue, register_pipeline
+
+KIND = "pdf_ingestion"
+INPUT_FILE = "input.pdf"
+# PDFtoSchemaAgent's default; also used for jobs queued before the payload carried a limit
+DEFAULT_TOKEN_LIMIT = 8192
+
+
+def _report_every(total: int, updates: int = 50) -> int:
+    # Bounds progress writes to about ``updates`` per stage
+    return max(total // updates, 1)
+
+
+def extract(ctx: StageContext) -> Dict[str, Any]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(os.path.join(ctx.work_dir, INPUT_FILE))
+    pages = []
+    step = _report_every(len(reader.pages))
+    for number, page in enumerate(reader.pages, start=1):
+        pages.append(page.extract_text() or "")
+        if number % step == 0:
+            ctx.report(number / len(reader.pages), f"page {number}/{len(reader.pages)}")
+    text = "\n".join(filter(None, pages))
+    if not text.strip():
+        raise ValueError("Could not extract text from the PDF.")
+    with open(os.path.join(ctx.work_dir, "text.txt"), "w", encoding="utf-8") as f:
+        f.write(text)
+    # Sessions viewing the document read it from the shared blob store by key
+    return {"pages": len(reader.pages), "characters": len(text), "text_key": blob_store.put_text(text)}
+
+
+def read_text(work_dir: str) -> str:
+    with open(os.path.join(work_dir, "text.txt"), encoding="utf-8") as f:
+        return f.read()
+
+
+def chunk(ctx: StageContext) -> Dict[str, Any]:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200, length_function=len)
+    chunks = splitter.split_text(read_text(ctx.work_dir))
+    with open(os.path.join(ctx.work_dir, "chunks.json"), "w", encoding="utf-8") as f:
+        json.dump(chunks, f)
+    return {"chunks": len(chunks)}
+
+
+def _chunks(work_dir: str) -> list:
+    with open(os.path.join(work_dir, "chunks.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def embed(ctx: StageContext) -> Dict[str, Any]:
+    import numpy as np
+    from src.core.rag.embeddings import get_embeddings
+
+    chunks = _chunks(ctx.work_dir)
+    embeddings = get_embeddings()
+    batch_size = settings.JOB_EMBED_BATCH_SIZE
+    vectors = []
+    for start in range(0, len(chunks), batch_size):
+        vectors.extend(embeddings.embed_documents(chunks[start:start + batch_size]))
+        done = min(start + batch_size, len(chunks))
+        ctx.report(done / len(chunks), f"{done}/{len(chunks)} chunks")
+    np.save(os.path.join(ctx.work_dir, "vectors.npy"), np.asarray(vectors, dtype=np.float32))
+    return {}
+
+
+def index(ctx: StageContext) -> Dict[str, Any]:
+    import numpy as np
+    from langchain_community.vectorstores import FAISS
+    from src.core.rag.embeddings import get_embeddings
+
+    vectors = np.load(os.path.join(ctx.work_dir, "vectors.npy"))
+    store = FAISS.from_embeddings(list(zip(_chunks(ctx.work_dir), vectors.tolist())), get_embeddings())
+    # The job id doubles as the vector store id, so a resumed job overwrites its own partial output
+    store.save_local(os.path.join(settings.PDF_VECTOR_STORE_DIR, ctx.job_id))
+    return {"vector_store_id": ctx.job_id}
+
+
+def schema(ctx: StageContext) -> Dict[str, Any]:
+    from src.agents.pdfSchema_agent import PDFtoSchemaAgent
+    from src.core.cache.disk_cache import content_key
+    from src.core.schema_parser import schema_cache
+
+    text = read_text(ctx.work_dir)
+    token_limit = ctx.payload.get("token_limit", DEFAULT_TOKEN_LIMIT)
+    ctx.report(0.1, "generating schema")
+    # Re-processing the same document reuses the stored schema instead of another LLM call
+    generated = schema_cache.get_or_set(
+        content_key("pdf_schema", token_limit, text),
+        lambda: PDFtoSchemaAgent().generate_optimized_schema(text, max_tokens=token_limit)
+    )
+    if not generated:
+        raise ValueError("Failed to generate schema.")
+    return {"schema": generated}
+
+
+register_pipeline(KIND, [
+    ("extract", extract),
+    ("chunk", chunk),
+    ("embed", embed),
+    ("index", index),
+    ("schema", schema),
+])
+
+
+def submit_pdf(name: str, data: bytes, token_limit: int = DEFAULT_TOKEN_LIMIT) -> str:
+    """
+    Queue a PDF for ingestion and make sure a worker is running; returns the job id.
+    ``token_limit`` caps the schema generation response.
+    """
+    from src.core.jobs.worker import ensure_workers
+
+    job_id = job_queue.submit(KIND, {"pdf_name": name, "token_limit": token_limit}, files={INPUT_FILE: data})
+    ensure_workers()
+    return job_id
@@ -0,0 +1,143 @@
+#src/core/jobs/worker.py
+"""
+Worker process for the job queue.
+
+    python -m src.core.jobs.worker --workers 2
+
+The Streamlit app starts workers on demand (see ``ensure_workers``); running them
+separately is only needed to keep them warm or to scale out. Workers serve jobs from
+every session, so they call the LLM with the server's own GROQ_API_KEY, never with a
+key entered in a session.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import uuid
+from typing import Any, Dict, Optional
+from config.settings import settings
+from src.core.jobs.job_queue import JobQueue, StageContext, get_pipeline, job_queue
+
+
+def _load_pipelines() -> None:
+    # Pipelines register themselves on import
+    import src.core.jobs.pdf_ingestion  # noqa: F401
+
+
+def run_job(queue: JobQueue, job: Dict[str, Any]) -> None:
+    """Run the stages of ``job`` that have not completed yet, in order"""
+    job_id = job["id"]
+    outputs = dict(job["outputs"])
+    work_dir = queue.work_dir(job_id)
+    try:
+        for name, stage in get_pipeline(job["kind"]):
+            if job["stages"][name]["status"] == "done":
+                continue
+            queue.set_stage(job_id, name, "running", 0.0, message=f"{name}: starting")
+
+            def report(progress: float, message: str, _name=name) -> None:
+                queue.set_stage(job_id, _name, "running", min(progress, 1.0), message=f"{_name}: {message}")
+
+            start = time.perf_counter()
+            produced = stage(StageContext(job_id, job["payload"], outputs, work_dir, report)) or {}
+            outputs.update(produced)
+            queue.set_stage(job_id, name, "done", 1.0, message=f"{name}: done", outputs=produced,
+                            seconds=time.perf_counter() - start)
+        queue.finish(job_id)
+    except Exception as e:
+        logging.error(f"Job {job_id} failed: {traceback.format_exc()}")
+        queue.fail(job_id, f"{type(e).__name__}: {str(e)}")
+
+
+def _new_worker_id() -> str:
+    return f"{os.uname().nodename}-{uuid.uuid4().hex[:12]}"
+
+
+def run_worker(queue: JobQueue = job_queue, poll_seconds: float = settings.JOB_POLL_SECONDS,
+               idle_exit_seconds: float = settings.JOB_WORKER_IDLE_SECONDS,
+               worker_id: Optional[str] = None) -> None:
+    """Claim and run jobs until idle for ``idle_exit_seconds`` (0 runs forever)"""
+    _load_pipelines()
+    worker_id = worker_id or _new_worker_id()
+    current: Dict[str, Optional[str]] = {"job": None}
+    stop = threading.Event()
+
+    def heartbeat():
+        # Renews the lease while a stage runs for longer than it reports progress
+        while not stop.wait(queue.lease_seconds / 3):
+            queue.worker_heartbeat(worker_id)
+            if current["job"]:
+                queue.heartbeat(current["job"])
+
+    queue.worker_heartbeat(worker_id)
+    threading.Thread(target=heartbeat, daemon=True).start()
+    idle_since = time.monotonic()
+    try:
+        while True:
+            job = queue.claim(worker_id)
+            if job is None:
+                if idle_exit_seconds and time.monotonic() - idle_since > idle_exit_seconds:
+                    return
+                time.sleep(poll_seconds)
+                continue
+            logging.info(f"Worker {worker_id} running job {job['id']} (attempt {job['attempts']})")
+            current["job"] = job["id"]
+            run_job(queue, job)
+            current["job"] = None
+            idle_since = time.monotonic()
+    finally:
+        stop.set()
+        queue.worker_exit(worker_id)
+
+
+_spawn_lock = threading.Lock()
+
+
+def ensure_workers(count: int = settings.JOB_WORKERS, queue: JobQueue = job_queue) -> int:
+    """
+    Start detached worker processes until ``count`` are alive; returns how many were started.
+    Started workers inherit the server's environment, API key included. Each is recorded
+    as live before it starts, so submits made while it imports do not start more.
+    """
+    with _spawn_lock:
+        missing = max(count - queue.live_workers(), 0)
+        for _ in range(missing):
+            worker_id = _new_worker_id()
+            process = subprocess.Popen(
+                [sys.executable, "-m", "src.core.jobs.worker", "--worker-id", worker_id],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+            )
+            # Expires after one lease if the worker dies before its first heartbeat
+            queue.worker_heartbeat(worker_id, pid=process.pid)
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run job queue workers")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--idle-exit", type=float, default=settings.JOB_WORKER_IDLE_SECONDS,
+                        help="Exit after this many idle seconds (0 = never)")
+    parser.add_argument("--worker-id", help="Id to register under (set by ensure_workers)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.workers == 1:
+        run_worker(idle_exit_seconds=args.idle_exit, worker_id=args.worker_id)
+        return
+    processes = [
+        multiprocessing.Process(target=run_worker, kwargs={"idle_exit_seconds": args.idle_exit})
+        for _ in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
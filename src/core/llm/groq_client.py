@@ -1,14 +1,23 @@
-from langchain_groq import ChatGroq
-from config.settings import settings
-
-class GroqClient:
-    """Client for Groq Cloud API with tool support"""
-    
-    def __init__(self, model_name: str = "qwen-2.5-coder-32b"):
-        self.llm = ChatGroq(
-            temperature=0.1,
-            model_name=model_name,
-            groq_api_key=settings.GROQ_API_KEY,
-            max_tokens=4000,
-            
-        )
\ No newline at end of file
+from typing import Optional
+from config.settings import settings
+
+class GroqClient:
+    """Client for Groq Cloud API with tool support"""
+    
+    def __init__(self, model_name: Optional[str] = None):
+        from langchain_groq import ChatGroq
+        from src.core.llm.resilience import policy_for
+        from src.core.llm.resilient_chat import ResilientChatModel
+
+        model_name = model_name or settings.DEFAULT_LLM_MODEL
+        chat = ChatGroq(
+            temperature=0.1,
+            model_name=model_name,
+            groq_api_key=settings.GROQ_API_KEY,
+            groq_api_base=settings.GROQ_API_BASE,
+            max_tokens=4000,
+            request_timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS,
+            # Retries, hedging and circuit breaking are handled by the resilience policy
+            max_retries=0,
+        )
+        self.llm = ResilientChatModel(inner=chat, policy=policy_for(model_name))
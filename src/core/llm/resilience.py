@@ -0,0 +1,284 @@
+#src/core/llm/resilience.py
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from config.settings import settings
+
+# HTTP statuses worth retrying: rate limiting, overload and gateway errors
+TRANSIENT_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while the circuit breaker is open"""
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_transient(exc: BaseException) -> bool:
+    """True for errors a retry can fix: 429/5xx responses, timeouts and dropped connections"""
+    status = _status_code(exc)
+    if status is not None:
+        return status in TRANSIENT_STATUS_CODES
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    name = type(exc).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Delay requested by the provider through a Retry-After header (seconds or HTTP date)"""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or getattr(exc, "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies"""
+
+    def __init__(self, window: int = 500):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive transient failures and fails fast
+    for ``reset_seconds``; then lets one trial call through (half-open) to decide
+    whether to close again.
+    """
+
+    def __init__(self, failure_threshold: int = settings.LLM_BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = settings.LLM_BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        with self._lock:
+            state = self._state()
+            if state == "open" or (state == "half_open" and self._trial_in_flight):
+                raise CircuitOpenError("LLM provider circuit is open; failing fast")
+            if state == "half_open":
+                self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+def hedge_workers() -> int:
+    """
+    Threads for hedged calls: a primary and a hedge for every call that can be in flight,
+    i.e. the API's generation and optimizer agent pools, or the evaluation runner.
+    Too few and primaries queue for a thread, which delays them and provokes hedges.
+    """
+    if settings.LLM_HEDGE_MAX_WORKERS > 0:
+        return settings.LLM_HEDGE_MAX_WORKERS
+    return 2 * max(2 * settings.API_AGENT_POOL_SIZE, settings.EVAL_CONCURRENCY)
+
+
+class _Attempt:
+    """A call on the hedge executor; ``started_at`` is set once a thread picks it up"""
+
+    def __init__(self, executor: ThreadPoolExecutor, fn: Callable, args: tuple, kwargs: dict):
+        self.started = threading.Event()
+        self.started_at: Optional[float] = None
+        self.future = executor.submit(self._run, fn, args, kwargs)
+
+    def _run(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        self.started_at = time.perf_counter()
+        self.started.set()
+        return fn(*args, **kwargs)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+
+class ResiliencePolicy:
+    """
+    Wraps provider calls with jittered exponential backoff (honoring Retry-After),
+    optional hedging after the observed p95 latency, and a circuit breaker.
+    """
+
+    def __init__(self, max_retries: int = settings.LLM_MAX_RETRIES,
+                 backoff_base: float = settings.LLM_BACKOFF_BASE_SECONDS,
+                 backoff_max: float = settings.LLM_BACKOFF_MAX_SECONDS,
+                 hedge: bool = settings.LLM_HEDGE_ENABLED,
+                 hedge_quantile: float = settings.LLM_HEDGE_QUANTILE,
+                 hedge_min_samples: int = settings.LLM_HEDGE_MIN_SAMPLES,
+                 breaker: Optional[CircuitBreaker] = None,
+                 max_workers: Optional[int] = None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyTracker()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or hedge_workers(), thread_name_prefix="llm-hedge"
+        ) if hedge else None
+        self._counters = {"calls": 0, "retries": 0, "hedges_sent": 0, "hedges_won": 0, "failures": 0, "fast_failures": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def backoff_delay(self, attempt: int, exc: BaseException) -> float:
+        """Retry-After when the provider sends one, otherwise full-jitter exponential backoff"""
+        requested = retry_after_seconds(exc)
+        if requested is not None:
+            return min(requested, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def hedge_delay(self) -> Optional[float]:
+        if not self.hedge or len(self.latency) < self.hedge_min_samples:
+            return None
+        return self.latency.quantile(self.hedge_quantile)
+
+    def _hedged(self, fn: Callable, args: tuple, kwargs: dict, delay: float) -> Tuple[Any, float]:
+        """Result of the first successful attempt and its latency"""
+        primary = _Attempt(self._executor, fn, args, kwargs)
+        # Time spent waiting for a thread is not provider latency; the hedge clock starts with the call
+        primary.started.wait()
+        done, _ = wait([primary.future], timeout=delay)
+        if done:
+            return primary.future.result(), primary.elapsed()
+
+        self._count("hedges_sent")
+        backup = _Attempt(self._executor, fn, args, kwargs)
+        attempts = {primary.future: primary, backup.future: backup}
+        pending, error = set(attempts), None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if attempts[future] is backup:
+                        self._count("hedges_won")
+                    return future.result(), attempts[future].elapsed()
+                error = future.exception()
+        raise error
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """Call ``fn`` under the policy; non-transient errors are raised immediately"""
+        self._count("calls")
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self._count("fast_failures")
+                raise
+
+            start = time.perf_counter()
+            try:
+                delay = self.hedge_delay()
+                if delay is None:
+                    result, seconds = fn(*args, **kwargs), None
+                else:
+                    result, seconds = self._hedged(fn, args, kwargs, delay)
+            except Exception as e:
+                if not is_transient(e):
+                    self.breaker.record_success()  # the provider answered; the request itself was bad
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    self._count("failures")
+                    raise
+                wait_seconds = self.backoff_delay(attempt, e)
+                logging.warning(f"Transient LLM error ({str(e)[:200]}); retry {attempt + 1} in {wait_seconds:.2f}s")
+                self._count("retries")
+                time.sleep(wait_seconds)
+                continue
+
+            self.latency.record(seconds if seconds is not None else time.perf_counter() - start)
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "breaker_state": self.breaker.state,
+            "p50_seconds": self.latency.quantile(0.5),
+            "p95_seconds": self.latency.quantile(0.95),
+            "p99_seconds": self.latency.quantile(0.99),
+        }
+
+
+_policies: Dict[str, ResiliencePolicy] = {}
+_policies_lock = threading.Lock()
+
+
+def policy_for(name: str) -> ResiliencePolicy:
+    """Shared policy per model, so every client of that model sees one breaker and one latency window"""
+    with _policies_lock:
+        if name not in _policies:
+            _policies[name] = ResiliencePolicy()
+        return _policies[name]
+
+
+def policy_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters and latency quantiles of every policy created so far, by model"""
+    with _policies_lock:
+        policies = dict(_policies)
+    return {name: policy.stats() for name, policy in policies.items()}
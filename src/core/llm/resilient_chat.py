@@ -0,0 +1,27 @@
+#src/core/llm/resilient_chat.py
+from typing import Any, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+
+
+class ResilientChatModel(BaseChatModel):
+    """Chat model that sends every provider call of ``inner`` through a ResiliencePolicy"""
+
+    inner: BaseChatModel
+    policy: Any
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def _llm_type(self) -> str:
+        return f"resilient-{self.inner._llm_type}"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        return self.policy.call(self.inner._generate, messages, stop=stop, **kwargs)
+
+    def bind_tools(self, tools, **kwargs):
+        # Let the provider format tools and tool_choice, then bind the same kwargs on the wrapper
+        return self.bind(**self.inner.bind_tools(tools, **kwargs).kwargs)
@@ -0,0 +1,124 @@
+#src/core/llm/router.py
+import json
+import logging
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Union
+from config.settings import settings
+from src.core.schema_parser import SchemaParser
+
+# Groq models with their context windows; "max_tokens" is also the ceiling of the app2 token slider
+MODELS = {
+    "llama3-8b-8192": {"max_tokens": 8192},
+    "mixtral-8x7b-32768": {"max_tokens": 32768},
+    "gemma-7b-it": {"max_tokens": 8192},
+    "qwen-2.5-coder-32b": {"max_tokens": 131072},
+}
+
+# Words that signal analytical work beyond a single-table lookup
+_ANALYTICAL_TERMS = (
+    "join", "each", "per", "compare", "versus", "vs", "rank", "top", "trend", "growth", "ratio",
+    "percent", "percentage", "share", "cumulative", "running", "rolling", "moving", "window",
+    "over time", "year over year", "month over month", "average", "median", "distinct",
+    "having", "except", "union", "without", "never", "at least", "more than", "most", "least",
+)
+# Tokens the generation call itself reserves for the answer (see GroqClient max_tokens)
+OUTPUT_TOKENS = 4000
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class RoutingDecision:
+    model: str
+    score: float
+    features: Dict[str, float]
+    attempts: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class ModelRouter:
+    """
+    Scores a generation request on schema size, tables involved, question complexity and
+    context length, then picks the smallest model on the ladder that fits. Requests whose
+    output fails validation escalate one rung at a time.
+    """
+
+    def __init__(self, ladder: Optional[List[str]] = None,
+                 thresholds: Optional[List[float]] = None,
+                 history_size: int = 200):
+        self.ladder = ladder or settings.ROUTER_MODELS
+        # Minimum score for each rung above the first
+        self.thresholds = thresholds or settings.ROUTER_SCORE_THRESHOLDS
+        self._history = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def features(question: str, schema: Union[dict, list, str], context_chars: int = 0) -> Dict[str, float]:
+        tables = SchemaParser.to_table_columns(schema)
+        question_lower = question.lower()
+        mentioned = sum(
+            1 for name in tables
+            if re.search(rf"\b{re.escape(name.split('.')[-1].lower().rstrip('s'))}", question_lower)
+        )
+        schema_text = schema if isinstance(schema, str) else json.dumps(schema)
+        return {
+            "schema_tables": len(tables),
+            "schema_columns": sum(len(columns) for columns in tables.values()),
+            "tables_mentioned": mentioned,
+            "analytical_terms": sum(
+                len(re.findall(rf"\b{re.escape(term)}\b", question_lower)) for term in _ANALYTICAL_TERMS
+            ),
+            "question_words": len(question.split()),
+            "context_tokens": (len(schema_text) + len(question) + context_chars) // CHARS_PER_TOKEN,
+        }
+
+    @staticmethod
+    def score(features: Dict[str, float]) -> float:
+        return round(
+            1.5 * max(features["tables_mentioned"] - 1, 0)
+            + 1.0 * features["analytical_terms"]
+            + 0.5 * max(features["schema_tables"] - 1, 0)
+            + 0.02 * features["schema_columns"]
+            + 0.05 * max(features["question_words"] - 12, 0),
+            2,
+        )
+
+    def _fits(self, model: str, context_tokens: float) -> bool:
+        return MODELS.get(model, {}).get("max_tokens", 0) >= context_tokens + OUTPUT_TOKENS
+
+    def route(self, question: str, schema: Union[dict, list, str], context_chars: int = 0) -> RoutingDecision:
+        features = self.features(question, schema, context_chars)
+        score = self.score(features)
+        rung = sum(1 for threshold in self.thresholds if score >= threshold)
+        rung = min(rung, len(self.ladder) - 1)
+        # Never pick a model whose context window cannot hold the prompt plus the answer
+        while rung < len(self.ladder) - 1 and not self._fits(self.ladder[rung], features["context_tokens"]):
+            rung += 1
+        decision = RoutingDecision(model=self.ladder[rung], score=score, features=features)
+        logging.info(f"Router: score={score} features={features} -> {decision.model}")
+        return decision
+
+    def escalate(self, model: str) -> Optional[str]:
+        """Next model up the ladder, or None at the top"""
+        if model not in self.ladder:
+            return None
+        position = self.ladder.index(model)
+        return self.ladder[position + 1] if position + 1 < len(self.ladder) else None
+
+    def record(self, decision: RoutingDecision, model: str, latency_seconds: float, outcome: str) -> None:
+        """Log one attempt of a routed request; the final attempt closes the decision"""
+        attempt = {"model": model, "latency_ms": round(latency_seconds * 1000, 1), "outcome": outcome}
+        decision.attempts.append(attempt)
+        logging.info(f"Router: {model} answered in {attempt['latency_ms']} ms ({outcome}), score={decision.score}")
+        if outcome != "escalated":
+            with self._lock:
+                self._history.append(asdict(decision))
+
+    def history(self) -> List[Dict[str, Any]]:
+        """Most recent routing decisions, oldest first"""
+        with self._lock:
+            return list(self._history)
+
+
+model_router = ModelRouter()
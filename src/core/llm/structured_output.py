@@ -0,0 +1,322 @@
+#src/core/llm/structured_output.py
+import json
+import logging
+import re
+import threading
+import typing
+from typing import Any, Dict, List, Optional, Type
+from pydantic import BaseModel, ValidationError
+
+FIX_JSON_PROMPT = """The text below was supposed to be {target} but could not be parsed: {error}
+Return ONLY the corrected JSON, with no markdown fences and no commentary.
+
+{raw}"""
+
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+class StructuredOutputError(ValueError):
+    """Raised when model output cannot be turned into the expected JSON structure"""
+
+    def __init__(self, message: str, raw: str):
+        super().__init__(message)
+        self.raw = raw
+
+
+class ParseStats:
+    """Thread-safe per-source counters of how model output had to be parsed"""
+
+    STAGES = ("clean", "recovered", "llm_fix", "failed")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, source: str, stage: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(source, dict.fromkeys(self.STAGES, 0))
+            counts[stage] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """{source: {stage counts..., "total", "failure_rate", "clean_rate"}}"""
+        with self._lock:
+            report = {}
+            for source, counts in self._counts.items():
+                total = sum(counts.values())
+                report[source] = {
+                    **counts,
+                    "total": total,
+                    "failure_rate": counts["failed"] / total if total else 0.0,
+                    "clean_rate": counts["clean"] / total if total else 0.0,
+                }
+            return report
+
+
+parse_stats = ParseStats()
+
+
+def _strip_fences(text: str) -> str:
+    # Only a fence around the whole output; fences inside JSON strings (SQL in
+    # "alternatives") are content
+    match = re.fullmatch(r"```(?:json|JSON)?\s*(.*?)\s*```", text.strip(), flags=re.DOTALL)
+    return match.group(1) if match else text
+
+
+def _normalize(text: str) -> str:
+    """
+    Character-level repair outside string literals: single-quoted strings become
+    double-quoted, Python literals become JSON literals, comments and trailing commas go.
+    """
+    out: List[str] = []
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch in "\"'":
+            # Copy a string literal, re-quoting single-quoted ones
+            quote, j, chars = ch, i + 1, []
+            while j < n and text[j] != quote:
+                if text[j] == "\\" and j + 1 < n:
+                    chars.append(text[j:j + 2])
+                    j += 2
+                    continue
+                chars.append('\\"' if text[j] == '"' and quote == "'" else text[j])
+                j += 1
+            body = "".join(chars)
+            if quote == "'":
+                body = body.replace("\\'", "'")
+            out.append(f'"{body}"')
+            i = j + 1
+        elif text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end == -1 else end
+        elif ch == ",":
+            rest = text[i + 1:].lstrip()
+            if not rest or rest[0] not in "}]":
+                out.append(ch)
+            i += 1
+        elif ch.isalpha():
+            match = re.match(r"[A-Za-z_]+", text[i:])
+            word = match.group(0)
+            out.append(_PYTHON_LITERALS.get(word, word))
+            i += len(word)
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+
+def _close_truncated(fragment: str, closers: List[str], in_string: bool) -> str:
+    """Turn a JSON prefix cut off mid-generation into a parseable document"""
+    if in_string:
+        fragment += '"'
+    fragment = fragment.rstrip()
+    # Drop a dangling key ("key": with no value, or a bare "key" inside an object) and trailing commas
+    fragment = re.sub(r',?\s*"[^"]*"\s*:\s*$', "", fragment)
+    if closers and closers[-1] == "}":
+        fragment = re.sub(r',\s*"[^"]*"$', "", fragment)
+    fragment = fragment.rstrip().rstrip(",")
+    return fragment + "".join(reversed(closers))
+
+
+def _scan_value(text: str, start: int) -> str:
+    """
+    Scan from the opening bracket at ``start`` to its matching close, ignoring
+    brackets inside strings. A value cut off by the end of the text is closed.
+    """
+    closers: List[str] = []
+    in_string, quote, escaped = False, "", False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == quote:
+                in_string = False
+            continue
+        if ch in "\"'":
+            in_string, quote = True, ch
+        elif ch in "{[":
+            closers.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if not closers or closers[-1] != ch:
+                raise ValueError(f"Unbalanced '{ch}' at position {i}")
+            closers.pop()
+            if not closers:
+                return text[start:i + 1]
+    return _close_truncated(text[start:], closers, in_string)
+
+
+def _loads(text: str) -> Any:
+    # strict=False accepts raw newlines inside strings, the most common defect in multi-line SQL values
+    return json.loads(text, strict=False)
+
+
+def extract_json(text: str) -> Any:
+    """
+    Parse the first JSON object or array embedded in ``text``.
+
+    Markdown fences and surrounding prose are stripped, the value is scanned
+    incrementally (so truncated output is closed), and common syntax slips
+    (trailing commas, single quotes, Python literals, comments) are repaired.
+
+    Raises:
+        StructuredOutputError: No JSON value could be recovered.
+    """
+    if not isinstance(text, str):
+        text = getattr(text, "content", str(text))
+    last_error: Optional[Exception] = None
+
+    # The fenced body first, then the whole text
+    for body in dict.fromkeys((_strip_fences(text).strip(), text)):
+        for match in re.finditer(r"[\[{]", body):
+            try:
+                candidate = _scan_value(body, match.start())
+            except ValueError as e:
+                last_error = e
+                continue
+            for attempt in (candidate, _normalize(candidate)):
+                try:
+                    return _loads(attempt)
+                except json.JSONDecodeError as e:
+                    last_error = e
+    raise StructuredOutputError(f"No JSON value found: {last_error or 'empty output'}", text)
+
+
+def _is_list_type(annotation: Any) -> bool:
+    return annotation is list or typing.get_origin(annotation) in (list, List)
+
+
+def _key(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def _coerce_value(value: Any, annotation: Any) -> Any:
+    if _is_list_type(annotation):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            # Only a bulleted block is a list; any other string (e.g. multi-line SQL) is one item
+            lines = [line for line in value.splitlines() if line.strip()]
+            bullet = r"^\s*(?:[-*•]|\d+[.)])\s+"
+            if lines and all(re.match(bullet, line) for line in lines):
+                return [re.sub(bullet, "", line) for line in lines]
+            return [value] if value.strip() else []
+        if isinstance(value, dict):
+            return [f"{k}: {v}" for k, v in value.items()]
+        if isinstance(value, list):
+            return [v if isinstance(v, str) else json.dumps(v) for v in value]
+    if annotation is str:
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            return "\n".join(v if isinstance(v, str) else json.dumps(v) for v in value)
+        if isinstance(value, dict):
+            return json.dumps(value)
+        if not isinstance(value, str):
+            return str(value)
+    return value
+
+
+def coerce_to_model(data: Any, model: Type[BaseModel], aliases: Optional[Dict[str, str]] = None,
+                    defaults: Optional[Dict[str, Any]] = None) -> BaseModel:
+    """
+    Validate ``data`` against ``model``, repairing the shapes models typically get wrong:
+    a wrapper object or one-element list around the payload, differently cased or
+    aliased keys, a string where a list is expected (and vice versa), and missing list fields.
+    Fields the caller already knows can be supplied through ``defaults``.
+
+    Raises:
+        ValidationError: The data still does not fit the model after repair.
+    """
+    fields = model.model_fields
+    if isinstance(data, list) and len(data) == 1:
+        data = data[0]
+    if isinstance(data, dict) and not set(data) & set(fields) and len(data) == 1:
+        inner = next(iter(data.values()))
+        if isinstance(inner, dict):
+            data = inner  # {"result": {...}}
+    if not isinstance(data, dict):
+        return model.model_validate(data)
+
+    lookup = {_key(name): name for name in fields}
+    lookup.update({_key(alias): name for alias, name in (aliases or {}).items()})
+    repaired: Dict[str, Any] = {}
+    for key, value in data.items():
+        name = key if key in fields else lookup.get(_key(key))
+        if name and name not in repaired:
+            repaired[name] = _coerce_value(value, fields[name].annotation)
+    for name, value in (defaults or {}).items():
+        if repaired.get(name) in (None, ""):
+            repaired[name] = value
+    for name, field in fields.items():
+        if name not in repaired and field.is_required() and _is_list_type(field.annotation):
+            repaired[name] = []
+    return model.model_validate(repaired)
+
+
+def _ask_llm_to_fix(llm, raw: str, error: str, model: Optional[Type[BaseModel]]) -> str:
+    target = (f"a JSON object matching this JSON schema:\n{json.dumps(model.model_json_schema())}\n"
+              if model else "a JSON value")
+    response = llm.invoke(FIX_JSON_PROMPT.format(target=target, error=error, raw=raw))
+    return getattr(response, "content", str(response))
+
+
+def parse_structured(raw: Any, model: Optional[Type[BaseModel]] = None, llm=None,
+                     source: str = "default", aliases: Optional[Dict[str, str]] = None,
+                     defaults: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Turn raw model output into JSON (and, when ``model`` is given, a validated model instance).
+
+    Local recovery runs first: plain parsing, then fence/prose stripping with incremental
+    recovery and syntax repair, then schema-guided coercion. Only if all of that fails and
+    an ``llm`` is given is a single "fix this JSON" follow-up sent.
+
+    Args:
+        raw: Model output (str or message with ``content``).
+        model: Optional pydantic model to validate against.
+        llm: Optional chat model for the last-resort repair call.
+        source (str): Name the outcome is recorded under in ``parse_stats``.
+        aliases (dict): Extra {output key: model field} mappings for coercion.
+        defaults (dict): Values for model fields the output may omit.
+
+    Raises:
+        StructuredOutputError: Output could not be recovered.
+    """
+    text = raw if isinstance(raw, str) else getattr(raw, "content", str(raw))
+
+    def attempt(candidate: str, allow_repair: bool):
+        if not allow_repair:
+            data = json.loads(candidate)
+            return model.model_validate(data) if model else data
+        data = extract_json(candidate)
+        return coerce_to_model(data, model, aliases, defaults) if model else data
+
+    try:
+        result = attempt(text, allow_repair=False)
+        parse_stats.record(source, "clean")
+        return result
+    except (json.JSONDecodeError, ValidationError):
+        pass
+
+    try:
+        result = attempt(text, allow_repair=True)
+        parse_stats.record(source, "recovered")
+        return result
+    except (StructuredOutputError, ValidationError) as e:
+        error = str(e)
+
+    if llm is not None:
+        logging.info(f"Structured output from {source} needs an LLM repair call: {error}")
+        try:
+            result = attempt(_ask_llm_to_fix(llm, text, error, model), allow_repair=True)
+            parse_stats.record(source, "llm_fix")
+            return result
+        except (StructuredOutputError, ValidationError) as e:
+            error = str(e)
+        except Exception as e:
+            error = f"{error}; repair call failed: {str(e)}"
+
+    parse_stats.record(source, "failed")
+    raise StructuredOutputError(error, text)
@@ -0,0 +1,23 @@
+#src/core/rag/cached_retriever.py
+from typing import Any, List
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from src.core.rag.retrieval_cache import cached_similarity_search
+
+
+class CachedFAISSRetriever(BaseRetriever):
+    """FAISS retriever backed by the shared retrieval result cache"""
+
+    vectorstore: Any
+    index_name: str
+    version: int = 0
+    k: int = 3
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return cached_similarity_search(self.vectorstore, self.index_name, self.version, query, self.k)
@@ -0,0 +1,69 @@
+#src/core/rag/dialect_indexes.py
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+from config.settings import settings
+from src.core.dialects import Dialect, dialect_for_index
+from src.core.rag.vector_store import VectorStoreManager
+
+
+class DialectIndexRegistry:
+    """Builds or loads each dialect's index on first use and unloads indexes that sit idle"""
+
+    def __init__(self, vector_store: Optional[VectorStoreManager] = None,
+                 idle_ttl_seconds: float = settings.DIALECT_IDLE_TTL_SECONDS):
+        self.vector_store = vector_store or VectorStoreManager()
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._last_used: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _index_exists(self, dialect: Dialect) -> bool:
+        return os.path.exists(os.path.join(settings.VECTOR_STORE_PATH, dialect.index_name, "index.faiss"))
+
+    def ensure_built(self, dialect: Dialect) -> None:
+        """Build the dialect's index from its raw docs, downloading them first if needed"""
+        if self._index_exists(dialect):
+            return
+        with self._lock:
+            if self._index_exists(dialect):
+                return
+            raw_path = os.path.join(settings.RAW_DOCS_PATH, dialect.raw_docs_file)
+            if not os.path.exists(raw_path):
+                from src.data_loader.document_loader import DocumentationLoader
+                DocumentationLoader().load_dialect_docs(dialect)
+            logging.info(f"Building {dialect.name} index on first use")
+            with open(raw_path, "r", encoding="utf-8") as f:
+                self.vector_store.create_vector_store(f.read(), dialect.index_name)
+
+    def preload(self, index_name: str) -> bool:
+        """Load an already built index ahead of its first query; never downloads or builds"""
+        if not self._index_exists(dialect_for_index(index_name)):
+            return False
+        self.vector_store.load_vector_store(index_name)
+        self._last_used[index_name] = time.monotonic()
+        return True
+
+    def similarity_search(self, index_name: str, query: str, k: int = 3) -> list:
+        self.ensure_built(dialect_for_index(index_name))
+        docs = self.vector_store.similarity_search(index_name, query, k)
+        self._last_used[index_name] = time.monotonic()
+        self.unload_idle()
+        return docs
+
+    def unload_idle(self) -> list:
+        """Release indexes that have not been queried within the idle TTL"""
+        now = time.monotonic()
+        idle = [name for name, used in list(self._last_used.items()) if now - used > self.idle_ttl_seconds]
+        for index_name in idle:
+            self.vector_store.unload_vector_store(index_name)
+            self._last_used.pop(index_name, None)
+            logging.info(f"Unloaded idle index {index_name}")
+        return idle
+
+    def loaded_indexes(self) -> list:
+        return list(self._last_used)
+
+
+dialect_indexes = DialectIndexRegistry()
@@ -0,0 +1,126 @@
+#src/core/rag/doc_cleaning.py
+import re
+import zlib
+from collections import Counter
+from typing import List, Tuple
+from pydantic import BaseModel
+from config.settings import settings
+
+# Icon font glyphs (e.g. Material icons in the Trino docs) come through get_text() as private-use characters
+_PRIVATE_USE = re.compile("[\ue000-\uf8ff]")
+# Site chrome around the documentation text
+_CHROME_TAGS = ["nav", "header", "footer", "aside", "script", "style", "noscript", "form", "button"]
+# Main content containers, most specific first: MkDocs Material (trino.io), Jekyll (spark.apache.org)
+_MAIN_SELECTORS = ["article", "div.md-content", "[role=main]", "main", "div#content", "div.container-wrapper"]
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+class CleaningReport(BaseModel):
+    raw_chars: int = 0
+    cleaned_chars: int = 0
+    boilerplate_lines: int = 0
+    raw_chunks: int = 0
+    near_duplicates: int = 0
+    chunks: int = 0
+
+    def summary(self) -> str:
+        corpus = 1 - self.cleaned_chars / self.raw_chars if self.raw_chars else 0.0
+        index = 1 - self.chunks / self.raw_chunks if self.raw_chunks else 0.0
+        return (f"corpus {self.raw_chars:,} -> {self.cleaned_chars:,} chars ({corpus:.0%} smaller, "
+                f"{self.boilerplate_lines:,} boilerplate lines), index {self.raw_chunks:,} -> "
+                f"{self.chunks:,} chunks ({index:.0%} smaller, {self.near_duplicates:,} near-duplicates)")
+
+
+def extract_main_content(soup) -> str:
+    """Text of a scraped page's main content, without navigation, headers and footers"""
+    for tag in soup.find_all(_CHROME_TAGS):
+        tag.decompose()
+    main = next((found for found in map(soup.select_one, _MAIN_SELECTORS) if found is not None), None)
+    return (main or soup.body or soup).get_text()
+
+
+def strip_boilerplate(text: str, window: int = settings.BOILERPLATE_WINDOW,
+                      min_repeats: int = settings.BOILERPLATE_MIN_REPEATS) -> Tuple[str, int]:
+    """
+    Drop repeated runs of lines (menus, version pickers, footers) from a corpus of
+    concatenated pages, keeping the first copy; returns the text and lines dropped.
+
+    A run is ``window`` consecutive non-blank lines, of which at least three differ,
+    seen ``min_repeats`` times or more. Requiring whole runs rather than single lines
+    keeps legitimately frequent lines such as "Examples" headings and table cells.
+    """
+    lines = _PRIVATE_USE.sub("", text).splitlines()
+    content = [i for i, line in enumerate(lines) if line.strip()]
+    keys = [" ".join(lines[i].split()) for i in content]
+    blocks = [tuple(keys[j:j + window]) for j in range(len(keys) - window + 1)]
+    counts = Counter(blocks)
+
+    seen, dropped = set(), set()
+    for j, block in enumerate(blocks):
+        if counts[block] < min_repeats or len(set(block)) < min(window, 3):
+            continue
+        if block in seen:
+            dropped.update(content[j:j + window])
+        seen.add(block)
+
+    kept = "\n".join(line.rstrip() for i, line in enumerate(lines) if i not in dropped)
+    # Pages are mostly blank lines once the chrome is gone; paragraph breaks are all the splitter needs
+    return re.sub(r"\n{3,}", "\n\n", kept).strip() + "\n", len(dropped)
+
+
+def _shingles(text: str, size: int) -> set:
+    words = re.findall(r"\w+", text.lower())
+    return {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+
+
+def minhash_signatures(texts: List[str], num_perm: int = settings.MINHASH_PERMUTATIONS,
+                       shingle_size: int = settings.SHINGLE_SIZE, seed: int = 1):
+    """MinHash signature (one row per text) of each text's word shingles"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    # Universal hashing (a * h + b) mod p as the permutations; the products wrap at 2**64 like
+    # datasketch's, which is what scrambles the order of the 32-bit shingle hashes
+    a = rng.integers(1, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    for row, text in enumerate(texts):
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in _shingles(text, shingle_size)), dtype=np.uint64)
+        signatures[row] = (((hashes[:, None] * a + b) % _MERSENNE_PRIME) & 0xFFFFFFFF).min(axis=0)
+    return signatures
+
+
+def near_duplicates(texts: List[str], threshold: float = settings.NEAR_DUPLICATE_THRESHOLD,
+                    num_perm: int = settings.MINHASH_PERMUTATIONS, bands: int = settings.MINHASH_BANDS) -> List[int]:
+    """
+    Indexes of texts whose estimated Jaccard similarity to an earlier kept text is at
+    least ``threshold``. Candidates come from LSH banding of the MinHash signatures,
+    so this stays close to linear in the number of texts.
+    """
+    if not texts:
+        return []
+    signatures = minhash_signatures(texts, num_perm)
+    rows = num_perm // bands
+    buckets = [{} for _ in range(bands)]
+    duplicates = []
+    for i, signature in enumerate(signatures):
+        keys = [signature[band * rows:(band + 1) * rows].tobytes() for band in range(bands)]
+        candidates = {j for band, key in enumerate(keys) for j in buckets[band].get(key, ())}
+        if any((signatures[j] == signature).mean() >= threshold for j in candidates):
+            duplicates.append(i)
+            continue
+        for band, key in enumerate(keys):
+            buckets[band].setdefault(key, []).append(i)
+    return duplicates
+
+
+def clean_corpus(text: str, splitter) -> Tuple[list, CleaningReport]:
+    """Strip boilerplate from a documentation corpus, chunk it and drop near-duplicate chunks"""
+    report = CleaningReport(raw_chars=len(text), raw_chunks=len(splitter.split_text(text)))
+    text, report.boilerplate_lines = strip_boilerplate(text)
+    report.cleaned_chars = len(text)
+    docs = splitter.create_documents([text])
+    dropped = set(near_duplicates([doc.page_content for doc in docs]))
+    docs = [doc for i, doc in enumerate(docs) if i not in dropped]
+    report.near_duplicates, report.chunks = len(dropped), len(docs)
+    return docs, report
@@ -0,0 +1,23 @@
+#src/core/rag/embeddings.py
+from functools import lru_cache
+from typing import Optional
+from config.settings import settings
+
+
+@lru_cache(maxsize=None)
+def get_embeddings(model_name: Optional[str] = None, device: Optional[str] = None,
+                   backend: Optional[str] = None):
+    """Return a process-wide embeddings instance, loading the model on first use"""
+    backend = backend or settings.EMBEDDING_BACKEND
+    if backend == "onnx":
+        from src.core.rag.onnx_embeddings import OnnxEmbeddings
+        return OnnxEmbeddings(model_name=model_name)
+    if backend != "huggingface":
+        raise ValueError(f"Unknown embedding backend: {backend}. Available: huggingface, onnx")
+
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    return HuggingFaceEmbeddings(
+        model_name=model_name or settings.EMBEDDING_MODEL,
+        model_kwargs={"device": device or settings.EMBEDDING_DEVICE}
+    )
@@ -0,0 +1,346 @@
+#src/core/rag/exemplar_store.py
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union, TYPE_CHECKING
+from config.settings import settings
+from src.core.cache.disk_cache import content_key
+from src.core.schema_parser import SchemaParser
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def schema_fingerprint(schema: Union[dict, list, str]) -> str:
+    """Stable hash of a schema's tables, columns and types, independent of input format and order"""
+    tables = SchemaParser.to_table_columns(schema)
+    canonical = sorted(
+        (table.lower(), sorted((column.lower(), str(col_type).upper()) for column, col_type in columns.items()))
+        for table, columns in tables.items()
+    )
+    return hashlib.sha256(json.dumps(canonical).encode()).hexdigest()[:16]
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class ExemplarStore:
+    """
+    Accepted (question, schema fingerprint, SQL, dialect) triples in SQLite, with a FAISS
+    index over question embeddings that takes inserts and deletes without a rebuild.
+
+    The index starts exact (IndexIDMap2 over inner product) and is migrated to an IVF
+    index past ``ivf_threshold`` entries so search stays fast at millions of rows; the
+    IVF index is retrained whenever the store grows ``retrain_growth`` times past the
+    size it was trained at. Vectors are also kept in SQLite, so nothing is re-embedded.
+
+    Several processes (Streamlit, API workers) may share a store. Row ids only grow and
+    deletes are logged in the ``removed`` table, so an index tracks the highest id and
+    removal it has applied and catches up on other processes' writes by replaying only
+    the rows after those. The index file is a snapshot written under a file lock.
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 embed: Optional[Callable[[List[str]], List[List[float]]]] = None,
+                 ivf_threshold: int = settings.EXEMPLAR_IVF_THRESHOLD,
+                 nprobe: int = settings.EXEMPLAR_NPROBE,
+                 save_every: int = settings.EXEMPLAR_SAVE_EVERY,
+                 retrain_growth: float = settings.EXEMPLAR_IVF_RETRAIN_GROWTH):
+        self.path = path or settings.EXEMPLAR_STORE_PATH
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.save_every = save_every
+        self.retrain_growth = retrain_growth
+        self._embed_fn = embed
+        self._lock = threading.RLock()
+        self._flock = None
+        self._index = None
+        # What self._index reflects: rows up to this id, removals up to this sequence number
+        self._max_id = 0
+        self._removed_seq = 0
+        self._trained_size = 0  # entries the index was built (and IVF trained) with
+        self._unsaved = 0
+        os.makedirs(self.path, exist_ok=True)
+        self._db_path = os.path.join(self.path, "exemplars.sqlite3")
+        self._index_path = os.path.join(self.path, "exemplars.faiss")
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS exemplars ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, content_hash TEXT UNIQUE NOT NULL, "
+                "question TEXT NOT NULL, schema_fingerprint TEXT NOT NULL, sql TEXT NOT NULL, "
+                "dialect TEXT NOT NULL, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS removed (seq INTEGER PRIMARY KEY AUTOINCREMENT, exemplar_id INTEGER NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection that commits (or rolls back) and is closed when the block exits"""
+        conn = sqlite3.connect(self._db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _file_lock(self):
+        # One instance, so the lock is reentrant when saving while holding it
+        if self._flock is None:
+            from filelock import FileLock
+            self._flock = FileLock(f"{self._index_path}.lock", timeout=600)
+        return self._flock
+
+    def _embed(self, texts: List[str]) -> "np.ndarray":
+        import faiss
+        import numpy as np
+
+        if self._embed_fn is None:
+            from src.core.rag.embeddings import get_embeddings
+            self._embed_fn = get_embeddings().embed_documents
+        vectors = np.asarray(self._embed_fn(texts), dtype=np.float32)
+        faiss.normalize_L2(vectors)  # inner product == cosine similarity
+        return vectors
+
+    @staticmethod
+    def _to_arrays(rows: list):
+        import numpy as np
+
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        vectors = np.vstack([np.frombuffer(r[1], dtype=np.float32) for r in rows])
+        return ids, vectors
+
+    def _build_index(self, ids: "np.ndarray", vectors: "np.ndarray"):
+        """Exact index for small stores, IVF once there are enough vectors to train it"""
+        import faiss
+
+        dim = vectors.shape[1]
+        if len(ids) < self.ivf_threshold:
+            index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        else:
+            nlist = int(4 * math.sqrt(len(ids)))
+            index = faiss.IndexIVFFlat(faiss.IndexFlatIP(dim), dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+            index.nprobe = self.nprobe
+        index.add_with_ids(vectors, ids)
+        return index
+
+    def _rebuild(self) -> None:
+        """Build the index from every vector in SQLite"""
+        with self._connect() as conn:
+            # Removals are read first: one made after the rows were read must still be replayed
+            removed_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM removed").fetchone()[0]
+            rows = conn.execute("SELECT id, vector FROM exemplars ORDER BY id").fetchall()
+        self._removed_seq = removed_seq
+        self._max_id = rows[-1][0] if rows else 0
+        self._trained_size = len(rows)
+        self._index = None
+        if rows:
+            logging.info(f"Rebuilding exemplar index from {len(rows)} stored vectors")
+            self._index = self._build_index(*self._to_arrays(rows))
+            self.save()
+
+    def _saved_meta(self) -> Optional[Dict[str, int]]:
+        meta_path = f"{self._index_path}.json"
+        if not (os.path.exists(self._index_path) and os.path.exists(meta_path)):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return meta if {"max_id", "removed_seq", "trained_size", "ntotal"} <= meta.keys() else None
+
+    def _load_saved(self) -> bool:
+        """Load the index file and what it reflects; False when there is no usable snapshot"""
+        import faiss
+
+        with self._file_lock():
+            meta = self._saved_meta()
+            if meta is None:
+                return False
+            index = faiss.read_index(self._index_path)
+        if index.ntotal != meta["ntotal"]:
+            return False  # index and metadata from different saves (interrupted write)
+        if hasattr(index, "nprobe"):
+            index.nprobe = self.nprobe
+        self._index = index
+        self._max_id, self._removed_seq = meta["max_id"], meta["removed_seq"]
+        self._trained_size = meta["trained_size"]
+        return True
+
+    def _catch_up(self, maintain: bool = True) -> None:
+        """Apply rows added and removed (by any process) since the index was last synced"""
+        import numpy as np
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, vector FROM exemplars WHERE id > ? ORDER BY id", (self._max_id,)
+            ).fetchall()
+            removed = conn.execute(
+                "SELECT seq, exemplar_id FROM removed WHERE seq > ? ORDER BY seq", (self._removed_seq,)
+            ).fetchall()
+        if rows:
+            ids, vectors = self._to_arrays(rows)
+            if self._index is None:
+                self._index = self._build_index(ids, vectors)
+                self._trained_size = len(ids)
+            else:
+                self._index.add_with_ids(vectors, ids)
+            self._max_id = rows[-1][0]
+        if removed:
+            if self._index is not None:
+                self._index.remove_ids(np.fromiter((r[1] for r in removed), dtype=np.int64, count=len(removed)))
+            self._removed_seq = removed[-1][0]
+        self._unsaved += len(rows) + len(removed)
+        if maintain and (rows or removed):
+            self._after_mutation()
+
+    def _needs_training(self) -> bool:
+        import faiss
+
+        if isinstance(self._index, faiss.IndexIDMap2):
+            return self._index.ntotal >= self.ivf_threshold
+        return self._index.ntotal >= self.retrain_growth * self._trained_size
+
+    def _train(self) -> None:
+        """Migrate to IVF or retrain it, under the file lock so processes sharing the store train once"""
+        with self._file_lock():
+            meta = self._saved_meta()
+            # Another process may have trained at a larger size already; use its index
+            if meta and meta["trained_size"] > self._trained_size and self._load_saved():
+                self._catch_up(maintain=False)
+                if not self._needs_training():
+                    return
+            self._rebuild()
+
+    def _after_mutation(self) -> None:
+        if self._index is None:
+            return
+        if self._needs_training():
+            self._train()
+        elif self._unsaved >= self.save_every or self._index.ntotal < 10_000:
+            self.save()
+
+    def _sync(self) -> None:
+        if self._index is None and not self._load_saved():
+            self._rebuild()
+        self._catch_up()
+
+    @property
+    def index(self):
+        """
+        FAISS index matching the database: the in-memory or saved index plus the rows
+        written since, or a rebuild from SQLite when there is neither
+        """
+        with self._lock:
+            self._sync()
+            return self._index
+
+    def save(self) -> None:
+        """Write the index, unless the saved one already reflects as much"""
+        import faiss
+
+        meta_path = f"{self._index_path}.json"
+        with self._lock, self._file_lock():
+            if self._index is None:
+                return
+            saved = self._saved_meta()
+            if (saved and saved["max_id"] >= self._max_id and saved["removed_seq"] >= self._removed_seq
+                    and saved["trained_size"] >= self._trained_size):
+                self._unsaved = 0
+                return
+            partial = f"{self._index_path}.{os.getpid()}.tmp"
+            faiss.write_index(self._index, partial)
+            os.replace(partial, self._index_path)
+            with open(f"{meta_path}.{os.getpid()}.tmp", "w") as f:
+                json.dump({"max_id": self._max_id, "removed_seq": self._removed_seq,
+                           "trained_size": self._trained_size, "ntotal": self._index.ntotal}, f)
+            os.replace(f"{meta_path}.{os.getpid()}.tmp", meta_path)
+            self._unsaved = 0
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM exemplars").fetchone()[0]
+
+    def add(self, question: str, schema: Union[dict, list, str], sql: str, dialect: str) -> int:
+        """Store an accepted query; adding the same triple again returns the existing id"""
+        fingerprint = schema_fingerprint(schema)
+        digest = content_key(_normalize_text(question), fingerprint, dialect, _normalize_text(sql))
+        with self._lock:
+            with self._connect() as conn:
+                row = conn.execute("SELECT id FROM exemplars WHERE content_hash = ?", (digest,)).fetchone()
+                if row:
+                    return row[0]
+
+            vector = self._embed([question])
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO exemplars (content_hash, question, schema_fingerprint, sql, dialect, vector, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (digest, question, fingerprint, sql, dialect, vector[0].tobytes(), time.time())
+                )
+                exemplar_id = cursor.lastrowid
+            # Picks up the new row together with anything other processes wrote before it
+            self._sync()
+            return exemplar_id
+
+    def remove(self, exemplar_id: int) -> bool:
+        with self._lock:
+            with self._connect() as conn:
+                deleted = conn.execute("DELETE FROM exemplars WHERE id = ?", (exemplar_id,)).rowcount
+                if deleted:
+                    conn.execute("INSERT INTO removed (exemplar_id) VALUES (?)", (exemplar_id,))
+            if deleted:
+                self._sync()
+            return bool(deleted)
+
+    def search(self, question: str, schema: Union[dict, list, str], dialect: str,
+               k: int = settings.EXEMPLAR_TOP_K,
+               min_similarity: float = settings.EXEMPLAR_MIN_SIMILARITY) -> List[Dict[str, Any]]:
+        """
+        Most similar accepted questions for ``dialect``; exemplars written against the
+        same schema (by fingerprint) rank ahead of ones from other schemas.
+        """
+        with self._lock:
+            index = self.index
+            if index is None or index.ntotal == 0:
+                return []
+            fetch = min(max(k * 10, 50), index.ntotal)
+            scores, ids = index.search(self._embed([question]), fetch)
+
+        similarity = {int(i): float(s) for i, s in zip(ids[0], scores[0]) if i != -1 and s >= min_similarity}
+        if not similarity:
+            return []
+        placeholders = ",".join("?" * len(similarity))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT id, question, schema_fingerprint, sql, dialect FROM exemplars "
+                f"WHERE dialect = ? AND id IN ({placeholders})",
+                (dialect, *similarity.keys())
+            ).fetchall()
+
+        fingerprint = schema_fingerprint(schema)
+        candidates = [
+            {"id": r[0], "question": r[1], "schema_fingerprint": r[2], "sql": r[3], "dialect": r[4],
+             "similarity": round(similarity[r[0]], 4), "same_schema": r[2] == fingerprint}
+            for r in rows
+        ]
+        candidates.sort(key=lambda c: (not c["same_schema"], -c["similarity"]))
+        return candidates[:k]
+
+
+def format_exemplars(exemplars: List[Dict[str, Any]]) -> str:
+    if not exemplars:
+        return "None"
+    return "\n\n".join(f"Question: {e['question']}\nSQL:\n{e['sql']}" for e in exemplars)
+
+
+@lru_cache(maxsize=1)
+def get_exemplar_store() -> ExemplarStore:
+    return ExemplarStore()
@@ -0,0 +1,123 @@
+#src/core/rag/onnx_embeddings.py
+import logging
+import os
+from typing import List, Optional, Tuple, TYPE_CHECKING
+from langchain_core.embeddings import Embeddings
+from config.settings import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def prepare_onnx_model(model_name: str, model_dir: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Paths of the int8 ONNX model and tokenizer for ``model_name``, downloading the
+    exported model from the Hugging Face Hub and quantizing it on first use.
+    """
+    target = os.path.join(model_dir or settings.ONNX_MODEL_DIR, model_name.replace("/", "__"))
+    quantized = os.path.join(target, "model_int8.onnx")
+    tokenizer = os.path.join(target, "tokenizer.json")
+    if os.path.exists(quantized) and os.path.exists(tokenizer):
+        return quantized, tokenizer
+
+    from filelock import FileLock
+    from huggingface_hub import hf_hub_download
+    from onnxruntime.quantization import QuantType, quant_pre_process, quantize_dynamic
+
+    os.makedirs(target, exist_ok=True)
+    # Processes starting together prepare the model once; the others wait and reuse it
+    with FileLock(os.path.join(target, "prepare.lock"), timeout=1800):
+        if os.path.exists(quantized) and os.path.exists(tokenizer):
+            return quantized, tokenizer
+        if not os.path.exists(tokenizer):
+            hf_hub_download(model_name, "tokenizer.json", local_dir=target)
+        exported = os.path.join(target, "model.onnx")
+        if not os.path.exists(exported):
+            try:
+                # sentence-transformers repos ship an ONNX export next to the PyTorch weights
+                hf_hub_download(model_name, "onnx/model.onnx", local_dir=target)
+                os.replace(os.path.join(target, "onnx", "model.onnx"), exported)
+            except Exception as e:
+                raise RuntimeError(
+                    f"No ONNX export of {model_name} on the Hub ({str(e)}); export it with "
+                    f"`optimum-cli export onnx --model {model_name} {target}`"
+                )
+        logging.info(f"Quantizing {exported} to int8")
+        # Shape inference and graph cleanup first, as ONNX Runtime recommends before quantizing
+        prepared = os.path.join(target, "model_prep.onnx")
+        partial = os.path.join(target, "model_int8.partial.onnx")
+        try:
+            quant_pre_process(exported, prepared, skip_symbolic_shape=True)
+            quantize_dynamic(prepared, partial, weight_type=QuantType.QInt8)
+            # Readers never see a partially written model, even if quantizing is interrupted
+            os.replace(partial, quantized)
+        finally:
+            for path in (prepared, partial):
+                if os.path.exists(path):
+                    os.remove(path)
+    return quantized, tokenizer
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    Sentence-transformers style embeddings (mean pooling, L2 normalized) from an
+    int8-quantized ONNX export run on ONNX Runtime's CPU provider.
+    """
+
+    def __init__(self, model_name: Optional[str] = None, model_dir: Optional[str] = None,
+                 intra_op_threads: int = settings.ONNX_INTRA_OP_THREADS,
+                 inter_op_threads: int = settings.ONNX_INTER_OP_THREADS,
+                 batch_size: int = settings.EMBEDDING_BATCH_SIZE,
+                 max_length: int = settings.EMBEDDING_MAX_SEQ_LENGTH):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.model_name = model_name or settings.EMBEDDING_MODEL
+        self.batch_size = batch_size
+        model_path, tokenizer_path = prepare_onnx_model(self.model_name, model_dir)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads  # 0 lets ONNX Runtime use every core
+        options.inter_op_num_threads = inter_op_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = {node.name for node in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding(pad_id=self.tokenizer.token_to_id("[PAD]") or 0)
+
+    def _embed_batch(self, texts: List[str]) -> "np.ndarray":
+        import numpy as np
+
+        encodings = self.tokenizer.encode_batch(texts)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": attention_mask,
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        token_embeddings = self.session.run(None, {k: v for k, v in inputs.items() if k in self._input_names})[0]
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        import numpy as np
+
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        # Batching texts of similar length keeps padding, and so wasted compute, low
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            for i, vector in zip(batch, self._embed_batch([texts[i] for i in batch])):
+                vectors[i] = vector
+        return np.vstack(vectors).astype(np.float32)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed([text])[0].tolist()
@@ -0,0 +1,99 @@
+#src/core/rag/retrieval_cache.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from config.settings import settings
+
+
+class RetrievalCache:
+    """LRU/TTL cache of (index name, index version, normalized query, k) -> chunk ids"""
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def _key(self, index_name: str, version: int, query: str, k: int) -> Tuple:
+        return (index_name, version, self.normalize_query(query), k)
+
+    def get(self, index_name: str, version: int, query: str, k: int) -> Optional[List[str]]:
+        key = self._key(index_name, version, query, k)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, index_name: str, version: int, query: str, k: int, chunk_ids: List[str]) -> None:
+        key = self._key(index_name, version, query, k)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), list(chunk_ids))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, index_name: str) -> int:
+        """Drop every entry for ``index_name``; returns the number of entries removed"""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == index_name]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            logging.info(f"Retrieval cache: invalidated {len(stale)} entries for {index_name}")
+        return len(stale)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+retrieval_cache = RetrievalCache(
+    max_entries=settings.RETRIEVAL_CACHE_SIZE,
+    ttl_seconds=settings.RETRIEVAL_CACHE_TTL_SECONDS
+)
+
+
+def search_chunk_ids(db, query: str, k: int) -> List[str]:
+    """Embed ``query`` and return the docstore ids of the ``k`` nearest chunks in a FAISS store"""
+    import faiss
+    import numpy as np
+
+    vector = np.array([db._embed_query(query)], dtype=np.float32)
+    if getattr(db, "_normalize_L2", False):
+        faiss.normalize_L2(vector)
+    _, indices = db.index.search(vector, k)
+    return [db.index_to_docstore_id[i] for i in indices[0] if i != -1]
+
+
+def cached_similarity_search(db, index_name: str, version: int, query: str, k: int = 4) -> list:
+    """Similarity search that skips embedding and FAISS search for repeated queries"""
+    chunk_ids = retrieval_cache.get(index_name, version, query, k)
+    if chunk_ids is None:
+        chunk_ids = search_chunk_ids(db, query, k)
+        retrieval_cache.put(index_name, version, query, k, chunk_ids)
+    docs = [db.docstore.search(chunk_id) for chunk_id in chunk_ids]
+    # The docstore returns an error string for ids it no longer holds.
+    return [doc for doc in docs if not isinstance(doc, str)]
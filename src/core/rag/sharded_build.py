@@ -0,0 +1,103 @@
+#src/core/rag/sharded_build.py
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional
+from config.settings import settings
+from src.core.cache.disk_cache import content_key
+
+
+def _init_worker(threads: int) -> None:
+    # One process per core scales better than several processes fighting over every core
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    settings.ONNX_INTRA_OP_THREADS = threads
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def _build_shard(texts: List[str], metadatas: List[dict], shard_path: str) -> int:
+    """Embed one shard and save it as a standalone FAISS index; the rename makes it a checkpoint"""
+    from langchain_community.vectorstores import FAISS
+    from src.core.rag.embeddings import get_embeddings
+
+    embeddings = get_embeddings()
+    vectors = embeddings.embed_documents(texts)
+    store = FAISS.from_embeddings(list(zip(texts, vectors)), embeddings, metadatas=metadatas)
+    partial = f"{shard_path}.tmp"
+    shutil.rmtree(partial, ignore_errors=True)
+    store.save_local(partial)
+    os.replace(partial, shard_path)
+    return len(texts)
+
+
+def build_sharded_index(docs: list, checkpoint_root: str, workers: Optional[int] = None,
+                        shard_size: int = settings.INDEX_SHARD_SIZE,
+                        threads_per_worker: int = settings.INDEX_BUILD_THREADS_PER_WORKER):
+    """
+    Embed ``docs`` in shards across a process pool and merge the shard indexes, in
+    order, into one FAISS store.
+
+    Finished shards are kept under ``checkpoint_root`` (keyed by the chunk contents
+    and embedding configuration), so a build that crashes resumes with the shards it
+    had not finished. Checkpoints are removed once the merge succeeds.
+    """
+    from langchain_community.vectorstores import FAISS
+    from src.core.rag.embeddings import get_embeddings
+
+    if not docs:
+        raise ValueError("No documents to index")
+    workers = workers or settings.INDEX_BUILD_WORKERS or os.cpu_count() or 1
+    texts = [doc.page_content for doc in docs]
+    metadatas = [doc.metadata for doc in docs]
+    build_key = content_key(texts, settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND, shard_size)[:16]
+    checkpoint_dir = os.path.join(checkpoint_root, build_key)
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    shards = [
+        (start, os.path.join(checkpoint_dir, f"shard_{start // shard_size:05d}"))
+        for start in range(0, len(texts), shard_size)
+    ]
+    pending = [(start, path) for start, path in shards if not os.path.exists(path)]
+    logging.info(
+        f"Index build: {len(texts)} chunks in {len(shards)} shards, "
+        f"{len(shards) - len(pending)} already checkpointed, {workers} workers"
+    )
+
+    start_time = time.perf_counter()
+    if workers <= 1 or len(pending) <= 1:
+        for start, path in pending:
+            _build_shard(texts[start:start + shard_size], metadatas[start:start + shard_size], path)
+    elif pending:
+        import multiprocessing
+
+        # spawn, not fork: the parent may already hold an embedding model and its thread pools
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)),
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(threads_per_worker,)) as pool:
+            futures = {
+                pool.submit(_build_shard, texts[start:start + shard_size],
+                            metadatas[start:start + shard_size], path): path
+                for start, path in pending
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                future.result()
+                logging.info(f"Index build: shard {done}/{len(pending)} done ({futures[future]})")
+    logging.info(f"Index build: embedded {len(pending)} shards in {time.perf_counter() - start_time:.1f}s")
+
+    embeddings = get_embeddings()
+    merged = None
+    for _, path in shards:
+        shard = FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+        if merged is None:
+            merged = shard
+        else:
+            merged.merge_from(shard)
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    return merged
@@ -1,26 +1,86 @@
-#src/core/rag/vector_store.py
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
-from config.settings import settings
-
-class VectorStoreManager:
-    def __init__(self):
-        self.embeddings = HuggingFaceEmbeddings(model_name=settings.EMBEDDING_MODEL)
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=settings.CHUNK_SIZE,
-            chunk_overlap=settings.CHUNK_OVERLAP
-        )
-
-    def create_vector_store(self, text, store_name):
-        docs = self.splitter.create_documents([text])
-        vector_store = FAISS.from_documents(docs, self.embeddings)
-        vector_store.save_local(f"{settings.VECTOR_STORE_PATH}/{store_name}")
-        return vector_store
-
-    def load_vector_store(self, store_name):
-        return FAISS.load_local(
-            f"{settings.VECTOR_STORE_PATH}/{store_name}",
-            self.embeddings,
-            allow_dangerous_deserialization=True
-        )
\ No newline at end of file
+#src/core/rag/vector_store.py
+import logging
+import os
+from config.settings import settings
+from src.core.rag.embeddings import get_embeddings
+from src.core.rag.retrieval_cache import retrieval_cache, cached_similarity_search
+
+VERSION_FILE = "VERSION"
+
+# Loaded FAISS stores shared by every manager in the process, keyed by (store name, version).
+_loaded_stores = {}
+
+class VectorStoreManager:
+    def __init__(self):
+        self._splitter = None
+
+    @property
+    def embeddings(self):
+        return get_embeddings()
+
+    @property
+    def splitter(self):
+        if self._splitter is None:
+            from langchain.text_splitter import RecursiveCharacterTextSplitter
+            self._splitter = RecursiveCharacterTextSplitter(
+                chunk_size=settings.CHUNK_SIZE,
+                chunk_overlap=settings.CHUNK_OVERLAP
+            )
+        return self._splitter
+
+    def _store_path(self, store_name):
+        return f"{settings.VECTOR_STORE_PATH}/{store_name}"
+
+    def index_version(self, store_name) -> int:
+        """Version of the index on disk; bumped every time the index is rebuilt"""
+        try:
+            with open(os.path.join(self._store_path(store_name), VERSION_FILE), "r", encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def create_vector_store(self, text, store_name, workers=None):
+        from src.core.rag.sharded_build import build_sharded_index
+
+        if settings.DOC_CLEANING_ENABLED:
+            from src.core.rag.doc_cleaning import clean_corpus
+
+            docs, report = clean_corpus(text, self.splitter)
+            logging.info(f"Cleaned {store_name}: {report.summary()}")
+        else:
+            docs = self.splitter.create_documents([text])
+        # Sharded across processes, with per-shard checkpoints so a crashed build resumes
+        vector_store = build_sharded_index(
+            docs, os.path.join(settings.VECTOR_STORE_PATH, ".shards", store_name), workers=workers
+        )
+        vector_store.save_local(self._store_path(store_name))
+
+        version = self.index_version(store_name) + 1
+        with open(os.path.join(self._store_path(store_name), VERSION_FILE), "w", encoding="utf-8") as f:
+            f.write(str(version))
+        retrieval_cache.invalidate(store_name)
+        _loaded_stores[(store_name, version)] = vector_store
+        return vector_store
+
+    def load_vector_store(self, store_name):
+        from langchain_community.vectorstores import FAISS
+
+        key = (store_name, self.index_version(store_name))
+        if key not in _loaded_stores:
+            self.unload_vector_store(store_name)
+            _loaded_stores[key] = FAISS.load_local(
+                self._store_path(store_name),
+                self.embeddings,
+                allow_dangerous_deserialization=True
+            )
+        return _loaded_stores[key]
+
+    def unload_vector_store(self, store_name):
+        """Drop a loaded index from memory; it is reloaded from disk on next use"""
+        for key in [k for k in _loaded_stores if k[0] == store_name]:
+            del _loaded_stores[key]
+
+    def similarity_search(self, store_name, query, k=4):
+        """Cached similarity search against a named index"""
+        db = self.load_vector_store(store_name)
+        return cached_similarity_search(db, store_name, self.index_version(store_name), query, k)
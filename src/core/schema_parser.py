@@ -1,118 +1,226 @@
-import pandas as pd
-import sqlparse
-import json
-import re
-from io import StringIO
-from sqlparse.sql import IdentifierList, Identifier
-from sqlparse.tokens import Keyword, Punctuation
-from typing import Union
-from src.core.llm.groq_client import GroqClient
-
-class SchemaParser:
-    @staticmethod
-    def parse_input(input_data: Union[str, bytes], input_type: str) -> dict:
-        """Handle different input types and return standardized schema"""
-        if input_type == "natural_language":
-            return SchemaParser._parse_natural_language(input_data)
-        elif input_type == "csv":
-            return SchemaParser._parse_csv(input_data)
-        elif input_type == "sql":
-            return SchemaParser._parse_sql(input_data)
-        else:
-            raise ValueError(f"Invalid input type: {input_type}")
-
-    @staticmethod
-    def _parse_natural_language(text: str) -> dict:
-        """Convert natural language description to structured schema"""
-        llm = GroqClient().llm
-        prompt = f"""
-        Convert this table description to JSON schema:
-        {text}
-        
-        JSON format:
-        {{
-            "table_name": "string",
-            "columns": ["name (type)", ...],
-            "relationships": ["table.column -> related_table.column"]
-        }}
-        
-        Return only valid JSON, no other text.
-        """
-        response = llm.invoke(prompt).content
-        
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            return SchemaParser._handle_llm_fallback(response)
-
-    @staticmethod
-    def _handle_llm_fallback(text: str) -> dict:
-        """Fallback parsing for malformed LLM responses"""
-        table_match = re.search(r'"table_name"\s*:\s*"([^"]+)"', text)
-        columns_match = re.findall(r'"columns"\s*:\s*\[([^\]]+)\]', text)
-        
-        return {
-            "table_name": table_match.group(1) if table_match else "unknown_table",
-            "columns": [c.strip() for c in columns_match[0].split(",")] if columns_match else [],
-            "relationships": []
-        }
-
-    @staticmethod
-    def _parse_csv(file_data: bytes) -> dict:
-        """Infer schema from CSV content"""
-        df = pd.read_csv(StringIO(file_data.decode()))
-        return {
-            "table_name": "uploaded_table",
-            "columns": [
-                f"{col} ({SchemaParser._infer_sql_type(df[col])})"
-                for col in df.columns
-            ],
-            "relationships": []
-        }
-
-    @staticmethod
-    def _infer_sql_type(series: pd.Series) -> str:
-        """Map pandas dtype to SQL type"""
-        dtype = series.dtype
-        if pd.api.types.is_integer_dtype(dtype):
-            return "INT"
-        elif pd.api.types.is_float_dtype(dtype):
-            return "FLOAT"
-        elif pd.api.types.is_datetime64_any_dtype(dtype):
-            return "TIMESTAMP"
-        elif pd.api.types.is_bool_dtype(dtype):
-            return "BOOLEAN"
-        else:
-            max_len = series.astype(str).str.len().max()
-            return f"VARCHAR({int(max_len) if not pd.isnull(max_len) else 255})"
-
-    @staticmethod
-    def _parse_sql(sql: str) -> dict:
-        """Extract schema from SQL DDL statements"""
-        parsed = sqlparse.parse(sql)[0]
-        schema = {"table_name": "", "columns": [], "relationships": []}
-        
-        for token in parsed.tokens:
-            if token.ttype is Keyword and token.value.upper() == 'CREATE TABLE':
-                # Get table name from next token after CREATE TABLE
-                table_token = parsed.tokens[parsed.tokens.index(token)+2]
-                schema["table_name"] = table_token.value.strip('`"')
-            elif isinstance(token, IdentifierList):
-                for identifier in token.get_identifiers():
-                    col_def = str(identifier).strip()
-                    if col_def and not col_def.startswith(('PRIMARY KEY', 'FOREIGN KEY')):
-                        schema["columns"].append(col_def)
-                    elif 'FOREIGN KEY' in col_def:
-                        schema["relationships"].append(
-                            SchemaParser._parse_relationship(col_def))
-        
-        return schema
-
-    @staticmethod
-    def _parse_relationship(col_def: str) -> str:
-        """Extract foreign key relationships"""
-        matches = re.findall(r'FOREIGN KEY\s*\(([^)]+)\)\s*REFERENCES\s*([^(]+)\(([^)]+)\)', col_def)
-        if matches:
-            local_col, ref_table, ref_col = matches[0]
-            return f"{local_col.strip()} -> {ref_table.strip()}.{ref_col.strip()}"
-        return ""
\ No newline at end of file
+import sqlparse
+import json
+import re
+from io import StringIO
+from sqlparse.sql import IdentifierList, Identifier
+from sqlparse.tokens import Keyword, Punctuation
+from typing import Dict, Union, TYPE_CHECKING
+from src.core.llm.groq_client import GroqClient
+from src.core.llm.structured_output import parse_structured, StructuredOutputError
+from config.settings import settings
+from src.core.cache.disk_cache import DiskCache, content_key
+from src.core.cache.singleflight import normalize_text, single_flight
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Column definition keywords that end the type part of "name TYPE ..." entries
+_CONSTRAINT_KEYWORDS = {"PRIMARY", "NOT", "NULL", "DEFAULT", "REFERENCES", "UNIQUE", "CHECK", "COMMENT", "FOREIGN", "CONSTRAINT"}
+
+# Parsed schemas by (input type, content hash, model), shared across sessions and reruns
+schema_cache = DiskCache(namespace="schema", ttl_seconds=settings.SCHEMA_CACHE_TTL_SECONDS,
+                         max_entries=settings.SCHEMA_CACHE_MAX_ENTRIES)
+
+class SchemaParser:
+    @staticmethod
+    def parse_input(input_data: Union[str, bytes], input_type: str) -> dict:
+        """Handle different input types and return standardized schema, memoized by content"""
+        if input_type not in ("natural_language", "csv", "sql"):
+            raise ValueError(f"Invalid input type: {input_type}")
+        return schema_cache.get_or_set(
+            content_key(input_type, input_data, settings.DEFAULT_LLM_MODEL),
+            lambda: SchemaParser._parse_uncached(input_data, input_type),
+            # A regex fallback from a malformed LLM answer is not worth keeping
+            should_cache=lambda schema: not isinstance(schema, dict) or schema.get("table_name") != "unknown_table"
+        )
+
+    @staticmethod
+    def _parse_uncached(input_data: Union[str, bytes], input_type: str) -> dict:
+        if input_type == "natural_language":
+            return SchemaParser._parse_natural_language(input_data)
+        elif input_type == "csv":
+            return SchemaParser._parse_csv(input_data)
+        elif input_type == "sql":
+            return SchemaParser._parse_sql(input_data)
+        else:
+            raise ValueError(f"Invalid input type: {input_type}")
+
+    @staticmethod
+    def _parse_natural_language(text: str) -> dict:
+        """Convert natural language description to structured schema"""
+        key = content_key(normalize_text(text), settings.DEFAULT_LLM_MODEL)
+        return single_flight.do("schema_parser", key, lambda: SchemaParser._parse_natural_language_uncoalesced(text))
+
+    @staticmethod
+    def _parse_natural_language_uncoalesced(text: str) -> dict:
+        llm = GroqClient().llm
+        prompt = f"""
+        Convert this table description to JSON schema:
+        {text}
+        
+        JSON format:
+        {{
+            "table_name": "string",
+            "columns": ["name (type)", ...],
+            "relationships": ["table.column -> related_table.column"]
+        }}
+        
+        Return only valid JSON, no other text.
+        """
+        response = llm.invoke(prompt).content
+        
+        try:
+            return parse_structured(response, source="schema_parser")
+        except StructuredOutputError:
+            return SchemaParser._handle_llm_fallback(response)
+
+    @staticmethod
+    def _handle_llm_fallback(text: str) -> dict:
+        """Fallback parsing for malformed LLM responses"""
+        table_match = re.search(r'"table_name"\s*:\s*"([^"]+)"', text)
+        columns_match = re.findall(r'"columns"\s*:\s*\[([^\]]+)\]', text)
+        
+        return {
+            "table_name": table_match.group(1) if table_match else "unknown_table",
+            "columns": [c.strip() for c in columns_match[0].split(",")] if columns_match else [],
+            "relationships": []
+        }
+
+    @staticmethod
+    def _parse_csv(file_data: bytes) -> dict:
+        """Infer schema from CSV content"""
+        import pandas as pd
+
+        from src.core.table_stats import collect_table_stats
+
+        df = pd.read_csv(StringIO(file_data.decode()))
+        return {
+            "table_name": "uploaded_table",
+            "columns": [
+                f"{col} ({SchemaParser._infer_sql_type(df[col])})"
+                for col in df.columns
+            ],
+            "relationships": [],
+            "statistics": collect_table_stats(df)
+        }
+
+    @staticmethod
+    def _infer_sql_type(series: "pd.Series") -> str:
+        """Map pandas dtype to SQL type"""
+        import pandas as pd
+
+        dtype = series.dtype
+        if pd.api.types.is_integer_dtype(dtype):
+            return "INT"
+        elif pd.api.types.is_float_dtype(dtype):
+            return "FLOAT"
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            return "TIMESTAMP"
+        elif pd.api.types.is_bool_dtype(dtype):
+            return "BOOLEAN"
+        else:
+            max_len = series.astype(str).str.len().max()
+            return f"VARCHAR({int(max_len) if not pd.isnull(max_len) else 255})"
+
+    @staticmethod
+    def _parse_sql(sql: str) -> dict:
+        """Extract schema from SQL DDL statements"""
+        parsed = sqlparse.parse(sql)[0]
+        schema = {"table_name": "", "columns": [], "relationships": []}
+        
+        for token in parsed.tokens:
+            if token.ttype is Keyword and token.value.upper() == 'CREATE TABLE':
+                # Get table name from next token after CREATE TABLE
+                table_token = parsed.tokens[parsed.tokens.index(token)+2]
+                schema["table_name"] = table_token.value.strip('`"')
+            elif isinstance(token, IdentifierList):
+                for identifier in token.get_identifiers():
+                    col_def = str(identifier).strip()
+                    if col_def and not col_def.startswith(('PRIMARY KEY', 'FOREIGN KEY')):
+                        schema["columns"].append(col_def)
+                    elif 'FOREIGN KEY' in col_def:
+                        schema["relationships"].append(
+                            SchemaParser._parse_relationship(col_def))
+        
+        return schema
+
+    @staticmethod
+    def _parse_relationship(col_def: str) -> str:
+        """Extract foreign key relationships"""
+        matches = re.findall(r'FOREIGN KEY\s*\(([^)]+)\)\s*REFERENCES\s*([^(]+)\(([^)]+)\)', col_def)
+        if matches:
+            local_col, ref_table, ref_col = matches[0]
+            return f"{local_col.strip()} -> {ref_table.strip()}.{ref_col.strip()}"
+        return ""
+
+    @staticmethod
+    def to_table_columns(schema: Union[dict, list, str]) -> Dict[str, Dict[str, str]]:
+        """Flatten any parsed schema shape into {table_name: {column_name: sql_type}}"""
+        tables: Dict[str, Dict[str, str]] = {}
+        if isinstance(schema, str):
+            try:
+                return SchemaParser.to_table_columns(json.loads(schema))
+            except json.JSONDecodeError:
+                return SchemaParser._ddl_table_columns(schema)
+        if isinstance(schema, list):
+            for item in schema:
+                tables.update(SchemaParser.to_table_columns(item))
+            return tables
+        if not isinstance(schema, dict):
+            return tables
+        if isinstance(schema.get("tables"), list):
+            return SchemaParser.to_table_columns(schema["tables"])
+
+        table_name = schema.get("table_name") or schema.get("name")
+        if table_name:
+            columns: Dict[str, str] = {}
+            for column in schema.get("columns", []):
+                if isinstance(column, dict) and column.get("name"):
+                    columns[column["name"]] = column.get("type", "VARCHAR")
+                elif isinstance(column, str):
+                    parsed = SchemaParser._parse_column(column)
+                    if parsed:
+                        columns[parsed[0]] = parsed[1]
+            if columns:
+                tables[table_name] = columns
+        return tables
+
+    @staticmethod
+    def _parse_column(column: str):
+        """Split "name (TYPE)" or "name TYPE constraints" into (name, TYPE)"""
+        column = column.strip().rstrip(",")
+        if not column or column.upper().startswith(("PRIMARY KEY", "FOREIGN KEY", "CONSTRAINT")):
+            return None
+        match = re.match(r'^([^\s(]+)\s*\((.*)\)$', column)
+        if match:
+            return match.group(1).strip('`"[]'), match.group(2).strip() or "VARCHAR"
+        parts = column.split()
+        type_parts = []
+        for part in parts[1:]:
+            if part.upper() in _CONSTRAINT_KEYWORDS:
+                break
+            type_parts.append(part)
+        return parts[0].strip('`"[]'), " ".join(type_parts) or "VARCHAR"
+
+    @staticmethod
+    def _ddl_table_columns(text: str) -> Dict[str, Dict[str, str]]:
+        """Extract CREATE TABLE statements embedded in free text (e.g. LLM-generated schemas)"""
+        import sqlglot
+        from sqlglot import exp
+
+        tables: Dict[str, Dict[str, str]] = {}
+        for statement in re.findall(r'CREATE\s+TABLE\b.*?\)\s*(?:;|\Z)', text, flags=re.IGNORECASE | re.DOTALL):
+            try:
+                create = sqlglot.parse_one(statement)
+            except sqlglot.errors.ParseError:
+                continue
+            table = create.find(exp.Table)
+            if table is None:
+                continue
+            columns = {
+                col.name: col.args["kind"].sql() if col.args.get("kind") else "VARCHAR"
+                for col in create.find_all(exp.ColumnDef)
+            }
+            if columns:
+                tables[table.name] = columns
+        return tables
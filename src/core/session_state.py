@@ -0,0 +1,80 @@
+#src/core/session_state.py
+"""Bounded per-session chat state for the Streamlit apps, and an estimate of what each session holds"""
+import sys
+from typing import Any, Dict, List, Mapping
+from config.settings import settings
+from src.core.llm.router import CHARS_PER_TOKEN
+
+
+def approximate_token_ids(text: str) -> List[int]:
+    # Stand-in for the GPT-2 tokenizer LangChain counts with by default, which needs transformers
+    return [0] * (len(text) // CHARS_PER_TOKEN)
+
+
+def make_chat_memory(api_key: str, max_tokens: int = settings.CHAT_MEMORY_MAX_TOKENS):
+    """
+    Conversation memory for a ConversationalRetrievalChain that keeps the latest turns
+    verbatim up to ``max_tokens`` and folds older ones into a running summary, so the
+    history sent with each question stops growing.
+    """
+    from langchain.memory import ConversationSummaryBufferMemory
+    from langchain_groq import ChatGroq
+
+    summarizer = ChatGroq(
+        groq_api_key=api_key,
+        groq_api_base=settings.GROQ_API_BASE,
+        model_name=settings.CHAT_SUMMARY_MODEL,
+        max_tokens=max_tokens,
+        custom_get_token_ids=approximate_token_ids
+    )
+    return ConversationSummaryBufferMemory(
+        llm=summarizer,
+        max_token_limit=max_tokens,
+        memory_key="chat_history",
+        input_key="question",
+        output_key="answer",
+        return_messages=True
+    )
+
+
+def memory_stats(memory) -> Dict[str, int]:
+    messages = memory.chat_memory.messages
+    return {
+        "messages": len(messages),
+        "buffer_tokens": sum(len(approximate_token_ids(str(m.content))) for m in messages),
+        "summary_tokens": len(approximate_token_ids(memory.moving_summary_buffer)),
+        "max_tokens": memory.max_token_limit,
+    }
+
+
+def append_turn(history: list, question: str, answer: str,
+                max_turns: int = settings.CHAT_HISTORY_MAX_TURNS) -> None:
+    """Add a turn to the displayed chat history, dropping the oldest beyond ``max_turns``"""
+    history.append((question, answer))
+    del history[:-max_turns]
+
+
+def approximate_size(value: Any, _seen: set = None) -> int:
+    """Bytes held by ``value`` and the containers, strings and messages under it"""
+    seen = _seen if _seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, Mapping):
+        size += sum(approximate_size(k, seen) + approximate_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, seen) for item in value)
+    elif hasattr(value, "chat_memory"):
+        # Only what the memory holds, not the LLM client it summarizes with
+        size += approximate_size(value.chat_memory.messages, seen)
+        size += approximate_size(getattr(value, "moving_summary_buffer", ""), seen)
+    elif hasattr(value, "content"):
+        size += approximate_size(value.content, seen)
+    return size
+
+
+def session_footprint(state: Mapping) -> Dict[str, int]:
+    """Approximate bytes per session state entry, largest first"""
+    sizes = {str(key): approximate_size(value) for key, value in state.items()}
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
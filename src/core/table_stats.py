@@ -0,0 +1,169 @@
+#src/core/table_stats.py
+import math
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
+from config.settings import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+class HyperLogLog:
+    """Vectorized HyperLogLog sketch over 64-bit hashes for approximate distinct counts"""
+
+    def __init__(self, precision: int = 14):
+        import numpy as np
+
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def add_hashes(self, hashes: "np.ndarray") -> None:
+        import numpy as np
+
+        if hashes.size == 0:
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        remaining_bits = 64 - self.precision
+        index = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << remaining_bits) - 1)
+        # Position of the leftmost 1-bit within the remaining bits (frexp exponent == bit length)
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = np.where(rest == 0, remaining_bits + 1, remaining_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        import numpy as np
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        import numpy as np
+
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m ** 2 / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * self.m and zeros:
+            return int(round(self.m * math.log(self.m / zeros)))
+        return int(round(raw))
+
+
+def _to_jsonable(value: Any) -> Any:
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def collect_table_stats(df: "pd.DataFrame",
+                        exact_ndv_max_rows: int = settings.STATS_EXACT_NDV_MAX_ROWS,
+                        skew_sample_rows: int = 100_000) -> dict:
+    """
+    Computes row count, NDV, null fraction, min/max and skew for every column in one vectorized pass.
+
+    Args:
+        df (DataFrame): Table contents.
+        exact_ndv_max_rows (int): Above this row count NDV comes from a HyperLogLog sketch.
+        skew_sample_rows (int): Rows sampled to measure the most frequent value's share.
+
+    Returns:
+        dict: {"row_count": int, "columns": {name: column stats}}
+    """
+    import pandas as pd
+
+    row_count = int(len(df))
+    approximate = row_count > exact_ndv_max_rows
+    sample = df.sample(n=skew_sample_rows, random_state=0) if row_count > skew_sample_rows else df
+    columns: Dict[str, dict] = {}
+
+    for name in df.columns:
+        series = df[name]
+        non_null = series.dropna()
+        if approximate:
+            sketch = HyperLogLog()
+            sketch.add_hashes(pd.util.hash_pandas_object(non_null, index=False).to_numpy())
+            ndv = sketch.estimate()
+        else:
+            ndv = int(non_null.nunique())
+
+        column = {
+            "null_fraction": round(1 - len(non_null) / row_count, 4) if row_count else 0.0,
+            "ndv": ndv,
+            "ndv_approximate": approximate,
+        }
+        if len(non_null) and (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)) \
+                and not pd.api.types.is_bool_dtype(series):
+            column["min"] = _to_jsonable(non_null.min())
+            column["max"] = _to_jsonable(non_null.max())
+
+        counts = sample[name].value_counts(dropna=True)
+        if len(counts):
+            # Share of the most frequent value; close to 1/ndv for uniform data, close to 1 for heavy skew
+            column["top_value_share"] = round(float(counts.iloc[0]) / max(len(sample), 1), 4)
+        columns[str(name)] = column
+
+    return {"row_count": row_count, "columns": columns}
+
+
+def statistics_by_table(schema: Union[dict, list, str, None]) -> Dict[str, dict]:
+    """Collect the "statistics" blocks stored next to one or more parsed table schemas"""
+    if isinstance(schema, list):
+        merged: Dict[str, dict] = {}
+        for item in schema:
+            merged.update(statistics_by_table(item))
+        return merged
+    if isinstance(schema, dict):
+        if isinstance(schema.get("tables"), list):
+            return statistics_by_table(schema["tables"])
+        if schema.get("table_name") and schema.get("statistics"):
+            return {schema["table_name"]: schema["statistics"]}
+    return {}
+
+
+def without_statistics(schema: Union[dict, list, str, None]):
+    """Schema as sent to the LLM: statistics travel separately in compact form"""
+    if isinstance(schema, list):
+        return [without_statistics(item) for item in schema]
+    if isinstance(schema, dict):
+        stripped = {k: v for k, v in schema.items() if k != "statistics"}
+        if isinstance(stripped.get("tables"), list):
+            stripped["tables"] = without_statistics(stripped["tables"])
+        return stripped
+    return schema
+
+
+def table_rows(stats_by_table: Optional[Dict[str, dict]]) -> Dict[str, int]:
+    return {table: stats["row_count"] for table, stats in (stats_by_table or {}).items() if "row_count" in stats}
+
+
+def _human(n: Union[int, float]) -> str:
+    for unit, size in (("B", 1e9), ("M", 1e6), ("K", 1e3)):
+        if abs(n) >= size:
+            return f"{n / size:.1f}{unit}"
+    return str(n)
+
+
+def _value(value: Any) -> str:
+    return f"{value:.4g}" if isinstance(value, float) else str(value)
+
+
+def format_stats_compact(stats_by_table: Optional[Dict[str, dict]], max_columns: int = 20) -> str:
+    """One line per table, e.g. ``orders rows=1.2M | id ndv~1.2M | country ndv=52 null=1% top=40%``"""
+    lines: List[str] = []
+    for table, stats in (stats_by_table or {}).items():
+        parts = [f"{table} rows={_human(stats.get('row_count', 0))}"]
+        for name, col in list(stats.get("columns", {}).items())[:max_columns]:
+            piece = f"{name} ndv{'~' if col.get('ndv_approximate') else '='}{_human(col.get('ndv', 0))}"
+            if col.get("null_fraction"):
+                piece += f" null={col['null_fraction']:.0%}"
+            if col.get("top_value_share", 0) >= 0.2:
+                piece += f" top={col['top_value_share']:.0%}"
+            if "min" in col:
+                piece += f" [{_value(col['min'])}..{_value(col['max'])}]"
+            parts.append(piece)
+        lines.append(" | ".join(parts))
+    return "\n".join(lines)
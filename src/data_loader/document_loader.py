@@ -1,28 +1,31 @@
-#src/data_loader/document_loader.py
-from langchain_community.document_loaders import WebBaseLoader
-from config.urls import TRINO_DOC_URLS, SPARK_DOC_URLS
-from config.settings import settings
-import os
-
-class DocumentationLoader:
-    def __init__(self):
-        os.makedirs(settings.RAW_DOCS_PATH, exist_ok=True)
-
-    def load_documents(self):
-        self._load_trino_docs()
-        self._load_spark_docs()
-
-    def _load_trino_docs(self):
-        loader = WebBaseLoader(TRINO_DOC_URLS)
-        docs = loader.load()
-        self._save_docs(docs, "trino_docs.txt")
-
-    def _load_spark_docs(self):
-        loader = WebBaseLoader(SPARK_DOC_URLS)
-        docs = loader.load()
-        self._save_docs(docs, "spark_docs.txt")
-
-    def _save_docs(self, docs, filename):
-      text = "\n".join([d.page_content for d in docs])
-      with open(f"{settings.RAW_DOCS_PATH}/{filename}", "w", encoding="utf-8") as f:  # Add encoding
-       f.write(text)
\ No newline at end of file
+#src/data_loader/document_loader.py
+from langchain_community.document_loaders import WebBaseLoader
+from config.settings import settings
+from src.core.dialects import Dialect, get_dialect, enabled_dialects
+import logging
+import os
+
+class DocumentationLoader:
+    def __init__(self):
+        os.makedirs(settings.RAW_DOCS_PATH, exist_ok=True)
+
+    def load_documents(self, dialects=None):
+        for name in dialects or enabled_dialects():
+            self.load_dialect_docs(get_dialect(name))
+
+    def load_dialect_docs(self, dialect: Dialect):
+        loader = WebBaseLoader(dialect.doc_urls)
+        if settings.DOC_CLEANING_ENABLED:
+            from src.core.rag.doc_cleaning import extract_main_content, strip_boilerplate
+
+            pages = [extract_main_content(soup) for soup in loader.scrape_all(dialect.doc_urls)]
+            text, dropped = strip_boilerplate("\n".join(pages))
+            logging.info(f"{dialect.name} docs: {len(pages)} pages, {len(text):,} chars after dropping "
+                         f"{dropped:,} repeated lines")
+        else:
+            text = "\n".join([d.page_content for d in loader.load()])
+        self._save_docs(text, dialect.raw_docs_file)
+
+    def _save_docs(self, text, filename):
+      with open(f"{settings.RAW_DOCS_PATH}/{filename}", "w", encoding="utf-8") as f:  # Add encoding
+       f.write(text)
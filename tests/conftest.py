@@ -0,0 +1,7 @@
+import os
+import sys
+
+# config.settings requires these; the tests never call the services they point to
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("TAVILY_API_URL", "test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
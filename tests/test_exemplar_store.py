@@ -0,0 +1,54 @@
+import hashlib
+
+import numpy as np
+
+from src.core.rag.exemplar_store import ExemplarStore
+
+SCHEMA = {"table_name": "orders", "columns": [{"name": "id", "type": "int"}]}
+
+
+def _embed(texts):
+    # Deterministic pseudo-embeddings, so no model is loaded
+    return [np.random.default_rng(int(hashlib.md5(t.encode()).hexdigest()[:8], 16)).random(16).tolist()
+            for t in texts]
+
+
+def _store(path, **kwargs) -> ExemplarStore:
+    return ExemplarStore(path=str(path), embed=_embed, **kwargs)
+
+
+def test_stores_sharing_a_path_see_each_others_writes(tmp_path):
+    first, second = _store(tmp_path), _store(tmp_path)
+    ids = [first.add(f"question {i}", SCHEMA, f"SELECT {i}", "trino") for i in range(5)]
+    assert second.index.ntotal == 5
+    second.add("question 5", SCHEMA, "SELECT 5", "trino")
+    second.remove(ids[0])
+    assert first.index.ntotal == 5
+    found = first.search("question 5", SCHEMA, "trino", k=1, min_similarity=0.99)
+    assert [e["question"] for e in found] == ["question 5"]
+    assert first.search("question 0", SCHEMA, "trino", k=1, min_similarity=0.99) == []
+
+
+def test_adding_the_same_triple_returns_the_existing_id(tmp_path):
+    store = _store(tmp_path)
+    assert store.add("Total sales", SCHEMA, "SELECT 1", "trino") == store.add("total  sales", SCHEMA, "SELECT 1", "trino")
+    assert len(store) == 1
+
+
+def test_index_migrates_to_ivf_and_retrains_as_it_grows(tmp_path):
+    import faiss
+
+    store = _store(tmp_path, ivf_threshold=40, retrain_growth=2.0)
+    for i in range(39):
+        store.add(f"question {i}", SCHEMA, f"SELECT {i}", "trino")
+    assert isinstance(store.index, faiss.IndexIDMap2)
+    store.add("question 39", SCHEMA, "SELECT 39", "trino")
+    assert isinstance(store.index, faiss.IndexIVFFlat) and store._trained_size == 40
+    for i in range(40, 80):
+        store.add(f"question {i}", SCHEMA, f"SELECT {i}", "trino")
+    assert store._trained_size == 80 and store.index.ntotal == 80
+
+    # A new process starts from the saved snapshot plus the rows written after it
+    other = _store(tmp_path, ivf_threshold=40, retrain_growth=2.0)
+    other.add("question 80", SCHEMA, "SELECT 80", "trino")
+    assert store.index.ntotal == other.index.ntotal == 81
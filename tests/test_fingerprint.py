@@ -0,0 +1,51 @@
+from src.core.analysis import fingerprint
+from src.core.analysis.fingerprint import FingerprintStore
+from src.core.cache.disk_cache import DiskCache
+
+
+def _store(tmp_path) -> FingerprintStore:
+    store = FingerprintStore("test_fingerprint")
+    store.cache = DiskCache(namespace="test_fingerprint", path=str(tmp_path / "cache.sqlite3"))
+    return store
+
+
+def _optimize(sql):
+    return lambda: {"original_query": sql, "optimized_query": sql.replace("SELECT *", "SELECT id")}
+
+
+def test_reuse_rebinds_literals_and_aliases(tmp_path):
+    store = _store(tmp_path)
+    first = "SELECT * FROM orders o WHERE o.status = 'open'"
+    second = "SELECT * FROM orders x WHERE x.status = 'closed'"
+    store.get_or_compute("optimization", first, "trino", _optimize(first),
+                         sql_fields=("optimized_query",), input_fields=("original_query",))
+    result = store.get_or_compute("optimization", second, "trino", lambda: {"error": "not reused"},
+                                  sql_fields=("optimized_query",), input_fields=("original_query",))
+    assert result["optimized_query"] == "SELECT id FROM orders AS x WHERE x.status = 'closed'"
+    assert result["original_query"] == second
+
+
+def test_alias_sensitive_results_are_not_reused_for_other_aliases(tmp_path):
+    store = _store(tmp_path)
+    store.get_or_compute("performance", "SELECT * FROM orders o CROSS JOIN customers c", "trino",
+                         lambda: {"bottlenecks": ["CROSS JOIN with c"]}, alias_sensitive=True)
+    result = store.get_or_compute("performance", "SELECT * FROM orders x CROSS JOIN customers y", "trino",
+                                  lambda: {"bottlenecks": ["CROSS JOIN with y"]}, alias_sensitive=True)
+    assert result == {"bottlenecks": ["CROSS JOIN with y"]}
+    reused = store.get_or_compute("performance", "select *  from orders o cross join customers c", "trino",
+                                  lambda: {"error": "not reused"}, alias_sensitive=True)
+    assert reused == {"bottlenecks": ["CROSS JOIN with c"]}
+
+
+def test_template_that_does_not_bind_falls_back_to_compute(tmp_path, monkeypatch):
+    store = _store(tmp_path)
+    first = "SELECT * FROM orders WHERE status = 'open'"
+    second = "SELECT * FROM orders WHERE status = 'closed'"
+    store.get_or_compute("optimization", first, "trino", _optimize(first), sql_fields=("optimized_query",))
+
+    def fail(*args, **kwargs):
+        raise IndexError("placeholder out of range")
+
+    monkeypatch.setattr(fingerprint, "bind_template", fail)
+    result = store.get_or_compute("optimization", second, "trino", _optimize(second), sql_fields=("optimized_query",))
+    assert result["optimized_query"] == "SELECT id FROM orders WHERE status = 'closed'"
@@ -0,0 +1,28 @@
+import pytest
+from src.core.analysis.rewriter import rewrite_sql
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT o.id FROM orders o WHERE o.status = 'a' AND o.region = 'b'",
+    "SELECT o.id FROM orders o JOIN users u ON o.user_id = u.id",
+    "SELECT o.id FROM orders o WHERE 1 < o.total",
+    "SELECT o.id FROM orders o WHERE o.b BETWEEN 1 AND 2",
+])
+def test_reordering_alone_is_not_a_rewrite(sql):
+    assert rewrite_sql(sql, "trino") == (sql, [])
+
+
+def test_constant_folding():
+    sql, fired = rewrite_sql("SELECT o.id FROM orders o WHERE 1 = 1 AND o.total > 5", "trino")
+    assert fired == ["Constant folding"]
+    assert "1 = 1" not in sql
+
+
+def test_predicate_pushdown():
+    sql, fired = rewrite_sql("SELECT * FROM (SELECT id, total FROM orders) s WHERE s.total > 100", "spark")
+    assert fired == ["Predicate pushdown"]
+    assert "WHERE\n    total > 100" in sql
+
+
+def test_redundant_distinct():
+    assert rewrite_sql("SELECT DISTINCT a FROM t GROUP BY a", "trino")[1] == ["Redundant DISTINCT removal"]
@@ -0,0 +1,20 @@
+import pytest
+from src.core.llm.structured_output import StructuredOutputError, extract_json
+
+
+def test_fenced_output():
+    assert extract_json('```json\n{"a": 1,}\n```') == {"a": 1}
+
+
+def test_prose_around_fence():
+    assert extract_json('Here it is:\n```json\n{"a": [1, 2]}\n```\nDone.') == {"a": [1, 2]}
+
+
+def test_fences_inside_string_values_are_content():
+    raw = '{"query": "SELECT 1", "alternatives": ["```SELECT 2```", "```SELECT 3```"],}'
+    assert extract_json(raw) == {"query": "SELECT 1", "alternatives": ["```SELECT 2```", "```SELECT 3```"]}
+
+
+def test_no_json():
+    with pytest.raises(StructuredOutputError):
+        extract_json("no json here")
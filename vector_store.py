@@ -1,18 +1,28 @@
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
-from config.settings import settings
-from typing import List
-
-class VectorStore:
-    def __init__(self):
-        self.embeddings = HuggingFaceEmbeddings(model_name=settings.EMBEDDING_MODEL)
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=settings.CHUNK_SIZE,
-            chunk_overlap=settings.CHUNK_OVERLAP
-        )
-
-    def create_vector_store(self, documents: List[str]) -> FAISS:
-        """Create FAISS vector store from documents."""
-        docs = self.splitter.create_documents(documents)
-        return FAISS.from_documents(docs, self.embeddings)
+from config.settings import settings
+from src.core.rag.embeddings import get_embeddings
+from typing import List
+
+class VectorStore:
+    def __init__(self):
+        self._splitter = None
+
+    @property
+    def embeddings(self):
+        return get_embeddings()
+
+    @property
+    def splitter(self):
+        if self._splitter is None:
+            from langchain.text_splitter import RecursiveCharacterTextSplitter
+            self._splitter = RecursiveCharacterTextSplitter(
+                chunk_size=settings.CHUNK_SIZE,
+                chunk_overlap=settings.CHUNK_OVERLAP
+            )
+        return self._splitter
+
+    def create_vector_store(self, documents: List[str]):
+        """Create FAISS vector store from documents."""
+        from langchain_community.vectorstores import FAISS
+
+        docs = self.splitter.create_documents(documents)
+        return FAISS.from_documents(docs, self.embeddings)